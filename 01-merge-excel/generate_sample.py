@@ -4,6 +4,7 @@ Script untuk generate sample data Excel yang realistis
 
 import pandas as pd
 import random
+from pathlib import Path
 from datetime import datetime, timedelta
 
 random.seed(42)
@@ -64,6 +65,22 @@ def generate_data(num_rows, start_date):
     return data
 
 
+def generate_branch_files(output_folder, total_rows: int, num_files: int = 3) -> list:
+    """Generate beberapa file cabang dengan total baris tertentu (untuk benchmark)."""
+    folder = Path(output_folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    start_date = datetime(2024, 1, 1)
+    
+    files = []
+    rows_per_file = total_rows // num_files
+    for i in range(num_files):
+        num_rows = rows_per_file if i < num_files - 1 else total_rows - rows_per_file * i
+        path = folder / f'cabang_{i + 1:02d}.xlsx'
+        pd.DataFrame(generate_data(num_rows, start_date)).to_excel(path, index=False)
+        files.append(path)
+    return files
+
+
 if __name__ == "__main__":
     start_date = datetime(2024, 1, 1)
     
@@ -2,20 +2,247 @@
 Merge Excel - Menggabungkan beberapa file Excel menjadi satu file
 """
 
+from __future__ import annotations
+
 import sys
-import pandas as pd
+import math
+import json
+import time
+import argparse
+import tracemalloc
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Library berat (pandas, openpyxl, dst.) di-import di dalam fungsi yang memakainya,
+# agar --help dan error argumen/config tidak menunggu import pandas
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Format output yang didukung beserta ekstensi filenya
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# Batas jumlah baris per sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Mode pemecahan jika data melebihi batas baris Excel
+ROLLOVER_MODES = ['sheet', 'file']
+
+
+# Profiler, arrow_safe, excel_cell, dan OUTPUT_FORMATS sengaja disalin identik ke setiap
+# utility agar folder ini bisa dipakai sendiri tanpa folder lain. Jika diubah, ubah semua
+# salinannya lalu jalankan `python common/check_copies.py` dari root repo.
+class Profiler:
+    """Catat durasi dan pemakaian memori setiap tahap proses (aktif dengan --profile)."""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []  # List of {name, start, duration, depth, mem_peak_mb, mem_delta_mb}
+        self._origin = time.perf_counter()
+        self._peaks = []  # Peak memori tahap induk yang sedang berjalan
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Ukur satu tahap, contoh: with profiler.stage('read'): ..."""
+        if not self.enabled:
+            yield
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        mem_start, peak_so_far = tracemalloc.get_traced_memory()
+        # Simpan peak tahap induk sebelum di-reset oleh tahap ini
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak_so_far)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            mem_end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            
+            self.stages.append({
+                'name': name,
+                'start': start - self._origin,
+                'duration': duration,
+                'depth': len(self._peaks),
+                'mem_peak_mb': peak / 1024 ** 2,
+                'mem_delta_mb': (mem_end - mem_start) / 1024 ** 2,
+            })
+    
+    def sorted_stages(self) -> list:
+        """Tahap diurutkan berdasarkan waktu mulai."""
+        return sorted(self.stages, key=lambda s: s['start'])
+    
+    def total_duration(self) -> float:
+        """Total durasi tahap level teratas."""
+        return sum(s['duration'] for s in self.stages if s['depth'] == 0)
+    
+    def print_report(self) -> None:
+        """Print tabel profil ke console."""
+        if not self.enabled or not self.stages:
+            return
+        
+        total = self.total_duration()
+        print("\n" + "=" * 50)
+        print("PROFIL")
+        print("=" * 50)
+        print(f"\n  {'Tahap':<34} {'Waktu (s)':>10} {'%':>6} {'Peak (MB)':>10} {'Delta (MB)':>11}")
+        for s in self.sorted_stages():
+            name = '  ' * s['depth'] + s['name']
+            pct = s['duration'] / total * 100 if total else 0
+            print(f"  {name:<34} {s['duration']:>10.3f} {pct:>6.1f} "
+                  f"{s['mem_peak_mb']:>10.1f} {s['mem_delta_mb']:>+11.1f}")
+        print(f"  {'Total':<34} {total:>10.3f}")
+    
+    def export(self, output_path: str, output_format: str = 'json') -> None:
+        """Simpan profil ke JSON, atau format trace event Chrome (chrome://tracing, Perfetto)."""
+        if not self.enabled:
+            return
+        
+        if output_format == 'chrome':
+            data = {'traceEvents': [{
+                'name': s['name'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6),
+                'dur': round(s['duration'] * 1e6),
+                'pid': 1,
+                'tid': 1,
+                'args': {'mem_peak_mb': round(s['mem_peak_mb'], 2),
+                         'mem_delta_mb': round(s['mem_delta_mb'], 2)},
+            } for s in self.sorted_stages()]}
+        else:
+            data = {'total_s': self.total_duration(), 'stages': self.sorted_stages()}
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profil disimpan ke: {output_path}")
+
+
+
+def arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah kolom object dengan tipe campuran ke string agar bisa ditulis pyarrow."""
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def excel_cell(value):
+    """Konversi nilai kosong pandas (NaN/NaT/NA) ke None agar bisa ditulis openpyxl."""
+    import pandas as pd
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+def write_excel(df: pd.DataFrame, path: Path, include_header: bool = True,
+                rollover: str = 'sheet', max_rows: int = EXCEL_MAX_ROWS) -> list:
+    """
+    Tulis DataFrame ke xlsx. Jika jumlah baris melebihi batas Excel, data
+    di-stream (write-only) ke beberapa sheet atau file bernomor.
+    
+    Returns:
+        list path file yang ditulis
+    """
+    from openpyxl import Workbook
+    path = Path(path)
+    rows_per_part = max_rows - (1 if include_header else 0)
+    
+    # Cek jumlah baris sebelum menulis, bukan setelah gagal di akhir
+    if len(df) <= rows_per_part:
+        df.to_excel(path, index=False, header=include_header)
+        return [path]
+    
+    n_parts = math.ceil(len(df) / rows_per_part)
+    print(f"  Info: {len(df)} baris melebihi batas Excel ({max_rows} baris), "
+          f"dipecah ke {n_parts} {'file' if rollover == 'file' else 'sheet'}")
+    
+    paths = []
+    wb = Workbook(write_only=True)
+    for part in range(n_parts):
+        chunk = df.iloc[part * rows_per_part:(part + 1) * rows_per_part]
+        
+        if rollover == 'file':
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Sheet1')
+        else:
+            ws = wb.create_sheet(f'Sheet{part + 1}')
+        
+        if include_header:
+            ws.append([str(col) for col in df.columns])
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append([excel_cell(v) for v in row])
+        
+        if rollover == 'file':
+            part_path = path.with_name(f"{path.stem}_{part + 1:03d}{path.suffix}")
+            wb.save(part_path)
+            paths.append(part_path)
+    
+    if rollover != 'file':
+        wb.save(path)
+        paths.append(path)
+    
+    return paths
+
+
+def save_dataframe(df: pd.DataFrame, output_file: str, output_format: str = 'xlsx',
+                   rollover: str = 'sheet') -> list:
+    """Simpan DataFrame sesuai format output, return list path file yang ditulis."""
+    path = Path(output_file).with_suffix(OUTPUT_FORMATS[output_format])
+    
+    if output_format == 'csv':
+        df.to_csv(path, index=False)
+    elif output_format == 'parquet':
+        arrow_safe(df).to_parquet(path, index=False)
+    elif output_format == 'feather':
+        arrow_safe(df).reset_index(drop=True).to_feather(path)
+    else:
+        return write_excel(df, path, rollover=rollover)
+    
+    return [path]
+
+
+def read_branch_file(file: Path) -> pd.DataFrame:
+    """Baca satu file cabang dan tambahkan kolom Cabang dari nama file."""
+    import pandas as pd
+    df = pd.read_excel(file)
+    # Ambil nama cabang, hapus prefix "cabang_" jika ada
+    df['Cabang'] = Path(file).stem.replace("cabang_", "").title()
+    return df
 
 
-def merge_excel_files(input_folder: str, output_file: str) -> None:
+def merge_excel_files(input_folder: str, output_file: str, output_format: str = 'xlsx',
+                      rollover: str = 'sheet', profiler: Profiler = None) -> None:
     """Menggabungkan semua file Excel dalam folder menjadi satu file."""
     
+    profiler = profiler or Profiler()
     folder = Path(input_folder)
     
     if not folder.exists():
         print(f"Error: Folder '{input_folder}' tidak ditemukan")
         sys.exit(1)
     
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    
     excel_files = list(folder.glob("*.xlsx"))
     
     if not excel_files:
@@ -24,42 +251,72 @@ def merge_excel_files(input_folder: str, output_file: str) -> None:
     
     print(f"Ditemukan {len(excel_files)} file Excel di folder {input_folder}")
     
+    # pandas baru di-import setelah input valid, agar error input tetap cepat
+    import pandas as pd
+    
     all_data = []
     total_rows = 0
     
     for file in excel_files:
-        df = pd.read_excel(file)
-        # Ambil nama cabang, hapus prefix "cabang_" jika ada
-        nama_cabang = file.stem.replace("cabang_", "").title()
-        df['Cabang'] = nama_cabang
+        with profiler.stage(f"read {file.name}"):
+            df = read_branch_file(file)
         row_count = len(df)
         total_rows += row_count
         print(f"- Memproses: {file.name} ({row_count} baris)")
         all_data.append(df)
     
-    merged_df = pd.concat(all_data, ignore_index=True)
+    with profiler.stage("concat"):
+        merged_df = pd.concat(all_data, ignore_index=True)
     
     # Buat folder output jika belum ada
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    merged_df.to_excel(output_file, index=False)
+    with profiler.stage("write"):
+        saved_paths = save_dataframe(merged_df, output_path, output_format, rollover)
     
-    print(f"\nBerhasil! Total {total_rows} baris digabungkan ke {output_file}")
+    print(f"\nBerhasil! Total {total_rows} baris digabungkan ke {', '.join(map(str, saved_paths))}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Penggunaan: python merge_excel.py <folder_input> [file_output]")
+def main():
+    parser = argparse.ArgumentParser(
+        description='Menggabungkan beberapa file Excel menjadi satu file',
+        epilog='Contoh: python merge_excel.py ./sample ./output/custom_output.xlsx'
+    )
+    parser.add_argument('input_folder', nargs='?', help='Folder berisi file Excel')
+    parser.add_argument('output_file', nargs='?', help='File output (default: output/hasil_gabungan.xlsx)')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS), default='xlsx',
+                        help='Format file output (default: xlsx)')
+    parser.add_argument('--rollover', choices=ROLLOVER_MODES, default='sheet',
+                        help='Jika melebihi batas baris Excel, pecah ke sheet atau file bernomor (default: sheet)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tampilkan durasi dan memori setiap tahap')
+    parser.add_argument('--profile-output', help='Simpan profil ke file JSON')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Format file profil: json atau chrome (trace event)')
+    
+    args = parser.parse_args()
+    
+    if not args.input_folder:
+        print("Penggunaan: python merge_excel.py <folder_input> [file_output] [--output-format FORMAT]")
         print("Contoh: python merge_excel.py ./sample")
         print("        python merge_excel.py ./sample ./output/custom_output.xlsx")
+        print("        python merge_excel.py ./sample --output-format parquet")
         sys.exit(1)
     
-    input_folder = sys.argv[1]
-    
     # Default output di folder yang sama dengan script
     script_dir = Path(__file__).parent
     default_output = script_dir / "output" / "hasil_gabungan.xlsx"
-    output_file = sys.argv[2] if len(sys.argv) > 2 else str(default_output)
+    output_file = args.output_file or str(default_output)
+    
+    profiler = Profiler(enabled=args.profile or bool(args.profile_output))
+    merge_excel_files(args.input_folder, output_file, args.output_format, args.rollover, profiler)
     
-    merge_excel_files(input_folder, output_file)
+    if args.profile:
+        profiler.print_report()
+    if args.profile_output:
+        profiler.export(args.profile_output, args.profile_format)
+
+
+if __name__ == "__main__":
+    main()
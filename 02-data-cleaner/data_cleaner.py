@@ -2,12 +2,26 @@
 Data Cleaner - Membersihkan data Excel berdasarkan konfigurasi YAML
 """
 
+from __future__ import annotations
+
+import os
 import sys
 import re
-import pandas as pd
-import yaml
+import math
+import json
+import time
+import argparse
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from dateutil import parser as date_parser
+from typing import TYPE_CHECKING
+
+# Library berat (pandas, openpyxl, dst.) di-import di dalam fungsi yang memakainya,
+# agar --help dan error argumen/config tidak menunggu import pandas
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 # Mapping bulan Indonesia ke angka
@@ -36,116 +50,330 @@ def convert_indonesian_date(date_str: str) -> str:
     return date_str
 
 
+# Format output yang didukung beserta ekstensi filenya
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# Batas jumlah baris per sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Mode pemecahan jika data melebihi batas baris Excel
+ROLLOVER_MODES = ['sheet', 'file']
+
+# Duplikat mirip: jumlah baris tetangga yang dibandingkan di dalam blok, panjang
+# akhiran No HP untuk blocking, lebar nama yang dibandingkan, ukuran signature
+# bigram (x 64 bit), dan jumlah cluster yang ditampilkan di console
+FUZZY_WINDOW = 10
+PHONE_SUFFIX = 8
+NAME_WIDTH = 32
+SIGNATURE_WORDS = 4
+FUZZY_PREVIEW = 5
+
+# Parsing tanggal paralel: minimal jumlah nilai unik agar process pool dipakai,
+# dan jumlah chunk per proses (chunk kecil agar beban antar proses merata)
+DATE_PARALLEL_MIN = 10_000
+DATE_CHUNKS_PER_PROCESS = 4
+
+
 def load_config(config_path: str) -> dict:
     """Load konfigurasi dari file YAML."""
+    import yaml
     with open(config_path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
 
-def clean_nama(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
-    """Standardisasi format nama."""
-    kolom = config.get('kolom')
-    if kolom not in df.columns:
-        print(f"  Peringatan: Kolom '{kolom}' tidak ditemukan, skip cleaning nama")
-        return df
-    
+# Profiler, arrow_safe, excel_cell, dan OUTPUT_FORMATS sengaja disalin identik ke setiap
+# utility agar folder ini bisa dipakai sendiri tanpa folder lain. Jika diubah, ubah semua
+# salinannya lalu jalankan `python common/check_copies.py` dari root repo.
+class Profiler:
+    """Catat durasi dan pemakaian memori setiap tahap proses (aktif dengan --profile)."""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []  # List of {name, start, duration, depth, mem_peak_mb, mem_delta_mb}
+        self._origin = time.perf_counter()
+        self._peaks = []  # Peak memori tahap induk yang sedang berjalan
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Ukur satu tahap, contoh: with profiler.stage('read'): ..."""
+        if not self.enabled:
+            yield
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        mem_start, peak_so_far = tracemalloc.get_traced_memory()
+        # Simpan peak tahap induk sebelum di-reset oleh tahap ini
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak_so_far)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            mem_end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            
+            self.stages.append({
+                'name': name,
+                'start': start - self._origin,
+                'duration': duration,
+                'depth': len(self._peaks),
+                'mem_peak_mb': peak / 1024 ** 2,
+                'mem_delta_mb': (mem_end - mem_start) / 1024 ** 2,
+            })
+    
+    def sorted_stages(self) -> list:
+        """Tahap diurutkan berdasarkan waktu mulai."""
+        return sorted(self.stages, key=lambda s: s['start'])
+    
+    def total_duration(self) -> float:
+        """Total durasi tahap level teratas."""
+        return sum(s['duration'] for s in self.stages if s['depth'] == 0)
+    
+    def print_report(self) -> None:
+        """Print tabel profil ke console."""
+        if not self.enabled or not self.stages:
+            return
+        
+        total = self.total_duration()
+        print("\n" + "=" * 50)
+        print("PROFIL")
+        print("=" * 50)
+        print(f"\n  {'Tahap':<34} {'Waktu (s)':>10} {'%':>6} {'Peak (MB)':>10} {'Delta (MB)':>11}")
+        for s in self.sorted_stages():
+            name = '  ' * s['depth'] + s['name']
+            pct = s['duration'] / total * 100 if total else 0
+            print(f"  {name:<34} {s['duration']:>10.3f} {pct:>6.1f} "
+                  f"{s['mem_peak_mb']:>10.1f} {s['mem_delta_mb']:>+11.1f}")
+        print(f"  {'Total':<34} {total:>10.3f}")
+    
+    def export(self, output_path: str, output_format: str = 'json') -> None:
+        """Simpan profil ke JSON, atau format trace event Chrome (chrome://tracing, Perfetto)."""
+        if not self.enabled:
+            return
+        
+        if output_format == 'chrome':
+            data = {'traceEvents': [{
+                'name': s['name'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6),
+                'dur': round(s['duration'] * 1e6),
+                'pid': 1,
+                'tid': 1,
+                'args': {'mem_peak_mb': round(s['mem_peak_mb'], 2),
+                         'mem_delta_mb': round(s['mem_delta_mb'], 2)},
+            } for s in self.sorted_stages()]}
+        else:
+            data = {'total_s': self.total_duration(), 'stages': self.sorted_stages()}
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profil disimpan ke: {output_path}")
+
+
+
+def transform_columns(df: pd.DataFrame, config: dict, name: str, column_func) -> dict:
+    """
+    Jalankan column_func(series, config) -> (series_baru, ringkasan) untuk setiap kolom
+    tahap, di thread pool jika workers > 1. Kolom hanya benar-benar berjalan
+    bersamaan jika operasinya melepas GIL: operasi .str pada dtype string berbasis
+    pyarrow (default pandas 3). Kolom object (pandas 2) dan parsing dateutil tetap
+    bergiliran memegang GIL.
+    
+    Returns:
+        dict {kolom: ringkasan} untuk kolom yang diproses
+    """
+    columns = []
+    for kolom in stage_columns(config):
+        if kolom not in df.columns:
+            print(f"  Peringatan: Kolom '{kolom}' tidak ditemukan, skip cleaning {name}")
+        elif kolom not in columns:
+            columns.append(kolom)
+    
+    workers = min(config.get('workers') or os.cpu_count() or 1, len(columns))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda kolom: column_func(df[kolom], config), columns))
+    else:
+        results = [column_func(df[kolom], config) for kolom in columns]
+    
+    # Tulis balik ke DataFrame di thread utama (assignment kolom tidak thread-safe)
+    counts = {}
+    for kolom, (values, summary) in zip(columns, results):
+        df[kolom] = values
+        counts[kolom] = summary
+    return counts
+
+
+def column_note(counts: dict, kolom: str) -> str:
+    """Nama kolom untuk pesan progress, hanya jika tahap memproses lebih dari satu kolom."""
+    return f" [{kolom}]" if len(counts) > 1 else ""
+
+
+def standardize_nama(values: pd.Series, config: dict) -> tuple:
+    """Standardisasi satu kolom nama, return (hasil, jumlah yang berubah)."""
     format_type = config.get('format', 'title')
     trim = config.get('trim', True)
     
-    original = df[kolom].copy()
+    original = values
     
     if trim:
-        df[kolom] = df[kolom].astype(str).str.strip()
-        df[kolom] = df[kolom].str.replace(r'\s+', ' ', regex=True)
+        values = values.astype(str).str.strip()
+        values = values.str.replace(r'\s+', ' ', regex=True)
     
     if format_type == 'title':
-        df[kolom] = df[kolom].str.title()
+        values = values.str.title()
     elif format_type == 'upper':
-        df[kolom] = df[kolom].str.upper()
+        values = values.str.upper()
     elif format_type == 'lower':
-        df[kolom] = df[kolom].str.lower()
+        values = values.str.lower()
     
-    changed = (original != df[kolom]).sum()
-    stats['nama_fixed'] = changed
-    print(f"  Nama: {changed} data di-standardisasi")
+    # Sel kosong (NaN) tetap kosong: di pandas 2 astype(str) mengubahnya jadi 'nan'.
+    # Planner mengandalkan ini untuk memajukan hapus_kosong (lihat EMPTY_PRESERVING)
+    filled = original.notna()
+    values = values.where(filled, original)
+    return values, int(((original != values) & filled).sum())
+
+
+def clean_nama(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
+    """Standardisasi format nama."""
+    counts = transform_columns(df, config, 'nama', standardize_nama)
+    for kolom, changed in counts.items():
+        stats['nama_fixed'] = stats.get('nama_fixed', 0) + changed
+        print(f"  Nama{column_note(counts, kolom)}: {changed} data di-standardisasi")
     
     return df
 
 
+def parse_date_chunk(texts: list, output_format: str) -> list:
+    """Parse sekumpulan teks tanggal unik (juga dipanggil di proses worker), None jika gagal."""
+    from dateutil import parser as date_parser
+    results = []
+    for text in texts:
+        try:
+            # Coba konversi format Indonesia dulu
+            parsed = date_parser.parse(convert_indonesian_date(text), dayfirst=True)
+            results.append(parsed.strftime(output_format))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def parse_unique_dates(texts: list, output_format: str, processes: int = 1) -> list:
+    """Parse nilai unik, dibagi ke process pool per chunk jika jumlahnya cukup besar."""
+    if processes <= 1 or len(texts) < DATE_PARALLEL_MIN:
+        return parse_date_chunk(texts, output_format)
+    
+    size = math.ceil(len(texts) / (processes * DATE_CHUNKS_PER_PROCESS))
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        parts = pool.map(parse_date_chunk, chunks, [output_format] * len(chunks))
+        return [value for part in parts for value in part]
+
+
+def format_tanggal(values: pd.Series, config: dict) -> tuple:
+    """
+    Format ulang satu kolom tanggal. Setiap nilai unik hanya di-parse sekali,
+    hasilnya dipetakan balik ke baris lewat kode factorize.
+    
+    Returns:
+        (hasil, ringkasan) dengan ringkasan berisi fixed, failed, unique, rate
+    """
+    import numpy as np
+    import pandas as pd
+    output_format = config.get('format', '%d-%m-%Y')
+    processes = config.get('processes') or 1
+    
+    # Sel kosong dibiarkan apa adanya
+    text = values[values.notna()].map(str)
+    text = text[text.str.strip() != '']
+    codes, uniques = pd.factorize(text)
+    
+    start = time.perf_counter()
+    parsed = parse_unique_dates(list(uniques), output_format, processes)
+    elapsed = time.perf_counter() - start
+    
+    row_parsed = np.array(parsed, dtype=object)[codes]
+    ok = pd.notna(row_parsed)
+    result = values.where(~values.index.isin(text.index[ok]),
+                          pd.Series(row_parsed, index=text.index)).infer_objects()
+    
+    return result, {
+        'fixed': int(ok.sum()),
+        'failed': int((~ok).sum()),
+        'unique': len(uniques),
+        'rate': len(uniques) / elapsed if elapsed > 0 else 0,
+    }
+
+
 def clean_tanggal(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
     """Standardisasi format tanggal."""
-    kolom = config.get('kolom')
-    if kolom not in df.columns:
-        print(f"  Peringatan: Kolom '{kolom}' tidak ditemukan, skip cleaning tanggal")
-        return df
-    
     output_format = config.get('format', '%d-%m-%Y')
-    fixed_count = 0
+    # Dengan process pool, kolom diproses satu per satu: satu pool per thread akan
+    # membuat hingga workers x processes proses sekaligus
+    if (config.get('processes') or 1) > 1:
+        config = {**config, 'workers': 1}
+    counts = transform_columns(df, config, 'tanggal', format_tanggal)
+    for kolom, summary in counts.items():
+        stats['tanggal_fixed'] = stats.get('tanggal_fixed', 0) + summary['fixed']
+        stats['tanggal_failed'] = stats.get('tanggal_failed', 0) + summary['failed']
+        print(f"  Tanggal{column_note(counts, kolom)}: {summary['fixed']} data di-format ke {output_format} "
+              f"({summary['unique']} nilai unik, {summary['rate']:,.0f} nilai/detik, "
+              f"{summary['failed']} tidak bisa di-parse)")
     
-    def parse_date(val):
-        nonlocal fixed_count
-        if pd.isna(val) or str(val).strip() == '':
-            return val
-        try:
-            # Coba konversi format Indonesia dulu
-            val_converted = convert_indonesian_date(str(val))
-            parsed = date_parser.parse(val_converted, dayfirst=True)
-            fixed_count += 1
-            return parsed.strftime(output_format)
-        except:
-            return val
+    return df
+
+
+def format_telepon(values: pd.Series, config: dict) -> tuple:
+    """Format satu kolom nomor telepon (vektor), return (hasil, jumlah yang di-format)."""
+    output_format = config.get('format', '0xxx-xxxx-xxxx')
     
-    df[kolom] = df[kolom].apply(parse_date)
-    stats['tanggal_fixed'] = fixed_count
-    print(f"  Tanggal: {fixed_count} data di-format ke {output_format}")
+    text = values.astype(str)
+    filled = values.notna() & (text.str.strip() != '')
     
-    return df
+    # Hapus semua karakter non-digit
+    digits = text.str.replace(r'\D', '', regex=True)
+    
+    # Handle +62 atau 62 di awal
+    digits = digits.where(~digits.str.startswith('62').fillna(False).astype(bool), '0' + digits.str[2:])
+    
+    # Format sesuai pattern, hanya untuk nomor minimal 10 digit
+    valid = filled & (digits.str.len() >= 10).fillna(False).astype(bool)
+    if output_format == '0xxx-xxxx-xxxx':
+        formatted = digits.str[:4] + '-' + digits.str[4:8] + '-' + digits.str[8:12]
+    elif output_format == '+62xxx-xxxx-xxxx':
+        formatted = '+62' + digits.str[1:4] + '-' + digits.str[4:8] + '-' + digits.str[8:12]
+    else:
+        formatted = digits
+    
+    return formatted.where(valid, values), int(valid.sum())
 
 
 def clean_telepon(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
     """Standardisasi format nomor telepon."""
-    kolom = config.get('kolom')
-    if kolom not in df.columns:
-        print(f"  Peringatan: Kolom '{kolom}' tidak ditemukan, skip cleaning telepon")
-        return df
-    
-    output_format = config.get('format', '0xxx-xxxx-xxxx')
-    fixed_count = 0
-    
-    def format_phone(val):
-        nonlocal fixed_count
-        if pd.isna(val) or str(val).strip() == '':
-            return val
-        
-        # Hapus semua karakter non-digit
-        digits = re.sub(r'\D', '', str(val))
-        
-        # Handle +62 atau 62 di awal
-        if digits.startswith('62'):
-            digits = '0' + digits[2:]
-        
-        # Format sesuai pattern
-        if len(digits) >= 10:
-            if output_format == '0xxx-xxxx-xxxx':
-                formatted = f"{digits[:4]}-{digits[4:8]}-{digits[8:12]}"
-            elif output_format == '+62xxx-xxxx-xxxx':
-                formatted = f"+62{digits[1:4]}-{digits[4:8]}-{digits[8:12]}"
-            else:
-                formatted = digits
-            fixed_count += 1
-            return formatted
-        return val
-    
-    df[kolom] = df[kolom].apply(format_phone)
-    stats['telepon_fixed'] = fixed_count
-    print(f"  Telepon: {fixed_count} data di-format")
+    counts = transform_columns(df, config, 'telepon', format_telepon)
+    for kolom, fixed_count in counts.items():
+        stats['telepon_fixed'] = stats.get('telepon_fixed', 0) + fixed_count
+        print(f"  Telepon{column_note(counts, kolom)}: {fixed_count} data di-format")
     
     return df
 
 
 def remove_duplicates(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
     """Hapus baris duplikat berdasarkan kolom tertentu."""
-    kolom = config.get('kolom', [])
+    kolom = stage_columns(config)
     
     # Validasi kolom ada
     missing = [k for k in kolom if k not in df.columns]
@@ -157,7 +385,7 @@ def remove_duplicates(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFra
     df = df.drop_duplicates(subset=kolom, keep='first')
     removed = before - len(df)
     
-    stats['duplikat_removed'] = removed
+    stats['duplikat_removed'] = stats.get('duplikat_removed', 0) + removed
     print(f"  Duplikat: {removed} baris dihapus")
     
     return df
@@ -165,7 +393,7 @@ def remove_duplicates(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFra
 
 def remove_empty(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
     """Hapus baris dengan kolom kosong."""
-    kolom = config.get('kolom', [])
+    kolom = stage_columns(config)
     
     # Validasi kolom ada
     missing = [k for k in kolom if k not in df.columns]
@@ -180,15 +408,431 @@ def remove_empty(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
         df = df[df[k].astype(str).str.strip() != '']
     removed = before - len(df)
     
-    stats['empty_removed'] = removed
+    stats['empty_removed'] = stats.get('empty_removed', 0) + removed
     print(f"  Baris kosong: {removed} baris dihapus")
     
     return df
 
 
-def clean_data(config_path: str) -> None:
+def soundex(word: str) -> str:
+    """Kode Soundex 4 karakter (huruf awal + 3 angka), untuk blocking nama."""
+    if not word:
+        return ''
+    codes = {c: str(d) for d, letters in enumerate(
+        ['aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r']) for c in letters}
+    result, last = word[0].upper(), codes.get(word[0], '')
+    for c in word[1:]:
+        code = codes.get(c, '')
+        if code and code != '0' and code != last:
+            result += code
+        if c not in 'hw':
+            last = code
+    return (result + '000')[:4]
+
+
+def normalize_names(values: pd.Series) -> pd.Series:
+    """Nama huruf kecil a-z dengan satu spasi, untuk perbandingan kemiripan."""
+    return (values.fillna('').astype(str).str.lower()
+            .str.replace(r'[^a-z]+', ' ', regex=True).str.strip())
+
+
+def normalize_phones(values: pd.Series) -> pd.Series:
+    """Digit nomor telepon dengan prefix 62 diganti 0."""
+    digits = values.fillna('').astype(str).str.replace(r'\D', '', regex=True)
+    return digits.str.replace(r'^62', '0', regex=True)
+
+
+def name_signatures(names: pd.Series) -> np.ndarray:
+    """
+    Bitset bigram karakter setiap nama (SIGNATURE_WORDS x 64 bit), dipakai untuk
+    menghitung kemiripan Dice secara vektor: 2|A∩B| / (|A|+|B|).
+    """
+    import numpy as np
+    padded = (' ' + names.str.slice(0, NAME_WIDTH) + ' ').to_numpy(dtype=f'S{NAME_WIDTH + 2}')
+    chars = padded.view(np.uint8).reshape(len(padded), NAME_WIDTH + 2).astype(np.uint64)
+    first, second = chars[:, :-1], chars[:, 1:]
+    valid = (first > 0) & (second > 0)
+    
+    bucket = (first * np.uint64(131) + second) * np.uint64(2654435761) % np.uint64(64 * SIGNATURE_WORDS)
+    bits = np.where(valid, np.left_shift(np.uint64(1), bucket % np.uint64(64)), np.uint64(0))
+    word = bucket // np.uint64(64)
+    return np.stack([np.bitwise_or.reduce(np.where(word == w, bits, np.uint64(0)), axis=1)
+                     for w in range(SIGNATURE_WORDS)], axis=1)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Jumlah bit 1 per baris array uint64 (np.bitwise_count baru ada di numpy 2.0)."""
+    import numpy as np
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1)
+    bytes_ = np.ascontiguousarray(words).view(np.uint8).reshape(len(words), -1)
+    return np.unpackbits(bytes_, axis=1).sum(axis=1)
+
+
+def name_similarity(signatures: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Kemiripan Dice antar pasangan baris signature (0-1)."""
+    import numpy as np
+    a, b = signatures[left], signatures[right]
+    common = popcount(a & b)
+    total = popcount(a) + popcount(b)
+    return np.divide(2 * common, total, out=np.zeros(len(left)), where=total > 0)
+
+
+def block_pairs(keys: np.ndarray, rank: np.ndarray, window: int) -> tuple:
+    """
+    Pasangan kandidat (i, j) yang berada di blok sama. Baris diurutkan per blok
+    lalu per nama, dan setiap baris dibandingkan dengan `window` baris berikutnya:
+    blok kecil dibandingkan lengkap, blok besar jadi sorted neighborhood (tetap linear).
+    """
+    import numpy as np
+    import pandas as pd
+    codes, _ = pd.factorize(keys)
+    rows = np.flatnonzero(keys != '')
+    order = rows[np.lexsort((rank[rows], codes[rows]))]
+    sorted_codes = codes[order]
+    
+    left, right = [], []
+    for offset in range(1, min(window, len(order) - 1) + 1):
+        same = sorted_codes[offset:] == sorted_codes[:-offset]
+        left.append(order[:-offset][same])
+        right.append(order[offset:][same])
+    if not left:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    return np.concatenate(left), np.concatenate(right)
+
+
+def connected_components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Label cluster (posisi baris terkecil) dari pasangan duplikat, via propagasi label."""
+    import numpy as np
+    labels = np.arange(n)
+    while True:
+        smaller = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, smaller)
+        np.minimum.at(updated, right, smaller)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def remove_fuzzy_duplicates(df: pd.DataFrame, config: dict, stats: dict) -> pd.DataFrame:
+    """
+    Deteksi duplikat mirip (nama beda kapitalisasi/ejaan, format HP beda).
+    Kandidat hanya dibandingkan di dalam blok (akhiran HP, Soundex nama depan +
+    awalan nama belakang), lalu pasangan mirip digabung jadi cluster dan satu
+    baris per cluster dipilih sebagai survivor.
+    """
+    import numpy as np
+    import pandas as pd
+    kolom_nama = config.get('kolom_nama')
+    kolom_telepon = config.get('kolom_telepon')
+    missing = [k for k in (kolom_nama, kolom_telepon) if k and k not in df.columns]
+    if not kolom_nama or missing:
+        print(f"  Peringatan: Kolom {missing or ['kolom_nama']} tidak ditemukan, skip duplikat mirip")
+        return df
+    
+    threshold = config.get('ambang', 0.8)
+    phone_threshold = config.get('ambang_telepon', 0.5)
+    window = config.get('jendela', FUZZY_WINDOW)
+    n = len(df)
+    
+    # Nilai unik di-normalisasi sekali, lalu dipetakan balik ke baris
+    name_codes, name_uniques = pd.factorize(normalize_names(df[kolom_nama]), sort=True)
+    names = pd.Series(name_uniques)
+    tokens = names.str.split()
+    name_keys = (tokens.str[0].fillna('').map(soundex) + ':' + tokens.str[-1].fillna('').str[:2])
+    # Baris tanpa nama tidak ikut blocking, jadi tidak pernah masuk cluster
+    has_name = (names != '').to_numpy()[name_codes]
+    name_keys = name_keys.where(names != '', '').to_numpy()[name_codes]
+    signatures = name_signatures(names)
+    
+    if kolom_telepon:
+        phones = normalize_phones(df[kolom_telepon]).to_numpy()
+        suffix = pd.Series(phones).str[-PHONE_SUFFIX:]
+        suffix = suffix.where((suffix.str.len() >= PHONE_SUFFIX) & has_name, '')
+        blocks = [name_keys, suffix.to_numpy()]
+    else:
+        phones = np.full(n, '', dtype=object)
+        blocks = [name_keys]
+    
+    # Kandidat dari semua jenis blok, pasangan ganda dibuang
+    pairs = [block_pairs(keys, name_codes, window) for keys in blocks]
+    left = np.concatenate([p[0] for p in pairs])
+    right = np.concatenate([p[1] for p in pairs])
+    left, right = np.minimum(left, right), np.maximum(left, right)
+    unique_pairs = np.sort(left.astype(np.int64) * n + right)
+    unique_pairs = unique_pairs[np.r_[True, unique_pairs[1:] != unique_pairs[:-1]]] if len(unique_pairs) else unique_pairs
+    left, right = unique_pairs // n, unique_pairs % n
+    
+    similarity = name_similarity(signatures, name_codes[left], name_codes[right])
+    phone_left, phone_right = phones[left], phones[right]
+    both_phones = (phone_left != '') & (phone_right != '')
+    same_phone = both_phones & (phone_left == phone_right)
+    # Nomor HP berbeda berarti orang berbeda walaupun namanya mirip
+    match = ((similarity >= threshold) & ~(both_phones & ~same_phone)) | (same_phone & (similarity >= phone_threshold))
+    left, right = left[match], right[match]
+    
+    labels = connected_components(n, left, right)
+    sizes = np.bincount(labels, minlength=n)
+    in_cluster = np.flatnonzero(sizes[labels] > 1)
+    
+    # Survivor: baris dengan sel terisi terbanyak (lengkap) atau baris pertama (pertama)
+    members = pd.DataFrame({'cluster': labels[in_cluster], 'posisi': in_cluster})
+    if config.get('survivor', 'lengkap') == 'lengkap':
+        subset = df.iloc[in_cluster]
+        filled = subset.notna() & (subset.astype(str).apply(lambda col: col.str.strip()) != '')
+        members['skor'] = filled.sum(axis=1).to_numpy()
+    else:
+        members['skor'] = 0
+    members = members.sort_values(['cluster', 'skor', 'posisi'], ascending=[True, False, True], kind='stable')
+    members['survivor'] = ~members['cluster'].duplicated()
+    survivors = members.loc[members['survivor']].set_index('cluster')['posisi']
+    members['kemiripan'] = name_similarity(
+        signatures, name_codes[members['posisi'].to_numpy()],
+        name_codes[survivors.loc[members['cluster']].to_numpy()]).round(2)
+    
+    n_clusters = len(survivors)
+    drop = members.loc[~members['survivor'], 'posisi'].to_numpy()
+    print(f"  Duplikat mirip: {n_clusters} cluster, {len(drop)} baris "
+          f"{'dihapus' if config.get('hapus', True) else 'ditandai'} "
+          f"({len(left)} pasangan mirip dari {len(unique_pairs)} kandidat)")
+    
+    # Laporan cluster, nomor baris mengikuti baris Excel di file input
+    members = members.sort_values(['cluster', 'posisi'])
+    report = pd.DataFrame({
+        'Cluster': pd.factorize(members['cluster'])[0] + 1,
+        'Baris': df.index[members['posisi']] + 2,
+        'Survivor': np.where(members['survivor'], 'Ya', 'Tidak'),
+        'Kemiripan': members['kemiripan'].to_numpy(),
+    })
+    for kolom in (kolom_nama, kolom_telepon):
+        if kolom:
+            report[kolom] = df[kolom].to_numpy()[members['posisi']]
+    
+    for cluster, rows in report[report['Cluster'] <= FUZZY_PREVIEW].groupby('Cluster'):
+        detail = ', '.join(f"{r[kolom_nama]!s} (baris {r['Baris']}{', survivor' if r['Survivor'] == 'Ya' else ''})"
+                           for _, r in rows.iterrows())
+        print(f"    Cluster {cluster}: {detail}")
+    if n_clusters > FUZZY_PREVIEW:
+        print(f"    ... dan {n_clusters - FUZZY_PREVIEW} cluster lainnya")
+    
+    if config.get('laporan'):
+        path = Path(config['laporan'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        output_format = next((f for f, ext in OUTPUT_FORMATS.items() if ext == path.suffix), 'xlsx')
+        saved = save_dataframe(report, path, output_format)
+        print(f"  Laporan cluster disimpan ke: {', '.join(map(str, saved))}")
+    
+    stats['mirip_clusters'] = stats.get('mirip_clusters', 0) + n_clusters
+    if not config.get('hapus', True):
+        return df
+    
+    stats['mirip_removed'] = stats.get('mirip_removed', 0) + len(drop)
+    return df.drop(index=df.index[drop])
+
+
+# Jenis tahap cleaning; urutan dict ini juga urutan eksekusi config format lama (dict)
+CLEANERS = {
+    'nama': clean_nama,
+    'tanggal': clean_tanggal,
+    'telepon': clean_telepon,
+    'duplikat': remove_duplicates,
+    'hapus_kosong': remove_empty,
+    'duplikat_mirip': remove_fuzzy_duplicates,
+}
+
+# Tahap yang membuang baris; kandidat untuk dimajukan oleh planner
+FILTER_STAGES = {'duplikat', 'hapus_kosong', 'duplikat_mirip'}
+
+# Transformasi per sel yang mengembalikan nilai kosong apa adanya dan tidak pernah
+# menghasilkan nilai kosong, sehingga hapus_kosong boleh dijalankan sebelumnya
+EMPTY_PRESERVING = {'nama', 'tanggal', 'telepon'}
+
+
+def stage_columns(stage: dict) -> list:
+    """Daftar kolom yang dipakai satu tahap (kolom bisa string atau list)."""
+    kolom = stage.get('kolom')
+    if kolom is None:
+        return [stage[key] for key in ('kolom_nama', 'kolom_telepon') if stage.get(key)]
+    return [kolom] if isinstance(kolom, str) else list(kolom)
+
+
+def build_stages(cleaning) -> list:
+    """
+    Ubah bagian `cleaning` di config menjadi list tahap berurutan.
+    
+    Format list: setiap item punya `type` (nama, tanggal, telepon, duplikat,
+    hapus_kosong), tipe yang sama boleh muncul berkali-kali. Format dict (lama)
+    dijalankan dengan urutan tetap sesuai CLEANERS.
+    """
+    if isinstance(cleaning, dict):
+        items = []
+        for stage_type in CLEANERS:
+            value = cleaning.get(stage_type)
+            for item in (value if isinstance(value, list) else [value] if value else []):
+                items.append({**item, 'type': stage_type})
+    else:
+        items = list(cleaning or [])
+    
+    stages = []
+    for position, item in enumerate(items, 1):
+        stage_type = item.get('type') if isinstance(item, dict) else None
+        if stage_type not in CLEANERS:
+            print(f"Error: Tahap cleaning ke-{position} punya type '{stage_type}' yang tidak dikenal")
+            print(f"Type yang tersedia: {', '.join(CLEANERS)}")
+            sys.exit(1)
+        stages.append({**item, 'posisi': position})
+    return stages
+
+
+def can_run_before(stage: dict, before: dict) -> bool:
+    """Cek apakah filter `stage` boleh dijalankan sebelum tahap `before` tanpa mengubah hasil."""
+    columns, before_columns = set(stage_columns(stage)), set(stage_columns(before))
+    
+    if before['type'] in FILTER_STAGES:
+        types = {stage['type'], before['type']}
+        if types == {'hapus_kosong'}:
+            return True
+        if 'hapus_kosong' in types and len(types) == 2:
+            # Hanya aman jika kolom hapus_kosong bagian dari kunci duplikat: baris
+            # yang duplikat pasti sama-sama kosong atau sama-sama terisi. Untuk
+            # duplikat_mirip, baris tanpa nama tidak pernah ikut blocking/cluster
+            kosong, other = (stage, before) if stage['type'] == 'hapus_kosong' else (before, stage)
+            keys = stage_columns(other) if other['type'] == 'duplikat' else [other.get('kolom_nama')]
+            return set(stage_columns(kosong)) <= set(keys)
+        return False
+    
+    # Transformasi bekerja per baris, jadi filter di kolom lain tidak terpengaruh
+    if stage['type'] == 'hapus_kosong' and before['type'] in EMPTY_PRESERVING:
+        return True
+    return not columns & before_columns
+
+
+def plan_stages(stages: list, reorder: bool = True) -> list:
+    """
+    Susun urutan eksekusi: filter baris (hapus_kosong, duplikat) dimajukan
+    sebelum transformasi selama hasil akhirnya tetap sama, agar baris yang
+    akan dibuang tidak ikut diproses tahap yang mahal (misal parsing tanggal).
+    """
+    plan = []
+    for stage in stages:
+        position = len(plan)
+        if reorder and stage['type'] in FILTER_STAGES:
+            while position > 0 and can_run_before(stage, plan[position - 1]):
+                position -= 1
+            # Jangan ubah urutan antar filter jika tidak melewati transformasi apa pun
+            while position < len(plan) and plan[position]['type'] in FILTER_STAGES:
+                position += 1
+        plan.insert(position, stage)
+    return plan
+
+
+def stage_label(stage: dict) -> str:
+    """Label tahap untuk rencana eksekusi dan profil, misal: tanggal [Tanggal Lahir]."""
+    return f"{stage['type']} [{', '.join(map(str, stage_columns(stage)))}]"
+
+
+def print_plan(plan: list) -> None:
+    """Print urutan tahap yang akan dijalankan."""
+    print("\nRencana eksekusi:")
+    for number, stage in enumerate(plan, 1):
+        note = f"  (dimajukan dari urutan {stage['posisi']})" if stage['posisi'] > number else ""
+        print(f"  {number}. {stage_label(stage)}{note}")
+
+
+def arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah kolom object dengan tipe campuran ke string agar bisa ditulis pyarrow."""
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def excel_cell(value):
+    """Konversi nilai kosong pandas (NaN/NaT/NA) ke None agar bisa ditulis openpyxl."""
+    import pandas as pd
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+def write_excel(df: pd.DataFrame, path: Path, include_header: bool = True,
+                rollover: str = 'sheet', max_rows: int = EXCEL_MAX_ROWS) -> list:
+    """
+    Tulis DataFrame ke xlsx. Jika jumlah baris melebihi batas Excel, data
+    di-stream (write-only) ke beberapa sheet atau file bernomor.
+    
+    Returns:
+        list path file yang ditulis
+    """
+    from openpyxl import Workbook
+    path = Path(path)
+    rows_per_part = max_rows - (1 if include_header else 0)
+    
+    # Cek jumlah baris sebelum menulis, bukan setelah gagal di akhir
+    if len(df) <= rows_per_part:
+        df.to_excel(path, index=False, header=include_header)
+        return [path]
+    
+    n_parts = math.ceil(len(df) / rows_per_part)
+    print(f"  Info: {len(df)} baris melebihi batas Excel ({max_rows} baris), "
+          f"dipecah ke {n_parts} {'file' if rollover == 'file' else 'sheet'}")
+    
+    paths = []
+    wb = Workbook(write_only=True)
+    for part in range(n_parts):
+        chunk = df.iloc[part * rows_per_part:(part + 1) * rows_per_part]
+        
+        if rollover == 'file':
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Sheet1')
+        else:
+            ws = wb.create_sheet(f'Sheet{part + 1}')
+        
+        if include_header:
+            ws.append([str(col) for col in df.columns])
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append([excel_cell(v) for v in row])
+        
+        if rollover == 'file':
+            part_path = path.with_name(f"{path.stem}_{part + 1:03d}{path.suffix}")
+            wb.save(part_path)
+            paths.append(part_path)
+    
+    if rollover != 'file':
+        wb.save(path)
+        paths.append(path)
+    
+    return paths
+
+
+def save_dataframe(df: pd.DataFrame, output_file: Path, output_format: str = 'xlsx',
+                   rollover: str = 'sheet') -> list:
+    """Simpan DataFrame sesuai format output, return list path file yang ditulis."""
+    path = Path(output_file).with_suffix(OUTPUT_FORMATS[output_format])
+    
+    if output_format == 'csv':
+        df.to_csv(path, index=False)
+    elif output_format == 'parquet':
+        arrow_safe(df).to_parquet(path, index=False)
+    elif output_format == 'feather':
+        arrow_safe(df).reset_index(drop=True).to_feather(path)
+    else:
+        return write_excel(df, path, rollover=rollover)
+    
+    return [path]
+
+
+def clean_data(config_path: str, output_format: str = None, rollover: str = None,
+               profiler: Profiler = None, reorder: bool = None, workers: int = None,
+               processes: int = None) -> None:
     """Main function untuk membersihkan data."""
     
+    profiler = profiler or Profiler()
+    
     # Load config
     config = load_config(config_path)
     script_dir = Path(__file__).parent
@@ -196,43 +840,92 @@ def clean_data(config_path: str) -> None:
     input_file = script_dir / config['input']
     output_file = script_dir / config['output']
     cleaning = config.get('cleaning', {})
+    output_format = output_format or config.get('output_format', 'xlsx')
+    rollover = rollover or config.get('rollover', 'sheet')
+    reorder = reorder if reorder is not None else config.get('reorder', True)
+    workers = workers or config.get('workers')
+    processes = processes or config.get('processes')
     
     # Validasi input
     if not input_file.exists():
         print(f"Error: File '{input_file}' tidak ditemukan")
         sys.exit(1)
     
-    print(f"Membaca file: {input_file}")
-    df = pd.read_excel(input_file)
-    print(f"Total baris: {len(df)}")
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
     
-    stats = {}
-    print("\nProses cleaning:")
+    if workers is not None and workers < 1:
+        print("Error: --workers minimal 1")
+        sys.exit(1)
     
-    # Jalankan cleaning sesuai config
-    if 'nama' in cleaning:
-        df = clean_nama(df, cleaning['nama'], stats)
+    if processes is not None and processes < 1:
+        print("Error: --processes minimal 1")
+        sys.exit(1)
     
-    if 'tanggal' in cleaning:
-        df = clean_tanggal(df, cleaning['tanggal'], stats)
+    plan = plan_stages(build_stages(cleaning), reorder)
     
-    if 'telepon' in cleaning:
-        df = clean_telepon(df, cleaning['telepon'], stats)
+    # pandas baru di-import setelah input valid, agar error input tetap cepat
+    import pandas as pd
     
-    if 'duplikat' in cleaning:
-        df = remove_duplicates(df, cleaning['duplikat'], stats)
+    print(f"Membaca file: {input_file}")
+    with profiler.stage("read"):
+        df = pd.read_excel(input_file)
+    print(f"Total baris: {len(df)}")
     
-    if 'hapus_kosong' in cleaning:
-        df = remove_empty(df, cleaning['hapus_kosong'], stats)
+    stats = {}
+    print_plan(plan)
+    print("\nProses cleaning:")
+    
+    # Jalankan cleaning sesuai rencana eksekusi
+    for stage in plan:
+        # Path laporan tahap (misal cluster duplikat mirip) relatif terhadap folder script
+        if stage.get('laporan'):
+            stage = {**stage, 'laporan': script_dir / stage['laporan']}
+        with profiler.stage(stage_label(stage)):
+            df = CLEANERS[stage['type']](df, {'workers': workers, 'processes': processes, **stage}, stats)
     
     # Simpan hasil
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    df.to_excel(output_file, index=False)
+    with profiler.stage("write"):
+        saved_paths = save_dataframe(df, output_file, output_format, rollover)
     
-    print(f"\nBerhasil! Data bersih disimpan ke: {output_file}")
+    print(f"\nBerhasil! Data bersih disimpan ke: {', '.join(map(str, saved_paths))}")
     print(f"Total baris setelah cleaning: {len(df)}")
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description='Membersihkan data Excel berdasarkan konfigurasi YAML'
+    )
+    parser.add_argument('config', nargs='?', default='config.yaml', help='File konfigurasi YAML')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS),
+                        help='Format file output (default: xlsx atau sesuai config)')
+    parser.add_argument('--rollover', choices=ROLLOVER_MODES,
+                        help='Jika melebihi batas baris Excel, pecah ke sheet atau file bernomor (default: sheet)')
+    parser.add_argument('--no-reorder', dest='reorder', action='store_false', default=None,
+                        help='Jalankan tahap cleaning persis sesuai urutan config')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Jumlah thread untuk memproses beberapa kolom dalam satu tahap (default: jumlah CPU)')
+    parser.add_argument('--processes', '-p', type=int,
+                        help='Jumlah proses untuk parsing nilai tanggal unik (default: 1, tanpa process pool)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tampilkan durasi dan memori setiap tahap')
+    parser.add_argument('--profile-output', help='Simpan profil ke file JSON')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Format file profil: json atau chrome (trace event)')
+    
+    args = parser.parse_args()
+    
+    profiler = Profiler(enabled=args.profile or bool(args.profile_output))
+    clean_data(args.config, args.output_format, args.rollover, profiler, args.reorder, args.workers, args.processes)
+    
+    if args.profile:
+        profiler.print_report()
+    if args.profile_output:
+        profiler.export(args.profile_output, args.profile_format)
+
+
 if __name__ == "__main__":
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "config.yaml"
-    clean_data(config_file)
+    main()
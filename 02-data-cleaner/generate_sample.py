@@ -2,10 +2,19 @@
 Generate sample data kotor untuk testing Data Cleaner
 """
 
+import random
 import pandas as pd
 from pathlib import Path
 
 
+NAMA_DEPAN = ['Budi', 'Siti', 'Ahmad', 'Dewi', 'Rudi', 'Maya', 'Joko', 'Mega', 'Andi', 'Rina']
+NAMA_BELAKANG = ['Santoso', 'Nurhaliza', 'Dahlan', 'Lestari', 'Hartono', 'Sari', 'Widodo', 'Wati']
+BULAN = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli', 'Agustus',
+         'September', 'Oktober', 'November', 'Desember']
+KOTA = ['Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Semarang', 'Medan', 'Makassar',
+        'Denpasar', 'Palembang']
+
+
 def generate_dirty_data():
     """Generate data dengan berbagai masalah untuk di-clean."""
     
@@ -21,6 +30,7 @@ def generate_dirty_data():
             '',                       # Kosong
             'joko widodo',            # Lowercase
             'MEGAWATI SOEKARNO',      # Uppercase
+            'Budi Santosa',           # Duplikat mirip (salah ketik)
         ],
         'Tanggal Lahir': [
             '15/01/1990',             # Format slash
@@ -33,6 +43,7 @@ def generate_dirty_data():
             '01-01-2000',             # Placeholder
             '1975-08-17',             # Format ISO
             '25/12/1980',             # Format slash
+            '15/01/1990',             # Duplikat mirip
         ],
         'No HP': [
             '081234567890',           # Tanpa format
@@ -45,6 +56,7 @@ def generate_dirty_data():
             '0817 4567 8905',         # Format dengan spasi
             '0818-4567-8906',         # Sudah ada dash
             '081945678907',           # Tanpa format
+            '+62 812-3456-7890',      # Duplikat mirip (format beda)
         ],
         'Email': [
             'budi@email.com',
@@ -57,6 +69,7 @@ def generate_dirty_data():
             '',                       # Kosong
             'joko@email.com',
             'mega@email.com',
+            'budi@email.com',         # Duplikat mirip
         ],
         'Kota': [
             'Jakarta',
@@ -69,6 +82,7 @@ def generate_dirty_data():
             'Makassar',
             'Denpasar',
             'Palembang',
+            'Jakarta',                # Duplikat mirip
         ]
     }
     
@@ -86,5 +100,70 @@ def generate_dirty_data():
     print(df.to_string())
 
 
+
+def dirty_name(rng: random.Random, name: str) -> str:
+    """Buat variasi nama kotor (kapitalisasi dan spasi berlebih)."""
+    return rng.choice([
+        lambda n: f'  {n.upper()}  ',
+        lambda n: n.lower(),
+        lambda n: n.upper().replace(' ', '   '),
+        lambda n: n.lower().replace(' ', '  '),
+        lambda n: n,
+        lambda n: f'  {n.lower().replace(" ", "   ")}  ',
+    ])(name)
+
+
+def dirty_date(rng: random.Random) -> str:
+    """Buat tanggal dengan format campur aduk seperti di sample."""
+    year, month, day = rng.randint(1970, 2005), rng.randint(1, 12), rng.randint(1, 28)
+    return rng.choice([
+        f'{day:02d}/{month:02d}/{year}',
+        f'{year}-{month:02d}-{day:02d}',
+        f'{day:02d} {BULAN[month - 1]} {year}',
+        f'{day:02d}-{month:02d}-{year}',
+        f'{year}/{month:02d}/{day:02d}',
+    ])
+
+
+def dirty_phone(rng: random.Random) -> str:
+    """Buat nomor HP dengan format campur aduk seperti di sample."""
+    digits = f'8{rng.randint(10, 19)}{rng.randint(0, 99999999):08d}'
+    return rng.choice([
+        f'0{digits}',
+        f'+62 {digits[:3]} {digits[3:7]} {digits[7:]}',
+        f'0{digits[:3]}-{digits[3:7]}-{digits[7:]}',
+        f'62 {digits[:3]} {digits[3:6]} {digits[6:]}',
+        f'0{digits[:3]}.{digits[3:7]}.{digits[7:]}',
+        f'+62-{digits[:3]}-{digits[3:7]}-{digits[7:]}',
+    ])
+
+
+def generate_dirty_data_scaled(num_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate data kotor dalam jumlah besar (untuk benchmark).
+    
+    Rasio masalah mengikuti sample: ~10% duplikat, ~10% nama kosong,
+    sebagian besar nama/tanggal/No HP perlu distandardisasi.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(num_rows):
+        if rows and rng.random() < 0.1:
+            # Duplikat dari baris sebelumnya
+            rows.append(dict(rng.choice(rows)))
+            continue
+        
+        depan, belakang = rng.choice(NAMA_DEPAN), rng.choice(NAMA_BELAKANG)
+        empty = rng.random() < 0.1
+        rows.append({
+            'Nama Lengkap': '' if empty else dirty_name(rng, f'{depan} {belakang}'),
+            'Tanggal Lahir': dirty_date(rng),
+            'No HP': dirty_phone(rng),
+            'Email': '' if empty else f'{depan.lower()}{i}@email.com',
+            'Kota': rng.choice(KOTA),
+        })
+    return pd.DataFrame(rows)
+
+
 if __name__ == "__main__":
     generate_dirty_data()
@@ -3,15 +3,53 @@ Excel Splitter - Memecah file Excel berdasarkan nilai kolom tertentu
 Mendukung konfigurasi via YAML dan CLI arguments (hybrid)
 """
 
+from __future__ import annotations
+
 import sys
+import re
+import math
+import json
+import time
 import argparse
-import pandas as pd
-import yaml
+import tracemalloc
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Library berat (pandas, openpyxl, dst.) di-import di dalam fungsi yang memakainya,
+# agar --help dan error argumen/config tidak menunggu import pandas
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+# Format output yang didukung beserta ekstensi filenya
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# Batas jumlah baris per sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Mode pemecahan jika data melebihi batas baris Excel
+ROLLOVER_MODES = ['sheet', 'file']
+
+# Nama file split index (mapping grup -> offset baris) di folder output
+SPLIT_INDEX_FILENAME = 'split_index.json'
+
+# Nama file manifest part file (jika max_rows/max_bytes per file diisi)
+MANIFEST_FILENAME = 'manifest.json'
+
+# Satuan ukuran untuk max_bytes_per_file (misal "50MB")
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
 
 
 def load_config(config_path: str) -> dict:
     """Load konfigurasi dari file YAML."""
+    import yaml
     config_file = Path(config_path)
     if config_file.exists():
         with open(config_file, 'r', encoding='utf-8') as f:
@@ -19,6 +57,104 @@ def load_config(config_path: str) -> dict:
     return {}
 
 
+# Profiler, arrow_safe, excel_cell, dan OUTPUT_FORMATS sengaja disalin identik ke setiap
+# utility agar folder ini bisa dipakai sendiri tanpa folder lain. Jika diubah, ubah semua
+# salinannya lalu jalankan `python common/check_copies.py` dari root repo.
+class Profiler:
+    """Catat durasi dan pemakaian memori setiap tahap proses (aktif dengan --profile)."""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []  # List of {name, start, duration, depth, mem_peak_mb, mem_delta_mb}
+        self._origin = time.perf_counter()
+        self._peaks = []  # Peak memori tahap induk yang sedang berjalan
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Ukur satu tahap, contoh: with profiler.stage('read'): ..."""
+        if not self.enabled:
+            yield
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        mem_start, peak_so_far = tracemalloc.get_traced_memory()
+        # Simpan peak tahap induk sebelum di-reset oleh tahap ini
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak_so_far)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            mem_end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            
+            self.stages.append({
+                'name': name,
+                'start': start - self._origin,
+                'duration': duration,
+                'depth': len(self._peaks),
+                'mem_peak_mb': peak / 1024 ** 2,
+                'mem_delta_mb': (mem_end - mem_start) / 1024 ** 2,
+            })
+    
+    def sorted_stages(self) -> list:
+        """Tahap diurutkan berdasarkan waktu mulai."""
+        return sorted(self.stages, key=lambda s: s['start'])
+    
+    def total_duration(self) -> float:
+        """Total durasi tahap level teratas."""
+        return sum(s['duration'] for s in self.stages if s['depth'] == 0)
+    
+    def print_report(self) -> None:
+        """Print tabel profil ke console."""
+        if not self.enabled or not self.stages:
+            return
+        
+        total = self.total_duration()
+        print("\n" + "=" * 50)
+        print("PROFIL")
+        print("=" * 50)
+        print(f"\n  {'Tahap':<34} {'Waktu (s)':>10} {'%':>6} {'Peak (MB)':>10} {'Delta (MB)':>11}")
+        for s in self.sorted_stages():
+            name = '  ' * s['depth'] + s['name']
+            pct = s['duration'] / total * 100 if total else 0
+            print(f"  {name:<34} {s['duration']:>10.3f} {pct:>6.1f} "
+                  f"{s['mem_peak_mb']:>10.1f} {s['mem_delta_mb']:>+11.1f}")
+        print(f"  {'Total':<34} {total:>10.3f}")
+    
+    def export(self, output_path: str, output_format: str = 'json') -> None:
+        """Simpan profil ke JSON, atau format trace event Chrome (chrome://tracing, Perfetto)."""
+        if not self.enabled:
+            return
+        
+        if output_format == 'chrome':
+            data = {'traceEvents': [{
+                'name': s['name'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6),
+                'dur': round(s['duration'] * 1e6),
+                'pid': 1,
+                'tid': 1,
+                'args': {'mem_peak_mb': round(s['mem_peak_mb'], 2),
+                         'mem_delta_mb': round(s['mem_delta_mb'], 2)},
+            } for s in self.sorted_stages()]}
+        else:
+            data = {'total_s': self.total_duration(), 'stages': self.sorted_stages()}
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profil disimpan ke: {output_path}")
+
+
+
 def sanitize_filename(name: str) -> str:
     """Bersihkan nama file dari karakter yang tidak valid."""
     invalid_chars = '<>:"/\\|?*'
@@ -27,68 +163,461 @@ def sanitize_filename(name: str) -> str:
     return name.strip()
 
 
+def arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah kolom object dengan tipe campuran ke string agar bisa ditulis pyarrow."""
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def excel_cell(value):
+    """Konversi nilai kosong pandas (NaN/NaT/NA) ke None agar bisa ditulis openpyxl."""
+    import pandas as pd
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+def append_rows(ws, df: pd.DataFrame, include_header: bool = True) -> None:
+    """Tambahkan header dan baris DataFrame ke worksheet (write-only)."""
+    if include_header:
+        ws.append([str(col) for col in df.columns])
+    for row in df.itertuples(index=False, name=None):
+        ws.append([excel_cell(v) for v in row])
+
+
+def write_excel(df: pd.DataFrame, path: Path, include_header: bool = True,
+                rollover: str = 'sheet', max_rows: int = EXCEL_MAX_ROWS) -> list:
+    """
+    Tulis DataFrame ke xlsx. Jika jumlah baris melebihi batas Excel, data
+    di-stream (write-only) ke beberapa sheet atau file bernomor.
+    
+    Returns:
+        list path file yang ditulis
+    """
+    from openpyxl import Workbook
+    path = Path(path)
+    rows_per_part = max_rows - (1 if include_header else 0)
+    
+    # Cek jumlah baris sebelum menulis, bukan setelah gagal di akhir
+    if len(df) <= rows_per_part:
+        df.to_excel(path, index=False, header=include_header)
+        return [path]
+    
+    n_parts = math.ceil(len(df) / rows_per_part)
+    print(f"  Info: {len(df)} baris melebihi batas Excel ({max_rows} baris), "
+          f"dipecah ke {n_parts} {'file' if rollover == 'file' else 'sheet'}")
+    
+    paths = []
+    wb = Workbook(write_only=True)
+    for part in range(n_parts):
+        chunk = df.iloc[part * rows_per_part:(part + 1) * rows_per_part]
+        
+        if rollover == 'file':
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Sheet1')
+        else:
+            ws = wb.create_sheet(f'Sheet{part + 1}')
+        
+        append_rows(ws, chunk, include_header)
+        
+        if rollover == 'file':
+            part_path = path.with_name(f"{path.stem}_{part + 1:03d}{path.suffix}")
+            wb.save(part_path)
+            paths.append(part_path)
+    
+    if rollover != 'file':
+        wb.save(path)
+        paths.append(path)
+    
+    return paths
+
+
+def save_dataframe(df: pd.DataFrame, filepath: Path, output_format: str = 'xlsx',
+                   include_header: bool = True, rollover: str = 'sheet') -> list:
+    """Simpan DataFrame sesuai format output, return list path file yang ditulis."""
+    if output_format == 'csv':
+        df.to_csv(filepath, index=False, header=include_header)
+    elif output_format == 'parquet':
+        arrow_safe(df).to_parquet(filepath, index=False)
+    elif output_format == 'feather':
+        arrow_safe(df).reset_index(drop=True).to_feather(filepath)
+    else:
+        return write_excel(df, filepath, include_header, rollover)
+    
+    return [filepath]
+
+
+def parse_size(value) -> int:
+    """Ubah ukuran seperti 50MB / 500KB / 1048576 menjadi jumlah byte."""
+    if value is None or isinstance(value, int):
+        return value
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"Format ukuran tidak valid: {value}")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit or 'B'])
+
+
+def estimate_row_bytes(df: pd.DataFrame) -> np.ndarray:
+    """Perkiraan ukuran tiap baris dalam byte (panjang teks seperti CSV, sebelum kompresi)."""
+    import numpy as np
+    # Satu separator/newline per kolom
+    sizes = np.full(len(df), len(df.columns), dtype=np.int64)
+    for col in df.columns:
+        sizes += df[col].astype(str).str.len().to_numpy(dtype=np.int64)
+    return sizes
+
+
+def plan_parts(df: pd.DataFrame, max_rows: int = None, max_bytes: int = None) -> list:
+    """Tentukan batas (start, end) tiap part file sesuai max_rows dan max_bytes."""
+    import numpy as np
+    n = len(df)
+    cum_bytes = np.cumsum(estimate_row_bytes(df)) if max_bytes else None
+    
+    bounds = []
+    start = 0
+    while start < n:
+        end = min(start + max_rows, n) if max_rows else n
+        if max_bytes:
+            base = cum_bytes[start - 1] if start else 0
+            end_by_size = int(np.searchsorted(cum_bytes, base + max_bytes, side='right'))
+            # Minimal satu baris per part, meski satu baris sudah melebihi batas
+            end = min(end, max(end_by_size, start + 1))
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def write_parts(df: pd.DataFrame, filepath: Path, output_format: str = 'xlsx',
+                include_header: bool = True, max_rows: int = None,
+                max_bytes: int = None) -> list:
+    """
+    Tulis satu grup ke part file bernomor ({nama}_part001.xlsx, ...).
+    
+    Setiap part ditulis lalu ditutup sebelum part berikutnya, dan untuk xlsx
+    memakai workbook write-only, sehingga memori per writer tetap terbatas.
+    
+    Returns:
+        list dict {file, rows, bytes} untuk manifest
+    """
+    if output_format == 'xlsx':
+        excel_rows = EXCEL_MAX_ROWS - (1 if include_header else 0)
+        max_rows = min(max_rows, excel_rows) if max_rows else excel_rows
+    if max_bytes and include_header:
+        # Header ikut ditulis di setiap part
+        header_bytes = sum(len(str(col)) + 1 for col in df.columns)
+        max_bytes = max(max_bytes - header_bytes, 1)
+    
+    bounds = plan_parts(df, max_rows, max_bytes)
+    
+    parts = []
+    for number, (start, end) in enumerate(bounds, 1):
+        chunk = df.iloc[start:end]
+        if len(bounds) == 1:
+            part_path = filepath
+        else:
+            part_path = filepath.with_name(f"{filepath.stem}_part{number:03d}{filepath.suffix}")
+        
+        if output_format == 'xlsx':
+            from openpyxl import Workbook
+            wb = Workbook(write_only=True)
+            append_rows(wb.create_sheet('Sheet1'), chunk, include_header)
+            wb.save(part_path)
+        else:
+            save_dataframe(chunk, part_path, output_format, include_header)
+        
+        parts.append({
+            'file': part_path.name,
+            'rows': len(chunk),
+            'bytes': part_path.stat().st_size,
+        })
+    return parts
+
+
+def write_manifest(manifest_path: Path, manifest: dict) -> None:
+    """Simpan manifest part file per grup ke JSON."""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def write_partitioned_dataset(df: pd.DataFrame, split_by: list, output_path: Path) -> None:
+    """Tulis dataset Parquet ber-partisi Hive (folder kolom=nilai) berdasarkan split_by."""
+    groups = df.groupby(split_by).size()
+    
+    print(f"\nMenulis dataset Parquet ber-partisi berdasarkan kolom: {', '.join(split_by)}")
+    print(f"Ditemukan {len(groups)} partisi\n")
+    
+    # Timpa partisi yang ditulis ulang (default pyarrow menambah file baru, jadi
+    # menjalankan ulang akan menggandakan data), sama seperti output lain yang menimpa
+    arrow_safe(df).to_parquet(output_path, partition_cols=split_by, index=False,
+                              existing_data_behavior='delete_matching')
+    
+    for group_name, rows in groups.items():
+        key = group_name if isinstance(group_name, tuple) else (group_name,)
+        partition = '/'.join(f"{col}={val}" for col, val in zip(split_by, key))
+        print(f"  - {partition}/: {rows} baris")
+    
+    print(f"\nBerhasil! Dataset Parquet dibuat di folder '{output_path}'")
+    print(f"Total baris: {int(groups.sum())}")
+
+
+def group_label(key: tuple) -> str:
+    """Label grup dari nilai kolom split, dipakai untuk nama file dan --only."""
+    return '_'.join(str(v) for v in key)
+
+
+def to_json_value(value):
+    """Konversi nilai numpy/pandas ke tipe yang bisa disimpan di JSON."""
+    import numpy as np
+    import pandas as pd
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def build_split_index(df: pd.DataFrame, split_by: list) -> dict:
+    """
+    Bangun mapping grup -> offset baris dalam satu pass factorize.
+    
+    Baris dengan nilai kosong di salah satu kolom split diabaikan
+    (sama seperti groupby). Offset adalah posisi baris data (0 = baris
+    pertama setelah header).
+    """
+    import numpy as np
+    import pandas as pd
+    codes, uniques = pd.MultiIndex.from_frame(df[split_by]).factorize(sort=True)
+    codes = np.asarray(codes).copy()
+    codes[df[split_by].isna().any(axis=1).to_numpy()] = -1
+    
+    # Urutkan posisi baris per kode grup, lalu potong sesuai jumlah per grup
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    start = int((codes < 0).sum())
+    
+    # Grup dibedakan dari tuple nilainya; label hanya nama tampilan/file, jadi
+    # label yang bentrok (misal ('A_B', 'C') dan ('A', 'B_C') -> A_B_C, atau dua
+    # nilai yang sama setelah sanitize_filename) diberi akhiran _2, _3, ...
+    groups = {}
+    used = set()
+    for key, count in zip(uniques, counts):
+        if count == 0:
+            continue
+        base = label = group_label(key)
+        n = 1
+        while sanitize_filename(label).lower() in used:
+            n += 1
+            label = f"{base}_{n}"
+        if label != base:
+            print(f"  Peringatan: Label grup {list(key)} bentrok dengan grup lain, dipakai label '{label}'")
+        used.add(sanitize_filename(label).lower())
+        groups[label] = {
+            'key': [to_json_value(v) for v in key],
+            'offsets': order[start:start + count].tolist(),
+        }
+        start += count
+    return groups
+
+
+def save_split_index(index_path: Path, input_path: Path, split_by: list,
+                     total_rows: int, groups: dict) -> None:
+    """Simpan split index beserta sidik file sumber (mtime dan ukuran)."""
+    stat = input_path.stat()
+    index = {
+        'source': str(input_path.resolve()),
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'split_by': split_by,
+        'total_rows': total_rows,
+        'groups': groups,
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+def load_split_index(index_path: Path, input_path: Path, split_by: list) -> dict:
+    """Load split index jika masih cocok dengan file sumber dan kolom split, else None."""
+    if not index_path.exists():
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    
+    stat = input_path.stat()
+    if (index.get('source') != str(input_path.resolve())
+            or index.get('mtime') != stat.st_mtime
+            or index.get('size') != stat.st_size
+            or index.get('split_by') != split_by):
+        return None
+    return index
+
+
+def read_rows(input_file: str, offsets: np.ndarray) -> pd.DataFrame:
+    """Baca hanya baris data pada offset tertentu (offset sudah terurut)."""
+    import pandas as pd
+    wanted = set(offsets.tolist())
+    # Baris 0 adalah header, baris data ke-i ada di baris file ke-(i + 1)
+    return pd.read_excel(input_file, skiprows=lambda i: i > 0 and (i - 1) not in wanted)
+
+
 def split_excel(
     input_file: str,
-    split_by: str,
+    split_by,
     output_folder: str = "output",
     prefix: str = "",
     suffix: str = "",
-    include_header: bool = True
+    include_header: bool = True,
+    output_format: str = "xlsx",
+    partitioned: bool = False,
+    rollover: str = "sheet",
+    only: list = None,
+    max_rows_per_file: int = None,
+    max_bytes_per_file=None,
+    profiler: Profiler = None
 ) -> None:
     """
     Memecah file Excel berdasarkan nilai kolom tertentu.
     
     Args:
         input_file: Path ke file Excel input
-        split_by: Nama kolom untuk split
+        split_by: Nama kolom untuk split, atau list kolom untuk split komposit
         output_folder: Folder output
         prefix: Prefix untuk nama file output
         suffix: Suffix untuk nama file output
         include_header: Sertakan header di setiap file
+        output_format: Format file output (xlsx, csv, parquet, feather)
+        partitioned: Tulis satu dataset Parquet ber-partisi Hive, bukan file per grup
+        rollover: Jika grup melebihi batas baris Excel, pecah ke 'sheet' atau 'file' bernomor
+        only: Hanya export grup dengan label ini (memakai split index jika masih valid)
+        max_rows_per_file: Maksimal baris per file, grup lebih besar dipecah ke part file
+        max_bytes_per_file: Perkiraan ukuran maksimal per file (byte atau "50MB")
+        profiler: Profiler untuk mencatat durasi dan memori setiap tahap
     """
+    profiler = profiler or Profiler()
+    split_by = [split_by] if isinstance(split_by, str) else list(split_by)
     input_path = Path(input_file)
     
     if not input_path.exists():
         print(f"Error: File '{input_file}' tidak ditemukan")
         sys.exit(1)
     
-    print(f"Membaca file: {input_file}")
-    df = pd.read_excel(input_file)
-    print(f"Total baris: {len(df)}")
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    
+    if partitioned and output_format != 'parquet':
+        print("Error: Mode partitioned hanya bisa dipakai dengan format output parquet")
+        sys.exit(1)
+    
+    if partitioned and only:
+        print("Error: --only tidak bisa dipakai bersama mode partitioned")
+        sys.exit(1)
     
-    if split_by not in df.columns:
-        print(f"Error: Kolom '{split_by}' tidak ditemukan")
-        print(f"Kolom yang tersedia: {', '.join(df.columns)}")
+    try:
+        max_bytes_per_file = parse_size(max_bytes_per_file)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
+    chunked = bool(max_rows_per_file or max_bytes_per_file)
     
     # Buat output folder
     output_path = Path(output_folder)
     output_path.mkdir(parents=True, exist_ok=True)
+    index_path = output_path / SPLIT_INDEX_FILENAME
     
-    # Group by kolom yang dipilih
-    groups = df.groupby(split_by)
+    split_index = load_split_index(index_path, input_path, split_by) if only else None
     
-    print(f"\nMemecah berdasarkan kolom: {split_by}")
-    print(f"Ditemukan {len(groups)} grup\n")
+    # pandas baru di-import setelah input valid, agar error input tetap cepat
+    import numpy as np
+    import pandas as pd
     
-    results = []
-    for group_name, group_df in groups:
-        # Buat nama file
-        safe_name = sanitize_filename(str(group_name))
-        filename = f"{prefix}{safe_name}{suffix}.xlsx"
-        filepath = output_path / filename
+    if split_index:
+        # Re-export sebagian grup: pakai offset dari index, tanpa groupby ulang
+        print(f"Memakai split index: {index_path}")
+        groups = split_index['groups']
+        total_rows = split_index['total_rows']
+        print(f"Total baris: {total_rows}")
         
-        # Simpan ke file
-        group_df.to_excel(filepath, index=False, header=include_header)
+        selected = [label for label in only if label in groups]
+        offsets = np.sort(np.concatenate(
+            [np.asarray(groups[label]['offsets'], dtype=np.int64) for label in selected]
+        )) if selected else np.array([], dtype=np.int64)
         
-        results.append({
-            'name': group_name,
-            'file': filename,
-            'rows': len(group_df)
-        })
-        print(f"  - {filename}: {len(group_df)} baris")
+        print(f"Membaca {len(offsets)} baris dari file: {input_file}")
+        with profiler.stage("read"):
+            df = read_rows(input_file, offsets)
+    else:
+        print(f"Membaca file: {input_file}")
+        with profiler.stage("read"):
+            df = pd.read_excel(input_file)
+        print(f"Total baris: {len(df)}")
+        offsets = np.arange(len(df))
+        
+        missing = [col for col in split_by if col not in df.columns]
+        if missing:
+            print(f"Error: Kolom {', '.join(missing)} tidak ditemukan")
+            print(f"Kolom yang tersedia: {', '.join(map(str, df.columns))}")
+            sys.exit(1)
+        
+        if partitioned:
+            with profiler.stage("write"):
+                write_partitioned_dataset(df, split_by, output_path)
+            return
+        
+        with profiler.stage("group"):
+            groups = build_split_index(df, split_by)
+            save_split_index(index_path, input_path, split_by, len(df), groups)
+    
+    if only:
+        unknown = [label for label in only if label not in groups]
+        if unknown:
+            print(f"Peringatan: Grup {', '.join(unknown)} tidak ditemukan, di-skip")
+        groups = {label: groups[label] for label in only if label in groups}
+    
+    print(f"\nMemecah berdasarkan kolom: {', '.join(split_by)}")
+    print(f"Ditemukan {len(groups)} grup\n")
+    
+    with profiler.stage("write"):
+        results = []
+        manifest = {}
+        for group_name, group in groups.items():
+            # Posisi baris grup di DataFrame yang sudah dibaca
+            positions = np.searchsorted(offsets, group['offsets'])
+            group_df = df.iloc[positions]
+            
+            # Buat nama file
+            safe_name = sanitize_filename(group_name)
+            filename = f"{prefix}{safe_name}{suffix}{OUTPUT_FORMATS[output_format]}"
+            filepath = output_path / filename
+            
+            # Simpan ke file (atau part file jika ada batas ukuran)
+            if chunked:
+                parts = write_parts(group_df, filepath, output_format, include_header,
+                                    max_rows_per_file, max_bytes_per_file)
+                manifest[group_name] = parts
+                saved_paths = [output_path / part['file'] for part in parts]
+            else:
+                saved_paths = save_dataframe(group_df, filepath, output_format, include_header, rollover)
+            
+            results.append({
+                'name': group_name,
+                'file': filename,
+                'rows': len(group_df)
+            })
+            print(f"  - {', '.join(p.name for p in saved_paths)}: {len(group_df)} baris")
     
-    print(f"\nBerhasil! {len(results)} file dibuat di folder '{output_folder}'")
+    if chunked:
+        write_manifest(output_path / MANIFEST_FILENAME, manifest)
+        n_parts = sum(len(parts) for parts in manifest.values())
+        print(f"\nBerhasil! {len(results)} grup ({n_parts} file) dibuat di folder '{output_folder}'")
+        print(f"Manifest part file: {output_path / MANIFEST_FILENAME}")
+    else:
+        print(f"\nBerhasil! {len(results)} file dibuat di folder '{output_folder}'")
     
     # Summary
     total_rows = sum(r['rows'] for r in results)
@@ -100,11 +629,29 @@ def main():
         description='Memecah file Excel berdasarkan nilai kolom tertentu'
     )
     parser.add_argument('input', nargs='?', help='File Excel input')
-    parser.add_argument('--kolom', '-k', help='Nama kolom untuk split')
+    parser.add_argument('--kolom', '-k', action='append',
+                        help='Nama kolom untuk split (ulangi untuk split komposit, misal -k Cabang -k Bulan)')
     parser.add_argument('--output', '-o', help='Folder output')
     parser.add_argument('--prefix', '-p', help='Prefix nama file output')
     parser.add_argument('--suffix', '-s', help='Suffix nama file output')
     parser.add_argument('--no-header', action='store_true', help='Tidak sertakan header')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS),
+                        help='Format file output (default: xlsx)')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='Tulis dataset Parquet ber-partisi Hive berdasarkan kolom split')
+    parser.add_argument('--rollover', choices=ROLLOVER_MODES,
+                        help='Jika melebihi batas baris Excel, pecah ke sheet atau file bernomor (default: sheet)')
+    parser.add_argument('--max-rows-per-file', type=int,
+                        help='Maksimal baris per file, grup lebih besar dipecah ke _part001, _part002, ...')
+    parser.add_argument('--max-bytes-per-file',
+                        help='Perkiraan ukuran maksimal per file, misal 50MB')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tampilkan durasi dan memori setiap tahap')
+    parser.add_argument('--profile-output', help='Simpan profil ke file JSON')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Format file profil: json atau chrome (trace event)')
+    parser.add_argument('--only', action='append',
+                        help='Hanya export grup ini (ulangi untuk beberapa grup), memakai split index')
     parser.add_argument('--config', '-c', default='config.yaml', help='File konfigurasi YAML')
     
     args = parser.parse_args()
@@ -120,6 +667,9 @@ def main():
     prefix = args.prefix if args.prefix is not None else config.get('prefix', '')
     suffix = args.suffix if args.suffix is not None else config.get('suffix', '')
     include_header = not args.no_header if args.no_header else config.get('include_header', True)
+    output_format = args.output_format or config.get('output_format', 'xlsx')
+    partitioned = args.partitioned or config.get('partitioned', False)
+    rollover = args.rollover or config.get('rollover', 'sheet')
     
     # Resolve path relatif terhadap script directory
     if input_file and not Path(input_file).is_absolute():
@@ -138,14 +688,27 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    profiler = Profiler(enabled=args.profile or bool(args.profile_output))
     split_excel(
         input_file=input_file,
         split_by=split_by,
         output_folder=output_folder,
         prefix=prefix,
         suffix=suffix,
-        include_header=include_header
+        include_header=include_header,
+        output_format=output_format,
+        partitioned=partitioned,
+        rollover=rollover,
+        only=args.only or config.get('only'),
+        max_rows_per_file=args.max_rows_per_file or config.get('max_rows_per_file'),
+        max_bytes_per_file=args.max_bytes_per_file or config.get('max_bytes_per_file'),
+        profiler=profiler
     )
+    
+    if args.profile:
+        profiler.print_report()
+    if args.profile_output:
+        profiler.export(args.profile_output, args.profile_format)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 
 
-def generate_sample_data():
-    """Generate data laporan penjualan nasional."""
+def build_sample_data(num_rows: int = 100) -> pd.DataFrame:
+    """Buat DataFrame laporan penjualan nasional dengan jumlah baris tertentu."""
     
     cabang_list = ['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Makassar']
     sales_list = ['Budi Santoso', 'Dewi Lestari', 'Ahmad Dahlan', 'Siti Nurhaliza', 'Rudi Hartono']
@@ -29,8 +29,7 @@ def generate_sample_data():
     data = []
     start_date = datetime(2024, 1, 1)
     
-    # Generate 100 transaksi
-    for i in range(100):
+    for i in range(num_rows):
         cabang = random.choice(cabang_list)
         sales = random.choice(sales_list)
         produk, harga = random.choice(produk_list)
@@ -50,7 +49,14 @@ def generate_sample_data():
             'Metode Bayar': random.choice(metode_list)
         })
     
-    df = pd.DataFrame(data)
+    return pd.DataFrame(data)
+
+
+def generate_sample_data():
+    """Generate data laporan penjualan nasional."""
+    
+    # Generate 100 transaksi
+    df = build_sample_data(100)
     
     # Simpan ke folder sample
     script_dir = Path(__file__).parent
@@ -3,23 +3,68 @@ Excel Comparator - Membandingkan 2 file Excel dan menampilkan perbedaannya
 Mendukung konfigurasi via YAML dan CLI arguments (hybrid)
 """
 
+from __future__ import annotations
+
 import sys
+import csv
+import json
+import time
+import pickle
+import hashlib
+import zipfile
 import argparse
-import pandas as pd
-import yaml
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
 from pathlib import Path
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font
+from typing import TYPE_CHECKING
+
+# Library berat (pandas, openpyxl, dst.) di-import di dalam fungsi yang memakainya,
+# agar --help dan error argumen/config tidak menunggu import pandas
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # Warna untuk highlight
-FILL_ADDED = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Hijau
-FILL_DELETED = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")  # Merah
-FILL_CHANGED = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")  # Kuning
+COLOR_ADDED = "90EE90"  # Hijau
+COLOR_DELETED = "FFB6C1"  # Merah
+COLOR_CHANGED = "FFFF99"  # Kuning
+
+# Format output laporan yang didukung beserta ekstensi filenya
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# Mode fuzzy: skor kemiripan minimal (0-1) agar dua key dianggap record yang sama,
+# dan jumlah key tetangga (setelah diurutkan) yang dibandingkan per key
+FUZZY_THRESHOLD = 0.85
+FUZZY_WINDOW = 5
+
+# Aturan perbandingan nilai (bisa di-override per kolom via config `columns`):
+# - abs_tol/rel_tol: angka dianggap sama jika |lama - baru| <= max(abs_tol, rel_tol * max(|lama|, |baru|))
+# - trim/ignore_case: teks dibandingkan setelah spasi di awal/akhir dibuang / tanpa beda huruf besar-kecil
+# - date_format: format teks tanggal (misal '%d/%m/%Y'); kosong = ISO dulu, sisanya hari-dulu (02/01/2024 = 2 Januari)
+COMPARE_DEFAULTS = {
+    'abs_tol': 0.0,
+    'rel_tol': 0.0,
+    'trim': False,
+    'ignore_case': False,
+    'date_format': None,
+}
+
+# Mode streaming (out-of-core): batas memori default (MB) untuk sort dan merge
+STREAM_MEMORY_MB = 256
+
+# Batas jumlah baris per sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
 
 
 def load_config(config_path: str) -> dict:
     """Load konfigurasi dari file YAML."""
+    import yaml
     config_file = Path(config_path)
     if config_file.exists():
         with open(config_file, 'r', encoding='utf-8') as f:
@@ -27,13 +72,461 @@ def load_config(config_path: str) -> dict:
     return {}
 
 
-def compare_dataframes(df_old: pd.DataFrame, df_new: pd.DataFrame, key_column: str = None) -> dict:
+# Profiler, arrow_safe, excel_cell, dan OUTPUT_FORMATS sengaja disalin identik ke setiap
+# utility agar folder ini bisa dipakai sendiri tanpa folder lain. Jika diubah, ubah semua
+# salinannya lalu jalankan `python common/check_copies.py` dari root repo.
+class Profiler:
+    """Catat durasi dan pemakaian memori setiap tahap proses (aktif dengan --profile)."""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []  # List of {name, start, duration, depth, mem_peak_mb, mem_delta_mb}
+        self._origin = time.perf_counter()
+        self._peaks = []  # Peak memori tahap induk yang sedang berjalan
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Ukur satu tahap, contoh: with profiler.stage('read'): ..."""
+        if not self.enabled:
+            yield
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        mem_start, peak_so_far = tracemalloc.get_traced_memory()
+        # Simpan peak tahap induk sebelum di-reset oleh tahap ini
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak_so_far)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            mem_end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            
+            self.stages.append({
+                'name': name,
+                'start': start - self._origin,
+                'duration': duration,
+                'depth': len(self._peaks),
+                'mem_peak_mb': peak / 1024 ** 2,
+                'mem_delta_mb': (mem_end - mem_start) / 1024 ** 2,
+            })
+    
+    def sorted_stages(self) -> list:
+        """Tahap diurutkan berdasarkan waktu mulai."""
+        return sorted(self.stages, key=lambda s: s['start'])
+    
+    def total_duration(self) -> float:
+        """Total durasi tahap level teratas."""
+        return sum(s['duration'] for s in self.stages if s['depth'] == 0)
+    
+    def print_report(self) -> None:
+        """Print tabel profil ke console."""
+        if not self.enabled or not self.stages:
+            return
+        
+        total = self.total_duration()
+        print("\n" + "=" * 50)
+        print("PROFIL")
+        print("=" * 50)
+        print(f"\n  {'Tahap':<34} {'Waktu (s)':>10} {'%':>6} {'Peak (MB)':>10} {'Delta (MB)':>11}")
+        for s in self.sorted_stages():
+            name = '  ' * s['depth'] + s['name']
+            pct = s['duration'] / total * 100 if total else 0
+            print(f"  {name:<34} {s['duration']:>10.3f} {pct:>6.1f} "
+                  f"{s['mem_peak_mb']:>10.1f} {s['mem_delta_mb']:>+11.1f}")
+        print(f"  {'Total':<34} {total:>10.3f}")
+    
+    def export(self, output_path: str, output_format: str = 'json') -> None:
+        """Simpan profil ke JSON, atau format trace event Chrome (chrome://tracing, Perfetto)."""
+        if not self.enabled:
+            return
+        
+        if output_format == 'chrome':
+            data = {'traceEvents': [{
+                'name': s['name'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6),
+                'dur': round(s['duration'] * 1e6),
+                'pid': 1,
+                'tid': 1,
+                'args': {'mem_peak_mb': round(s['mem_peak_mb'], 2),
+                         'mem_delta_mb': round(s['mem_delta_mb'], 2)},
+            } for s in self.sorted_stages()]}
+        else:
+            data = {'total_s': self.total_duration(), 'stages': self.sorted_stages()}
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profil disimpan ke: {output_path}")
+
+
+
+def key_columns_of(key_column) -> list:
+    """Key column bisa satu nama kolom atau list kolom (key komposit)."""
+    if not key_column:
+        return []
+    return [key_column] if isinstance(key_column, str) else list(key_column)
+
+
+def key_name(key_column) -> str:
+    """Nama key untuk laporan, contoh: "No" atau "Cabang, No"."""
+    return ', '.join(map(str, key_columns_of(key_column)))
+
+
+def build_keys(df: pd.DataFrame, key_columns: list, fuzzy: bool = False) -> tuple:
+    """
+    Buat key untuk matching baris dan label key untuk laporan.
+    
+    Mode exact: nilai kolom key (sebagai string) di-hash jadi satu key 64-bit per baris,
+    jadi key komposit di-join secepat key satu kolom. Mode fuzzy: gabungan kolom key
+    sebagai string yang dinormalisasi.
+    
+    Returns:
+        (Series key untuk matching, Series label key)
+    """
+    import pandas as pd
+    parts = df[key_columns].astype(str)
+    labels = parts.iloc[:, 0]
+    if len(key_columns) > 1:
+        labels = labels.str.cat([parts[col] for col in key_columns[1:]], sep=' | ')
+    
+    if fuzzy:
+        return normalize_keys(labels), labels
+    hashed = pd.util.hash_pandas_object(parts, index=False)
+    return hashed, labels
+
+
+def find_duplicates(match: pd.Series, labels: pd.Series) -> list:
+    """Key yang muncul lebih dari sekali, dicek dalam satu pass: list of {key, count}."""
+    dup = match.duplicated(keep=False)
+    if not dup.any():
+        return []
+    counts = match[dup].value_counts(sort=False)
+    first_label = labels[dup].groupby(match[dup], sort=False).first()
+    return [{'key': first_label[key], 'count': int(count)} for key, count in counts.items()]
+
+
+def number_occurrences(match: pd.Series, labels: pd.Series) -> tuple:
+    """Tambahkan urutan kemunculan ke key, agar duplikat ke-n dicocokkan dengan duplikat ke-n di file lain."""
+    import pandas as pd
+    occurrence = match.groupby(match, sort=False).cumcount()
+    first = occurrence == 0
+    suffix = ' #' + (occurrence + 1).astype(str)
+    labels = labels.where(first, labels + suffix)
+    if match.dtype == 'uint64':
+        match = pd.util.hash_pandas_object(pd.DataFrame({'key': match, 'n': occurrence}), index=False)
+    else:
+        match = match.where(first, match + suffix)
+    return match, labels
+
+
+def normalize_keys(keys: pd.Series) -> pd.Series:
+    """Normalisasi key untuk mode fuzzy: spasi dirapikan dan huruf kecil semua."""
+    return keys.str.strip().str.replace(r'\s+', ' ', regex=True).str.casefold()
+
+
+def key_positions(keys: pd.Series) -> pd.Series:
+    """Map key -> posisi baris pertama dengan key tersebut (urutan sesuai file)."""
+    import numpy as np
+    import pandas as pd
+    first = ~keys.duplicated()
+    return pd.Series(np.flatnonzero(first.to_numpy()), index=keys[first].to_numpy())
+
+
+def similarity_function():
+    """Skor kemiripan string 0-1: rapidfuzz jika terinstall (jauh lebih cepat), selain itu difflib."""
+    try:
+        from rapidfuzz.fuzz import ratio
+        return lambda a, b: ratio(a, b) / 100
+    except ImportError:
+        from difflib import SequenceMatcher
+        return lambda a, b: SequenceMatcher(None, a, b).ratio()
+
+
+def fuzzy_match(old_keys: list, new_keys: list, threshold: float = FUZZY_THRESHOLD,
+                window: int = FUZZY_WINDOW) -> list:
+    """
+    Pasangkan key lama dan baru yang mirip (skor >= threshold), masing-masing maksimal satu pasangan.
+    
+    Blocking: semua key diurutkan (dari depan dan dari belakang), lalu setiap key hanya
+    dibandingkan dengan `window` key terdekat dari file lain. Jumlah pasangan kandidat
+    jadi sebanding dengan jumlah key, bukan jumlah_lama x jumlah_baru.
+    
+    Returns:
+        list of (index key lama, index key baru, skor)
+    """
+    similarity = similarity_function()
+    candidates = {}
+    
+    for reverse in (False, True):
+        items = sorted(
+            [(key[::-1] if reverse else key, 0, i) for i, key in enumerate(old_keys)] +
+            [(key[::-1] if reverse else key, 1, j) for j, key in enumerate(new_keys)]
+        )
+        for p, (_, side, idx) in enumerate(items):
+            for _, other_side, other_idx in items[p + 1:p + 1 + window]:
+                if other_side == side:
+                    continue
+                pair = (idx, other_idx) if side == 0 else (other_idx, idx)
+                if pair in candidates:
+                    continue
+                a, b = old_keys[pair[0]], new_keys[pair[1]]
+                # Batas atas skor dari selisih panjang, skip tanpa menghitung similarity
+                if 2 * min(len(a), len(b)) / max(len(a) + len(b), 1) < threshold:
+                    candidates[pair] = 0
+                    continue
+                candidates[pair] = similarity(a, b)
+    
+    # Greedy: pasangan dengan skor tertinggi dipakai duluan
+    matches = []
+    used_old, used_new = set(), set()
+    for (i, j), score in sorted(candidates.items(), key=lambda item: -item[1]):
+        if score < threshold:
+            break
+        if i not in used_old and j not in used_new:
+            used_old.add(i)
+            used_new.add(j)
+            matches.append((i, j, score))
+    return matches
+
+
+def column_options(options: dict, column) -> dict:
+    """Aturan perbandingan untuk satu kolom: default, ditimpa aturan global, lalu aturan kolom."""
+    options = options or {}
+    merged = {**COMPARE_DEFAULTS, **{k: v for k, v in options.items() if k in COMPARE_DEFAULTS}}
+    merged.update((options.get('columns') or {}).get(column) or {})
+    return merged
+
+
+def as_datetime(values: pd.Series, date_format: str = None) -> pd.Series:
+    """Normalisasi tanggal: teks di-parse, timezone dikonversi ke UTC lalu dibuang."""
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return naive_utc(values)
+    if date_format:
+        return naive_utc(pd.to_datetime(values, errors='coerce', format=date_format))
+    
+    # ISO (2024-01-02) di-parse apa adanya; teks lain dianggap hari-dulu seperti
+    # penulisan tanggal Indonesia (02/01/2024 = 2 Januari), bukan bulan-dulu
+    parsed = naive_utc(pd.to_datetime(values, errors='coerce', format='ISO8601'))
+    rest = parsed.isna() & values.notna()
+    if rest.any():
+        parsed[rest] = naive_utc(pd.to_datetime(values[rest], errors='coerce', format='mixed', dayfirst=True))
+    return parsed
+
+
+def naive_utc(values: pd.Series) -> pd.Series:
+    """Tanggal ber-timezone dikonversi ke UTC lalu timezone-nya dibuang."""
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    return values
+
+
+def is_number(values: pd.Series) -> bool:
+    import pandas as pd
+    return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+
+def numbers_differ(old, new, opts: dict):
+    """Kernel angka: beda jika selisih melebihi toleransi (numpy array float)."""
+    import numpy as np
+    with np.errstate(invalid='ignore'):
+        tolerance = np.maximum(opts['abs_tol'], opts['rel_tol'] * np.maximum(np.abs(old), np.abs(new)))
+        return (old != new) & ~(np.abs(old - new) <= tolerance)
+
+
+def texts_differ(old: pd.Series, new: pd.Series, opts: dict):
+    """Kernel teks: dibandingkan sebagai string, opsional trim dan tanpa beda huruf besar-kecil."""
+    old, new = old.astype(str), new.astype(str)
+    if opts['trim']:
+        old, new = old.str.strip(), new.str.strip()
+    if opts['ignore_case']:
+        old, new = old.str.casefold(), new.str.casefold()
+    return (old != new).to_numpy()
+
+
+def values_differ(old: pd.Series, new: pd.Series, opts: dict):
+    """
+    Bandingkan satu kolom (baris sudah sejajar), return array bool cell yang berubah.
+    
+    Kernel dipilih per dtype kolom, bukan per cell: angka dengan toleransi, tanggal yang
+    dinormalisasi, dan selain itu dibandingkan langsung (100 == 100.0). Hanya cell yang
+    masih beda yang dibandingkan ulang sebagai teks. Kosong di kedua sisi dianggap sama.
+    """
+    import numpy as np
+    old_na, new_na = old.isna().to_numpy(), new.isna().to_numpy()
+    filled = ~old_na & ~new_na
+    diff = old_na != new_na
+    
+    if is_number(old) and is_number(new):
+        if opts['abs_tol'] or opts['rel_tol']:
+            diff |= filled & numbers_differ(old.to_numpy(float, na_value=np.nan),
+                                            new.to_numpy(float, na_value=np.nan), opts)
+        else:
+            diff |= filled & old.ne(new).fillna(True).to_numpy(bool)
+        return diff
+    
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(old) or pd.api.types.is_datetime64_any_dtype(new):
+        old_dt, new_dt = as_datetime(old, opts['date_format']), as_datetime(new, opts['date_format'])
+        parsed = filled & old_dt.notna().to_numpy() & new_dt.notna().to_numpy()
+        diff |= parsed & (old_dt.to_numpy() != new_dt.to_numpy())
+        filled &= ~parsed  # Yang gagal di-parse dibandingkan sebagai teks
+    
+    # Selain angka/tanggal: bandingkan langsung, sisanya yang beda dicek ulang
+    candidates = np.flatnonzero(filled)
+    if len(candidates) and old.dtype == new.dtype and old.dtype != object and pd.api.types.is_string_dtype(old):
+        # Kolom teks dtype str di kedua file: dibandingkan vectorized tanpa konversi ke object
+        candidates = candidates[old.iloc[candidates].ne(new.iloc[candidates]).to_numpy(bool, na_value=True)]
+    elif len(candidates):
+        candidates = candidates[old.iloc[candidates].to_numpy(object) != new.iloc[candidates].to_numpy(object)]
+    if len(candidates):
+        old_c, new_c = old.iloc[candidates], new.iloc[candidates]
+        if opts['abs_tol'] or opts['rel_tol']:
+            old_num = pd.to_numeric(old_c, errors='coerce').to_numpy(float, na_value=np.nan)
+            new_num = pd.to_numeric(new_c, errors='coerce').to_numpy(float, na_value=np.nan)
+            numeric = ~np.isnan(old_num) & ~np.isnan(new_num)
+            diff[candidates[numeric]] = numbers_differ(old_num[numeric], new_num[numeric], opts)
+            candidates, old_c, new_c = candidates[~numeric], old_c[~numeric], new_c[~numeric]
+        diff[candidates] = texts_differ(old_c, new_c, opts)
+    return diff
+
+
+def file_fingerprint(path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Hash isi file untuk cek file identik tanpa parsing cell.
+    
+    File xlsx adalah zip: yang di-hash isi setiap bagian kecuali docProps/ (waktu simpan,
+    nama pembuat), jadi file yang disimpan ulang tanpa perubahan data tetap dianggap sama.
+    File lain di-hash byte per byte.
+    """
+    digest = hashlib.blake2b()
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.startswith('docProps/'):
+                    continue
+                digest.update(name.encode())
+                with archive.open(name) as f:
+                    while block := f.read(block_size):
+                        digest.update(block)
+        return digest.hexdigest()
+    
+    with open(path, 'rb') as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def column_stats(diff, old_rows: pd.DataFrame, new_rows: pd.DataFrame, columns: list) -> dict:
+    """
+    Statistik per kolom langsung dari change mask (baris x kolom): jumlah cell berubah, dan
+    untuk kolom angka sum/min/max selisih (baru - lama) dari cell yang berubah.
+    """
+    import numpy as np
+    import pandas as pd
+    counts = diff.sum(axis=0)
+    stats = {}
+    for c in np.flatnonzero(counts):
+        col, mask = columns[c], diff[:, c]
+        stats[col] = {'changed': int(counts[c]), 'delta_sum': None, 'delta_min': None, 'delta_max': None}
+        old, new = old_rows[col][mask], new_rows[col][mask]
+        if any(pd.api.types.is_datetime64_any_dtype(s) or pd.api.types.is_bool_dtype(s) for s in (old, new)):
+            continue
+        if not (is_number(old) and is_number(new)):
+            # Kolom campuran (misal dtype object): hanya cell yang berupa angka di kedua sisi
+            old, new = pd.to_numeric(old, errors='coerce'), pd.to_numeric(new, errors='coerce')
+        delta = new.to_numpy(float, na_value=np.nan) - old.to_numpy(float, na_value=np.nan)
+        delta = delta[~np.isnan(delta)]
+        if len(delta):
+            stats[col].update(delta_sum=float(delta.sum()), delta_min=float(delta.min()),
+                              delta_max=float(delta.max()))
+    return stats
+
+
+def merge_column_stats(total: dict, stats: dict) -> dict:
+    """Gabungkan statistik per kolom dari beberapa bagian data (mode streaming)."""
+    for col, item in stats.items():
+        if col not in total:
+            total[col] = dict(item)
+            continue
+        merged = total[col]
+        merged['changed'] += item['changed']
+        if item['delta_sum'] is not None:
+            if merged['delta_sum'] is None:
+                merged.update(delta_sum=item['delta_sum'], delta_min=item['delta_min'], delta_max=item['delta_max'])
+            else:
+                merged['delta_sum'] += item['delta_sum']
+                merged['delta_min'] = min(merged['delta_min'], item['delta_min'])
+                merged['delta_max'] = max(merged['delta_max'], item['delta_max'])
+    return total
+
+
+def diff_rows(df_old: pd.DataFrame, df_new: pd.DataFrame, old_idx, new_idx,
+              ids: list, id_field: str, options: dict = None) -> tuple:
+    """
+    Bandingkan pasangan baris (posisi di file lama dan baru) per kolom.
+    
+    Returns:
+        (list cell yang berubah, dict statistik: `columns` per kolom dan `rows` id baris yang berubah)
+    """
+    import numpy as np
+    columns = [col for col in df_old.columns if col in df_new.columns]
+    if not columns or len(old_idx) == 0:
+        return [], {'columns': {}, 'rows': []}
+    
+    old_rows = df_old.iloc[old_idx][columns].reset_index(drop=True)
+    new_rows = df_new.iloc[new_idx][columns].reset_index(drop=True)
+    
+    # Satu kernel per kolom (bukan per cell)
+    diff = np.column_stack([
+        values_differ(old_rows[col], new_rows[col], column_options(options, col))
+        for col in columns
+    ])
+    
+    changed = []
+    for i, c in zip(*np.nonzero(diff)):
+        changed.append({
+            id_field: ids[i],
+            'column': columns[c],
+            'old_value': old_rows.iat[i, c],
+            'new_value': new_rows.iat[i, c]
+        })
+    
+    stats = {
+        'columns': column_stats(diff, old_rows, new_rows, columns),
+        'rows': [ids[i] for i in np.flatnonzero(diff.any(axis=1))],
+    }
+    return changed, stats
+
+
+def compare_dataframes(df_old: pd.DataFrame, df_new: pd.DataFrame, key_column=None,
+                       fuzzy: bool = False, threshold: float = FUZZY_THRESHOLD,
+                       align_duplicates: bool = False, options: dict = None) -> dict:
     """
     Bandingkan dua DataFrame dan return perbedaannya.
     
+    Args:
+        key_column: Nama kolom kunci, atau list kolom untuk key komposit
+        fuzzy: Cocokkan key yang hanya beda spasi/huruf besar, lalu key yang mirip (skor >= threshold)
+        align_duplicates: Key duplikat dicocokkan berdasarkan urutan kemunculan
+            (default: hanya baris pertama per key yang dibandingkan)
+        options: Aturan perbandingan nilai (lihat COMPARE_DEFAULTS), plus `columns` untuk aturan per kolom
+    
     Returns:
-        dict dengan keys: added, deleted, changed
+        dict dengan keys: added, deleted, changed, column_stats, changed_rows, duplicates
+        (dan fuzzy_matches jika fuzzy)
     """
+    import numpy as np
     result = {
         'added': [],      # Baris baru
         'deleted': [],    # Baris dihapus
@@ -41,82 +534,88 @@ def compare_dataframes(df_old: pd.DataFrame, df_new: pd.DataFrame, key_column: s
         'summary': {}
     }
     
-    if key_column and key_column in df_old.columns and key_column in df_new.columns:
+    key_columns = key_columns_of(key_column)
+    if key_columns and all(col in df_old.columns and col in df_new.columns for col in key_columns):
         # Bandingkan berdasarkan key column
-        old_keys = set(df_old[key_column].astype(str))
-        new_keys = set(df_new[key_column].astype(str))
+        old_match, old_keys = build_keys(df_old, key_columns, fuzzy)
+        new_match, new_keys = build_keys(df_new, key_columns, fuzzy)
+        
+        result['duplicates'] = {
+            'old': find_duplicates(old_match, old_keys),
+            'new': find_duplicates(new_match, new_keys),
+        }
+        if align_duplicates:
+            result['aligned_duplicates'] = True
+            old_match, old_keys = number_occurrences(old_match, old_keys)
+            new_match, new_keys = number_occurrences(new_match, new_keys)
+        
+        old_pos = key_positions(old_match)
+        new_pos = key_positions(new_match)
+        
+        common = old_pos.index.intersection(new_pos.index, sort=False)
+        old_idx = list(old_pos.loc[common])
+        new_idx = list(new_pos.loc[common])
+        deleted_pos = list(old_pos.loc[old_pos.index.difference(new_pos.index, sort=False)])
+        added_pos = list(new_pos.loc[new_pos.index.difference(old_pos.index, sort=False)])
         
-        # Baris baru (ada di new, tidak di old)
-        added_keys = new_keys - old_keys
-        for key in added_keys:
-            row = df_new[df_new[key_column].astype(str) == key].iloc[0].to_dict()
-            result['added'].append({'key': key, 'data': row})
+        if fuzzy:
+            # Key yang sama setelah normalisasi tapi beda penulisan
+            result['fuzzy_matches'] = [
+                {'old_key': old_keys.iat[i], 'new_key': new_keys.iat[j], 'score': 1.0}
+                for i, j in zip(old_idx, new_idx) if old_keys.iat[i] != new_keys.iat[j]
+            ]
+            matches = fuzzy_match([old_match.iat[i] for i in deleted_pos],
+                                  [new_match.iat[j] for j in added_pos], threshold)
+            for i, j, score in matches:
+                old_idx.append(deleted_pos[i])
+                new_idx.append(added_pos[j])
+                result['fuzzy_matches'].append({'old_key': old_keys.iat[deleted_pos[i]],
+                                                'new_key': new_keys.iat[added_pos[j]],
+                                                'score': round(score, 3)})
+            matched_old = {deleted_pos[i] for i, _, _ in matches}
+            matched_new = {added_pos[j] for _, j, _ in matches}
+            deleted_pos = [i for i in deleted_pos if i not in matched_old]
+            added_pos = [j for j in added_pos if j not in matched_new]
         
-        # Baris dihapus (ada di old, tidak di new)
-        deleted_keys = old_keys - new_keys
-        for key in deleted_keys:
-            row = df_old[df_old[key_column].astype(str) == key].iloc[0].to_dict()
-            result['deleted'].append({'key': key, 'data': row})
+        for j in added_pos:
+            result['added'].append({'key': new_keys.iat[j], 'data': df_new.iloc[j].to_dict()})
+        for i in deleted_pos:
+            result['deleted'].append({'key': old_keys.iat[i], 'data': df_old.iloc[i].to_dict()})
         
         # Baris yang sama, cek perubahan nilai
-        common_keys = old_keys & new_keys
-        for key in common_keys:
-            old_row = df_old[df_old[key_column].astype(str) == key].iloc[0]
-            new_row = df_new[df_new[key_column].astype(str) == key].iloc[0]
-            
-            for col in df_old.columns:
-                if col in df_new.columns:
-                    old_val = old_row[col]
-                    new_val = new_row[col]
-                    
-                    # Handle NaN comparison
-                    if pd.isna(old_val) and pd.isna(new_val):
-                        continue
-                    if str(old_val) != str(new_val):
-                        result['changed'].append({
-                            'key': key,
-                            'column': col,
-                            'old_value': old_val,
-                            'new_value': new_val
-                        })
+        result['changed'], stats = diff_rows(df_old, df_new, old_idx, new_idx,
+                                             old_keys.iloc[old_idx].tolist(), 'key', options)
     else:
         # Bandingkan berdasarkan posisi baris
-        max_rows = max(len(df_old), len(df_new))
+        common_rows = min(len(df_old), len(df_new))
         
-        for i in range(max_rows):
-            if i >= len(df_old):
-                # Baris baru
-                result['added'].append({'row': i + 1, 'data': df_new.iloc[i].to_dict()})
-            elif i >= len(df_new):
-                # Baris dihapus
-                result['deleted'].append({'row': i + 1, 'data': df_old.iloc[i].to_dict()})
-            else:
-                # Bandingkan cell by cell
-                for col in df_old.columns:
-                    if col in df_new.columns:
-                        old_val = df_old.iloc[i][col]
-                        new_val = df_new.iloc[i][col]
-                        
-                        if pd.isna(old_val) and pd.isna(new_val):
-                            continue
-                        if str(old_val) != str(new_val):
-                            result['changed'].append({
-                                'row': i + 1,
-                                'column': col,
-                                'old_value': old_val,
-                                'new_value': new_val
-                            })
+        for i in range(common_rows, len(df_new)):
+            result['added'].append({'row': i + 1, 'data': df_new.iloc[i].to_dict()})
+        for i in range(common_rows, len(df_old)):
+            result['deleted'].append({'row': i + 1, 'data': df_old.iloc[i].to_dict()})
+        
+        rows = np.arange(common_rows)
+        result['changed'], stats = diff_rows(df_old, df_new, rows, rows, list(range(1, common_rows + 1)),
+                                             'row', options)
     
+    result['column_stats'] = stats['columns']
+    result['changed_rows'] = stats['rows']
     result['summary'] = {
         'added_count': len(result['added']),
         'deleted_count': len(result['deleted']),
-        'changed_count': len(result['changed'])
+        'changed_count': len(result['changed']),
+        'changed_rows_count': len(stats['rows']),
     }
+    if result.get('duplicates'):
+        result['summary']['duplicate_old_count'] = len(result['duplicates']['old'])
+        result['summary']['duplicate_new_count'] = len(result['duplicates']['new'])
+    if fuzzy:
+        result['summary']['fuzzy_count'] = len(result.get('fuzzy_matches', []))
     
     return result
 
 
-def print_report(result: dict, key_column: str = None):
+def print_report(result: dict, key_column=None):
     """Print laporan perbandingan ke console."""
     summary = result['summary']
     
@@ -129,46 +628,111 @@ def print_report(result: dict, key_column: str = None):
     print(f"  - Baris baru     : {summary['added_count']}")
     print(f"  - Baris dihapus  : {summary['deleted_count']}")
     print(f"  - Cell berubah   : {summary['changed_count']}")
+    print(f"  - Baris berubah  : {summary.get('changed_rows_count', 0)}")
+    if 'fuzzy_count' in summary:
+        print(f"  - Key fuzzy      : {summary['fuzzy_count']}")
+    
+    # Key duplikat ditampilkan walaupun tidak ada perbedaan, karena bisa menutupi perubahan
+    duplicates = result.get('duplicates') or {}
+    if duplicates.get('old') or duplicates.get('new'):
+        print(f"\n--- KEY DUPLIKAT ---")
+        for side, label in [('old', 'File lama'), ('new', 'File baru')]:
+            count = summary.get(f'duplicate_{side}_count', len(duplicates[side]))
+            if duplicates[side]:
+                print(f"  {label}: {count} key muncul lebih dari sekali")
+                for item in duplicates[side][:5]:
+                    print(f"    [{key_name(key_column)}={item['key']}] {item['count']} baris")
+                if count > 5:
+                    print(f"    ... dan {count - 5} key lainnya")
+        if not result.get('aligned_duplicates'):
+            print("  Hanya baris pertama per key yang dibandingkan. "
+                  "Pakai --align-duplicates untuk mencocokkan berdasarkan urutan kemunculan.")
     
     if summary['added_count'] == 0 and summary['deleted_count'] == 0 and summary['changed_count'] == 0:
         print("\n✓ Kedua file IDENTIK, tidak ada perbedaan.")
         return
     
+    # Key beda penulisan yang dianggap record yang sama
+    if result.get('fuzzy_matches'):
+        print(f"\n--- KEY COCOK (FUZZY) ({len(result['fuzzy_matches'])}) ---")
+        for item in result['fuzzy_matches'][:10]:
+            print(f"  {item['old_key']} ~ {item['new_key']} (skor {item['score']:.2f})")
+        if len(result['fuzzy_matches']) > 10:
+            print(f"  ... dan {len(result['fuzzy_matches']) - 10} pasangan lainnya")
+    
+    # Ringkasan per kolom, untuk triage diff besar tanpa membaca detail
+    stats_rows = column_stats_rows(result)
+    if stats_rows:
+        print(f"\n--- PERUBAHAN PER KOLOM ---")
+        print(f"  {'Kolom':<24} {'Cell':>8} {'Delta Total':>14} {'Delta Min':>14} {'Delta Max':>14}")
+        for col, count, *deltas in stats_rows:
+            deltas = [f"{v:>14,.2f}" if v is not None else f"{'-':>14}" for v in deltas]
+            print(f"  {str(col):<24} {count:>8} {' '.join(deltas)}")
+    
     # Detail perubahan
     if result['changed']:
-        print(f"\n--- PERUBAHAN ({len(result['changed'])}) ---")
+        print(f"\n--- PERUBAHAN ({summary['changed_count']}) ---")
         for item in result['changed'][:20]:  # Limit 20
             if key_column:
-                print(f"  [{key_column}={item['key']}] {item['column']}: {item['old_value']} → {item['new_value']}")
+                print(f"  [{key_name(key_column)}={item['key']}] {item['column']}: {item['old_value']} → {item['new_value']}")
             else:
                 print(f"  Baris {item['row']}, {item['column']}: {item['old_value']} → {item['new_value']}")
-        if len(result['changed']) > 20:
-            print(f"  ... dan {len(result['changed']) - 20} perubahan lainnya")
+        if summary['changed_count'] > 20:
+            print(f"  ... dan {summary['changed_count'] - 20} perubahan lainnya")
     
     if result['added']:
-        print(f"\n--- BARIS BARU ({len(result['added'])}) ---")
+        print(f"\n--- BARIS BARU ({summary['added_count']}) ---")
         for item in result['added'][:10]:
             if key_column:
-                print(f"  [{key_column}={item['key']}]")
+                print(f"  [{key_name(key_column)}={item['key']}]")
             else:
                 print(f"  Baris {item['row']}")
-        if len(result['added']) > 10:
-            print(f"  ... dan {len(result['added']) - 10} baris lainnya")
+        if summary['added_count'] > 10:
+            print(f"  ... dan {summary['added_count'] - 10} baris lainnya")
     
     if result['deleted']:
-        print(f"\n--- BARIS DIHAPUS ({len(result['deleted'])}) ---")
+        print(f"\n--- BARIS DIHAPUS ({summary['deleted_count']}) ---")
         for item in result['deleted'][:10]:
             if key_column:
-                print(f"  [{key_column}={item['key']}]")
+                print(f"  [{key_name(key_column)}={item['key']}]")
             else:
                 print(f"  Baris {item['row']}")
-        if len(result['deleted']) > 10:
-            print(f"  ... dan {len(result['deleted']) - 10} baris lainnya")
+        if summary['deleted_count'] > 10:
+            print(f"  ... dan {summary['deleted_count'] - 10} baris lainnya")
+
+
+def summary_rows(summary: dict) -> list:
+    """Baris ringkasan laporan: [keterangan, jumlah]."""
+    rows = [['Baris Baru', summary['added_count']],
+            ['Baris Dihapus', summary['deleted_count']],
+            ['Cell Berubah', summary['changed_count']],
+            ['Baris Berubah', summary.get('changed_rows_count', 0)]]
+    if 'fuzzy_count' in summary:
+        rows.append(['Key Fuzzy', summary['fuzzy_count']])
+    if summary.get('duplicate_old_count') or summary.get('duplicate_new_count'):
+        rows += [['Key Duplikat (Lama)', summary['duplicate_old_count']],
+                 ['Key Duplikat (Baru)', summary['duplicate_new_count']]]
+    return rows
+
+
+COLUMN_STATS_HEADER = ['Kolom', 'Cell Berubah', 'Delta Total', 'Delta Min', 'Delta Max']
+
+
+def column_stats_rows(result: dict) -> list:
+    """Baris laporan per kolom: [kolom, cell berubah, delta total, delta min, delta max]."""
+    return [[col, item['changed'], item['delta_sum'], item['delta_min'], item['delta_max']]
+            for col, item in (result.get('column_stats') or {}).items()]
 
 
 def export_to_excel(df_old: pd.DataFrame, df_new: pd.DataFrame, result: dict, 
-                    output_path: str, key_column: str = None):
-    """Export hasil perbandingan ke Excel dengan highlight."""
+                    output_path: str, key_column=None, summary_only: bool = False):
+    """Export hasil perbandingan ke Excel dengan highlight (summary_only: tanpa sheet detail)."""
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font
+    
+    fill_added = PatternFill(start_color=COLOR_ADDED, end_color=COLOR_ADDED, fill_type="solid")
+    fill_deleted = PatternFill(start_color=COLOR_DELETED, end_color=COLOR_DELETED, fill_type="solid")
+    fill_changed = PatternFill(start_color=COLOR_CHANGED, end_color=COLOR_CHANGED, fill_type="solid")
     wb = Workbook()
     
     # Sheet 1: Summary
@@ -176,18 +740,26 @@ def export_to_excel(df_old: pd.DataFrame, df_new: pd.DataFrame, result: dict,
     ws_summary.title = "Summary"
     ws_summary['A1'] = "Laporan Perbandingan Excel"
     ws_summary['A1'].font = Font(bold=True, size=14)
-    ws_summary['A3'] = "Baris Baru:"
-    ws_summary['B3'] = result['summary']['added_count']
-    ws_summary['A4'] = "Baris Dihapus:"
-    ws_summary['B4'] = result['summary']['deleted_count']
-    ws_summary['A5'] = "Cell Berubah:"
-    ws_summary['B5'] = result['summary']['changed_count']
-    
-    # Sheet 2: Detail Perubahan
-    if result['changed']:
+    for row, (label, value) in enumerate(summary_rows(result['summary']), start=3):
+        ws_summary[f'A{row}'] = f"{label}:"
+        ws_summary[f'B{row}'] = value
+    
+    # Sheet 2: Perubahan per kolom
+    stats_rows = column_stats_rows(result)
+    if stats_rows:
+        ws_stats = wb.create_sheet("Per Kolom")
+        ws_stats.append(COLUMN_STATS_HEADER)
+        for cell in ws_stats[1]:
+            cell.fill = fill_changed
+            cell.font = Font(bold=True)
+        for row in stats_rows:
+            ws_stats.append(row)
+    
+    # Sheet 3: Detail Perubahan
+    if result['changed'] and not summary_only:
         ws_changed = wb.create_sheet("Perubahan")
         if key_column:
-            ws_changed.append([key_column, "Kolom", "Nilai Lama", "Nilai Baru"])
+            ws_changed.append([key_name(key_column), "Kolom", "Nilai Lama", "Nilai Baru"])
         else:
             ws_changed.append(["Baris", "Kolom", "Nilai Lama", "Nilai Baru"])
         
@@ -199,43 +771,584 @@ def export_to_excel(df_old: pd.DataFrame, df_new: pd.DataFrame, result: dict,
         
         # Highlight header
         for cell in ws_changed[1]:
-            cell.fill = FILL_CHANGED
+            cell.fill = fill_changed
             cell.font = Font(bold=True)
     
-    # Sheet 3: Baris Baru
-    if result['added']:
+    # Sheet 4: Baris Baru
+    if result['added'] and not summary_only:
         ws_added = wb.create_sheet("Baris Baru")
         # Header dari data
         if result['added']:
             headers = list(result['added'][0]['data'].keys())
             ws_added.append(headers)
             for cell in ws_added[1]:
-                cell.fill = FILL_ADDED
+                cell.fill = fill_added
                 cell.font = Font(bold=True)
             
             for item in result['added']:
                 ws_added.append(list(item['data'].values()))
     
-    # Sheet 4: Baris Dihapus
-    if result['deleted']:
+    # Sheet 5: Baris Dihapus
+    if result['deleted'] and not summary_only:
         ws_deleted = wb.create_sheet("Baris Dihapus")
         if result['deleted']:
             headers = list(result['deleted'][0]['data'].keys())
             ws_deleted.append(headers)
             for cell in ws_deleted[1]:
-                cell.fill = FILL_DELETED
+                cell.fill = fill_deleted
                 cell.font = Font(bold=True)
             
             for item in result['deleted']:
                 ws_deleted.append(list(item['data'].values()))
     
+    # Sheet 6: Pasangan key fuzzy
+    if result.get('fuzzy_matches'):
+        ws_fuzzy = wb.create_sheet("Key Fuzzy")
+        ws_fuzzy.append(["Key Lama", "Key Baru", "Skor"])
+        for cell in ws_fuzzy[1]:
+            cell.fill = fill_changed
+            cell.font = Font(bold=True)
+        for item in result['fuzzy_matches']:
+            ws_fuzzy.append([item['old_key'], item['new_key'], item['score']])
+    
+    # Sheet 7: Key duplikat
+    duplicate_rows = duplicate_table_rows(result)
+    if duplicate_rows:
+        ws_dup = wb.create_sheet("Key Duplikat")
+        ws_dup.append(["File", key_name(key_column), "Jumlah Baris"])
+        for cell in ws_dup[1]:
+            cell.fill = fill_deleted
+            cell.font = Font(bold=True)
+        for row in duplicate_rows:
+            ws_dup.append(row)
+    
     wb.save(output_path)
     print(f"\nLaporan Excel disimpan ke: {output_path}")
 
 
-def compare_excel(file_old: str, file_new: str, key_column: str = None, 
-                  output_file: str = None) -> dict:
-    """Main function untuk membandingkan 2 file Excel."""
+def arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah kolom object dengan tipe campuran ke string agar bisa ditulis pyarrow."""
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def duplicate_table_rows(result: dict) -> list:
+    """Baris laporan key duplikat: [file, key, jumlah baris]."""
+    duplicates = result.get('duplicates') or {}
+    return [[label, item['key'], item['count']]
+            for side, label in [('old', 'Lama'), ('new', 'Baru')]
+            for item in duplicates.get(side, [])]
+
+
+def build_report_tables(result: dict, key_column=None, summary_only: bool = False) -> dict:
+    """Susun isi laporan (sheet yang sama dengan export Excel) sebagai DataFrame."""
+    import pandas as pd
+    tables = {'summary': pd.DataFrame(summary_rows(result['summary']), columns=['Keterangan', 'Jumlah'])}
+    
+    stats_rows = column_stats_rows(result)
+    if stats_rows:
+        tables['per_kolom'] = pd.DataFrame(stats_rows, columns=COLUMN_STATS_HEADER)
+    
+    if result['changed'] and not summary_only:
+        id_col = key_name(key_column) if key_column else 'Baris'
+        id_field = 'key' if key_column else 'row'
+        tables['perubahan'] = pd.DataFrame({
+            id_col: [item[id_field] for item in result['changed']],
+            'Kolom': [item['column'] for item in result['changed']],
+            'Nilai Lama': [str(item['old_value']) for item in result['changed']],
+            'Nilai Baru': [str(item['new_value']) for item in result['changed']],
+        })
+    
+    if result['added'] and not summary_only:
+        tables['baris_baru'] = pd.DataFrame([item['data'] for item in result['added']])
+    
+    if result['deleted'] and not summary_only:
+        tables['baris_dihapus'] = pd.DataFrame([item['data'] for item in result['deleted']])
+    
+    duplicate_rows = duplicate_table_rows(result)
+    if duplicate_rows:
+        tables['key_duplikat'] = pd.DataFrame(duplicate_rows, columns=['File', key_name(key_column), 'Jumlah Baris'])
+    
+    if result.get('fuzzy_matches'):
+        tables['key_fuzzy'] = pd.DataFrame({
+            'Key Lama': [item['old_key'] for item in result['fuzzy_matches']],
+            'Key Baru': [item['new_key'] for item in result['fuzzy_matches']],
+            'Skor': [item['score'] for item in result['fuzzy_matches']],
+        })
+    
+    return tables
+
+
+def export_to_tables(result: dict, output_path: str, key_column=None,
+                     output_format: str = 'csv', summary_only: bool = False):
+    """Export hasil perbandingan ke CSV/Parquet/Feather, satu file per bagian laporan."""
+    output_path = Path(output_path)
+    ext = OUTPUT_FORMATS[output_format]
+    
+    print()
+    for name, table in build_report_tables(result, key_column, summary_only).items():
+        path = output_path.with_name(f"{output_path.stem}_{name}{ext}")
+        if output_format == 'csv':
+            table.to_csv(path, index=False)
+        elif output_format == 'parquet':
+            arrow_safe(table).to_parquet(path, index=False)
+        else:
+            arrow_safe(table).to_feather(path)
+        print(f"Laporan {name} disimpan ke: {path}")
+
+
+def export_report(df_old: pd.DataFrame, df_new: pd.DataFrame, result: dict,
+                  output_path: str, key_column=None, output_format: str = 'xlsx',
+                  summary_only: bool = False):
+    """Export laporan sesuai format output."""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    if output_format == 'xlsx':
+        export_to_excel(df_old, df_new, result, output_path, key_column, summary_only)
+    else:
+        export_to_tables(result, output_path, key_column, output_format, summary_only)
+
+
+def excel_cell(value):
+    """Konversi nilai kosong pandas (NaN/NaT/NA) ke None agar bisa ditulis openpyxl."""
+    import pandas as pd
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+def stream_batch_rows(memory_mb: int) -> int:
+    """Jumlah baris per batch baca: sekitar 1/16 batas memori, asumsi ~1 KB per baris."""
+    return max(1000, min(50_000, memory_mb * 1024 // 16))
+
+
+def iter_input_batches(path: str, key_columns: list, batch_rows: int):
+    """
+    Baca file per batch tanpa memuat seluruh file: xlsx via openpyxl read-only, csv via
+    pandas chunksize. Nilai dibiarkan apa adanya (dtype object untuk xlsx) agar key di
+    setiap batch di-hash dengan cara yang sama.
+    """
+    import pandas as pd
+    if Path(path).suffix.lower() == '.csv':
+        yield from pd.read_csv(path, chunksize=batch_rows, dtype={col: str for col in key_columns})
+        return
+    
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+        width = len(columns)
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) != width:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                yield pd.DataFrame(batch, columns=columns, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, dtype=object)
+    finally:
+        wb.close()
+
+
+def spill_sorted_runs(batches, key_columns: list, memory_mb: int, spill_dir: str, prefix: str) -> tuple:
+    """
+    External sort tahap 1: kumpulkan batch sampai setengah batas memori, urutkan berdasarkan
+    hash key (lalu urutan baris), dan tulis ke spill file (run) di disk per blok kecil.
+    
+    Returns:
+        (list path run, list kolom, jumlah baris)
+    """
+    import pandas as pd
+    budget = memory_mb * 1024 * 1024 // 2
+    runs, buffer, buffer_bytes, columns, seq = [], [], 0, None, 0
+    
+    def spill():
+        run = pd.concat(buffer, ignore_index=True).sort_values(['__key', '__seq'], kind='stable')
+        path = Path(spill_dir) / f"{prefix}_{len(runs):04d}.pkl"
+        # Blok kecil agar saat merge cukup satu-dua blok per run yang ada di memori
+        block_rows = max(1000, len(run) // 64)
+        with open(path, 'wb') as f:
+            for start in range(0, len(run), block_rows):
+                pickle.dump(run.iloc[start:start + block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+        runs.append(path)
+    
+    for batch in batches:
+        if columns is None:
+            columns = list(batch.columns)
+            missing = [col for col in key_columns if col not in columns]
+            if missing:
+                return None, columns, 0
+        keys, _ = build_keys(batch, key_columns)
+        batch = batch.reset_index(drop=True)
+        batch.insert(0, '__seq', range(seq, seq + len(batch)))
+        batch.insert(0, '__key', keys.to_numpy())
+        seq += len(batch)
+        buffer.append(batch)
+        buffer_bytes += int(batch.memory_usage(deep=True).sum())
+        if buffer_bytes >= budget:
+            spill()
+            buffer, buffer_bytes = [], 0
+    if buffer:
+        spill()
+    return runs, columns or [], seq
+
+
+def read_blocks(path: Path):
+    """Baca satu run blok demi blok."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def iter_complete_parts(streams: list, empty: list):
+    """
+    Jalankan beberapa aliran DataFrame (masing-masing terurut berdasarkan __key) bersamaan.
+    
+    Frontier = key terakhir terkecil di antara aliran yang belum habis. Setiap langkah yield
+    satu bagian per aliran berisi semua baris dengan key < frontier, jadi grup key yang sama
+    tidak pernah terpotong antar langkah. Aliran yang tersisa hanya key frontier diisi blok
+    berikutnya sebelum langkah selanjutnya.
+    """
+    import pandas as pd
+    buffers = list(empty)
+    done = [False] * len(streams)
+    while True:
+        for i, stream in enumerate(streams):
+            while not done[i] and (buffers[i].empty or buffers[i]['__key'].iat[0] == buffers[i]['__key'].iat[-1]):
+                block = next(stream, None)
+                if block is None:
+                    done[i] = True
+                else:
+                    buffers[i] = block if buffers[i].empty else pd.concat([buffers[i], block], ignore_index=True)
+        
+        pending = [i for i in range(len(streams)) if not done[i]]
+        if not pending:
+            if any(not buffer.empty for buffer in buffers):
+                yield buffers
+            return
+        
+        frontier = min(buffers[i]['__key'].iat[-1] for i in pending)
+        parts = []
+        for i, buffer in enumerate(buffers):
+            cut = buffer['__key'].searchsorted(frontier, side='left')
+            parts.append(buffer.iloc[:cut])
+            buffers[i] = buffer.iloc[cut:]
+        yield parts
+
+
+def iter_sorted_chunks(runs: list, columns: list):
+    """External sort tahap 2: k-way merge semua run per blok (vectorized), yield chunk terurut."""
+    import pandas as pd
+    empty = pd.DataFrame(columns=['__key', '__seq'] + columns)
+    for parts in iter_complete_parts([read_blocks(path) for path in runs], [empty] * len(runs)):
+        chunk = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+        yield chunk.sort_values(['__key', '__seq'], kind='stable')
+
+
+class StreamReport:
+    """
+    Laporan mode streaming: setiap baris hasil langsung ditulis ke file (xlsx write-only atau
+    csv per bagian), hanya jumlah, statistik per kolom, dan beberapa contoh untuk console
+    yang disimpan di memori.
+    """
+    
+    PREVIEW = 20
+    DETAIL_SECTIONS = ['perubahan', 'baris_baru', 'baris_dihapus']
+    SECTIONS = {
+        'perubahan': ('Perubahan', COLOR_CHANGED),
+        'baris_baru': ('Baris Baru', COLOR_ADDED),
+        'baris_dihapus': ('Baris Dihapus', COLOR_DELETED),
+        'key_duplikat': ('Key Duplikat', COLOR_DELETED),
+    }
+    
+    def __init__(self, output_path: str, output_format: str, key_column,
+                 old_columns: list, new_columns: list, summary_only: bool = False):
+        self.output_path = Path(output_path) if output_path else None
+        self.output_format = output_format
+        self.summary_only = summary_only
+        self.headers = {
+            'perubahan': [key_name(key_column), "Kolom", "Nilai Lama", "Nilai Baru"],
+            'baris_baru': new_columns,
+            'baris_dihapus': old_columns,
+            'key_duplikat': ["File", key_name(key_column), "Jumlah Baris"],
+        }
+        self.counts = {'added': 0, 'deleted': 0, 'changed': 0, 'changed_rows': 0,
+                       'duplicate_old': 0, 'duplicate_new': 0}
+        self.preview = {'added': [], 'deleted': [], 'changed': [], 'old': [], 'new': []}
+        self.column_stats = {}
+        self.sections = {}
+        self.files = []
+        self.wb = None
+        if self.output_path:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            if output_format == 'xlsx':
+                from openpyxl import Workbook
+                self.wb = Workbook(write_only=True)
+                self.ws_summary = self.wb.create_sheet("Summary")
+                self.ws_stats = self.wb.create_sheet("Per Kolom")
+            if not summary_only:
+                for name in self.DETAIL_SECTIONS:
+                    self.open_section(name)
+    
+    def open_section(self, name: str, part: int = 1):
+        """Buat sheet (atau file csv) untuk satu bagian laporan beserta header-nya."""
+        if self.output_format == 'xlsx':
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import PatternFill, Font
+            title, color = self.SECTIONS[name]
+            ws = self.wb.create_sheet(title if part == 1 else f"{title} ({part})")
+            fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+            header = []
+            for value in self.headers[name]:
+                cell = WriteOnlyCell(ws, value=str(value))
+                cell.fill = fill
+                cell.font = Font(bold=True)
+                header.append(cell)
+            ws.append(header)
+            self.sections[name] = {'sheet': ws, 'rows': 1, 'part': part}
+        else:
+            path = self.output_path.with_name(f"{self.output_path.stem}_{name}.csv")
+            handle = open(path, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(handle)
+            writer.writerow(self.headers[name])
+            self.sections[name] = {'file': handle, 'writer': writer}
+            self.files.append(path)
+    
+    def write(self, name: str, row: list):
+        if not self.output_path or (self.summary_only and name in self.DETAIL_SECTIONS):
+            return
+        if name not in self.sections:
+            self.open_section(name)
+        section = self.sections[name]
+        if self.output_format == 'xlsx':
+            # Rollover ke sheet baru jika melebihi batas baris Excel
+            if section['rows'] >= EXCEL_MAX_ROWS:
+                self.open_section(name, section['part'] + 1)
+                section = self.sections[name]
+            section['sheet'].append([excel_cell(value) for value in row])
+            section['rows'] += 1
+        else:
+            section['writer'].writerow(['' if excel_cell(value) is None else value for value in row])
+    
+    def add_result(self, result: dict):
+        """Tambahkan hasil compare_dataframes satu jendela key ke laporan."""
+        changed = result['changed']
+        self.counts['changed'] += len(changed)
+        self.counts['changed_rows'] += result['summary']['changed_rows_count']
+        merge_column_stats(self.column_stats, result['column_stats'])
+        self.preview['changed'].extend(changed[:self.PREVIEW - len(self.preview['changed'])])
+        for item in changed:
+            self.write('perubahan', [item['key'], item['column'], str(item['old_value']), str(item['new_value'])])
+        
+        for kind, section in [('added', 'baris_baru'), ('deleted', 'baris_dihapus')]:
+            self.counts[kind] += len(result[kind])
+            self.preview[kind].extend(result[kind][:self.PREVIEW - len(self.preview[kind])])
+            for item in result[kind]:
+                self.write(section, list(item['data'].values()))
+        
+        for side, label in [('old', 'Lama'), ('new', 'Baru')]:
+            duplicates = result['duplicates'][side]
+            self.counts[f'duplicate_{side}'] += len(duplicates)
+            self.preview[side].extend(duplicates[:self.PREVIEW - len(self.preview[side])])
+            for item in duplicates:
+                self.write('key_duplikat', [label, item['key'], item['count']])
+    
+    def result(self, aligned: bool = False) -> dict:
+        """Result berisi jumlah lengkap dan contoh (maksimal PREVIEW) per bagian."""
+        return {
+            'added': self.preview['added'],
+            'deleted': self.preview['deleted'],
+            'changed': self.preview['changed'],
+            'column_stats': self.column_stats,
+            'duplicates': {'old': self.preview['old'], 'new': self.preview['new']},
+            'aligned_duplicates': aligned,
+            'summary': {
+                'added_count': self.counts['added'],
+                'deleted_count': self.counts['deleted'],
+                'changed_count': self.counts['changed'],
+                'changed_rows_count': self.counts['changed_rows'],
+                'duplicate_old_count': self.counts['duplicate_old'],
+                'duplicate_new_count': self.counts['duplicate_new'],
+            },
+            'streaming': True,
+        }
+    
+    def save(self, result: dict):
+        """Tulis ringkasan dan statistik per kolom, lalu simpan/tutup file laporan."""
+        if not self.output_path:
+            return
+        rows = summary_rows(result['summary'])
+        stats_rows = column_stats_rows(result)
+        
+        if self.output_format == 'xlsx':
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import PatternFill, Font
+            title = WriteOnlyCell(self.ws_summary, value="Laporan Perbandingan Excel")
+            title.font = Font(bold=True, size=14)
+            self.ws_summary.append([title])
+            self.ws_summary.append([])
+            for row in rows:
+                self.ws_summary.append([f"{row[0]}:", row[1]])
+            
+            fill = PatternFill(start_color=COLOR_CHANGED, end_color=COLOR_CHANGED, fill_type="solid")
+            header = []
+            for value in COLUMN_STATS_HEADER:
+                cell = WriteOnlyCell(self.ws_stats, value=value)
+                cell.fill = fill
+                cell.font = Font(bold=True)
+                header.append(cell)
+            self.ws_stats.append(header)
+            for row in stats_rows:
+                self.ws_stats.append(row)
+            self.wb.save(self.output_path)
+            print(f"\nLaporan Excel disimpan ke: {self.output_path}")
+            return
+        
+        summary_paths = []
+        for name, header, table in [('summary', ['Keterangan', 'Jumlah'], rows),
+                                    ('per_kolom', COLUMN_STATS_HEADER, stats_rows)]:
+            path = self.output_path.with_name(f"{self.output_path.stem}_{name}.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows([['' if value is None else value for value in row] for row in table])
+            summary_paths.append(path)
+        for section in self.sections.values():
+            section['file'].close()
+        print()
+        for path in summary_paths + self.files:
+            print(f"Laporan {path.stem[len(self.output_path.stem) + 1:]} disimpan ke: {path}")
+
+
+def merge_diff(old_chunks, new_chunks, old_columns: list, new_columns: list, report: StreamReport,
+               key_column, align_duplicates: bool = False, options: dict = None):
+    """
+    Sorted-merge diff: chunk terurut dari kedua file dijalankan bersamaan per jendela key.
+    Setiap jendela berisi grup key yang lengkap di kedua sisi, jadi cukup dibandingkan dengan
+    compare_dataframes biasa lalu hasilnya langsung ditulis ke laporan.
+    """
+    import pandas as pd
+    empty = [pd.DataFrame(columns=['__key', '__seq'] + old_columns),
+             pd.DataFrame(columns=['__key', '__seq'] + new_columns)]
+    for old_part, new_part in iter_complete_parts([old_chunks, new_chunks], empty):
+        result = compare_dataframes(old_part[old_columns].reset_index(drop=True),
+                                    new_part[new_columns].reset_index(drop=True),
+                                    key_column, align_duplicates=align_duplicates, options=options)
+        report.add_result(result)
+
+
+def compare_streaming(file_old: str, file_new: str, key_column, output_file: str = None,
+                      output_format: str = 'xlsx', align_duplicates: bool = False,
+                      options: dict = None, memory_mb: int = STREAM_MEMORY_MB,
+                      spill_dir: str = None, summary_only: bool = False,
+                      profiler: Profiler = None) -> dict:
+    """
+    Bandingkan dua file yang terlalu besar untuk memori (out-of-core).
+    
+    Kedua file di-external-sort berdasarkan hash key ke spill file di disk, lalu di-merge
+    secara streaming. Memori yang dipakai dibatasi sekitar `memory_mb`, berapa pun besar filenya.
+    """
+    profiler = profiler or Profiler()
+    key_columns = key_columns_of(key_column)
+    batch_rows = stream_batch_rows(memory_mb)
+    print(f"\nMode streaming: batas memori {memory_mb} MB, {batch_rows} baris per batch")
+    
+    with tempfile.TemporaryDirectory(prefix='excel_comparator_', dir=spill_dir) as tmp:
+        sides = {}
+        for side, path, label in [('old', file_old, 'lama'), ('new', file_new, 'baru')]:
+            with profiler.stage(f"sort file {label}"):
+                runs, columns, n_rows = spill_sorted_runs(
+                    iter_input_batches(path, key_columns, batch_rows), key_columns, memory_mb, tmp, side)
+            if runs is None:
+                missing = [col for col in key_columns if col not in columns]
+                print(f"Error: Kolom '{missing[0]}' tidak ditemukan di file {label}")
+                print(f"Kolom tersedia: {', '.join(columns)}")
+                sys.exit(1)
+            print(f"File {label}: {n_rows} baris, {len(columns)} kolom ({len(runs)} spill run)")
+            sides[side] = (runs, columns)
+        
+        (old_runs, old_columns), (new_runs, new_columns) = sides['old'], sides['new']
+        report = StreamReport(output_file, output_format, key_column, old_columns, new_columns, summary_only)
+        with profiler.stage("merge diff"):
+            merge_diff(iter_sorted_chunks(old_runs, old_columns), iter_sorted_chunks(new_runs, new_columns),
+                       old_columns, new_columns, report, key_column, align_duplicates, options)
+    
+    
+    result = report.result(align_duplicates)
+    with profiler.stage("print report"):
+        print_report(result, key_column)
+    if output_file:
+        with profiler.stage("export"):
+            report.save(result)
+    return result
+
+
+def identical_result(path: str, key_column=None, fuzzy: bool = False,
+                     align_duplicates: bool = False) -> dict:
+    """
+    Hasil perbandingan dua file yang fingerprint-nya sama, dengan bentuk yang sama seperti
+    compare_dataframes. Hanya kolom key dari satu file yang dibaca: untuk cek kolom key ada
+    dan mencari key duplikat (duplikatnya sama di kedua file).
+    """
+    result = {
+        'added': [],
+        'deleted': [],
+        'changed': [],
+        'column_stats': {},
+        'changed_rows': [],
+        'summary': {'added_count': 0, 'deleted_count': 0, 'changed_count': 0, 'changed_rows_count': 0},
+        'identical_files': True,
+    }
+    key_columns = key_columns_of(key_column)
+    if not key_columns:
+        return result
+    
+    import pandas as pd
+    read = pd.read_csv if Path(path).suffix.lower() == '.csv' else pd.read_excel
+    columns = read(path, nrows=0).columns
+    for col in key_columns:
+        if col not in columns:
+            print(f"Error: Kolom '{col}' tidak ditemukan di file lama")
+            print(f"Kolom tersedia: {', '.join(map(str, columns))}")
+            sys.exit(1)
+    
+    match, labels = build_keys(read(path, usecols=key_columns), key_columns, fuzzy)
+    duplicates = find_duplicates(match, labels)
+    result['duplicates'] = {'old': duplicates, 'new': list(duplicates)}
+    result['summary']['duplicate_old_count'] = len(duplicates)
+    result['summary']['duplicate_new_count'] = len(duplicates)
+    if align_duplicates:
+        result['aligned_duplicates'] = True
+    if fuzzy:
+        result['fuzzy_matches'] = []
+        result['summary']['fuzzy_count'] = 0
+    return result
+
+
+def compare_excel(file_old: str, file_new: str, key_column=None, 
+                  output_file: str = None, output_format: str = 'xlsx',
+                  fuzzy: bool = False, threshold: float = FUZZY_THRESHOLD,
+                  align_duplicates: bool = False, options: dict = None,
+                  streaming: bool = False, memory_mb: int = STREAM_MEMORY_MB,
+                  spill_dir: str = None, summary_only: bool = False,
+                  profiler: Profiler = None) -> dict:
+    """Main function untuk membandingkan 2 file Excel (key_column boleh list untuk key komposit)."""
+    
+    profiler = profiler or Profiler()
     
     # Validasi file
     if not Path(file_old).exists():
@@ -244,38 +1357,94 @@ def compare_excel(file_old: str, file_new: str, key_column: str = None,
     if not Path(file_new).exists():
         print(f"Error: File '{file_new}' tidak ditemukan")
         sys.exit(1)
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    if fuzzy and not key_column:
+        print("Error: Mode fuzzy membutuhkan key column (--key)")
+        sys.exit(1)
+    if not 0 < threshold <= 1:
+        print(f"Error: Threshold fuzzy harus antara 0 dan 1, bukan {threshold}")
+        sys.exit(1)
+    for column, opts in [(None, options or {})] + list(((options or {}).get('columns') or {}).items()):
+        for name in ('abs_tol', 'rel_tol'):
+            if not isinstance(opts.get(name, 0), (int, float)) or opts.get(name, 0) < 0:
+                where = f" (kolom '{column}')" if column else ""
+                print(f"Error: {name}{where} harus angka >= 0, bukan {opts[name]}")
+                sys.exit(1)
+    if streaming:
+        if not key_column:
+            print("Error: Mode streaming membutuhkan key column (--key)")
+            sys.exit(1)
+        if fuzzy:
+            print("Error: Mode fuzzy tidak didukung di mode streaming")
+            sys.exit(1)
+        if output_format not in ('xlsx', 'csv'):
+            print(f"Error: Mode streaming hanya mendukung output xlsx atau csv, bukan '{output_format}'")
+            sys.exit(1)
+        if memory_mb < 16:
+            print(f"Error: Batas memori streaming minimal 16 MB, bukan {memory_mb}")
+            sys.exit(1)
     
     print(f"File lama : {file_old}")
     print(f"File baru : {file_new}")
     if key_column:
-        print(f"Key column: {key_column}")
+        print(f"Key column: {key_name(key_column)}" + (f" (fuzzy, threshold {threshold})" if fuzzy else ""))
+    
+    # File identik byte per byte: tidak perlu dibaca dan dibandingkan
+    with profiler.stage("fingerprint"):
+        identical = file_fingerprint(file_old) == file_fingerprint(file_new)
+    if identical:
+        # Kolom key tetap dicek, agar --key yang salah tidak dianggap berhasil
+        with profiler.stage("read key"):
+            result = identical_result(file_old, key_column, fuzzy, align_duplicates)
+        print("\nFingerprint kedua file sama, perbandingan per cell dilewati.")
+        with profiler.stage("print report"):
+            print_report(result, key_column)
+        if output_file:
+            with profiler.stage("export"):
+                export_report(None, None, result, output_file, key_column, output_format, summary_only)
+        return result
+    
+    if streaming:
+        return compare_streaming(file_old, file_new, key_column, output_file, output_format,
+                                 align_duplicates, options, memory_mb, spill_dir, summary_only, profiler)
+    
+    # pandas baru di-import setelah input valid, agar error input tetap cepat
+    import pandas as pd
     
     # Baca file
-    df_old = pd.read_excel(file_old)
-    df_new = pd.read_excel(file_new)
+    with profiler.stage("read file lama"):
+        df_old = pd.read_excel(file_old)
+    with profiler.stage("read file baru"):
+        df_new = pd.read_excel(file_new)
     
     print(f"\nFile lama: {len(df_old)} baris, {len(df_old.columns)} kolom")
     print(f"File baru: {len(df_new)} baris, {len(df_new.columns)} kolom")
     
     # Validasi key column
-    if key_column:
-        if key_column not in df_old.columns:
-            print(f"Error: Kolom '{key_column}' tidak ditemukan di file lama")
-            print(f"Kolom tersedia: {', '.join(df_old.columns)}")
+    for col in key_columns_of(key_column):
+        if col not in df_old.columns:
+            print(f"Error: Kolom '{col}' tidak ditemukan di file lama")
+            print(f"Kolom tersedia: {', '.join(map(str, df_old.columns))}")
             sys.exit(1)
-        if key_column not in df_new.columns:
-            print(f"Error: Kolom '{key_column}' tidak ditemukan di file baru")
+        if col not in df_new.columns:
+            print(f"Error: Kolom '{col}' tidak ditemukan di file baru")
             sys.exit(1)
     
     # Bandingkan
-    result = compare_dataframes(df_old, df_new, key_column)
+    with profiler.stage("compare"):
+        result = compare_dataframes(df_old, df_new, key_column, fuzzy, threshold, align_duplicates, options)
     
     # Print report
-    print_report(result, key_column)
+    with profiler.stage("print report"):
+        print_report(result, key_column)
     
-    # Export ke Excel jika diminta
+    # Export laporan jika diminta
     if output_file:
-        export_to_excel(df_old, df_new, result, output_file, key_column)
+        with profiler.stage("export"):
+            export_report(df_old, df_new, result, output_file, key_column, output_format, summary_only)
     
     return result
 
@@ -286,8 +1455,37 @@ def main():
     )
     parser.add_argument('file_old', nargs='?', help='File Excel lama')
     parser.add_argument('file_new', nargs='?', help='File Excel baru')
-    parser.add_argument('--key', '-k', help='Kolom kunci untuk matching baris')
+    parser.add_argument('--key', '-k', action='append',
+                        help='Kolom kunci untuk matching baris, ulangi untuk key komposit (-k Cabang -k No)')
+    parser.add_argument('--fuzzy', action='store_true',
+                        help='Cocokkan key yang beda spasi/huruf besar atau mirip (butuh --key)')
+    parser.add_argument('--align-duplicates', action='store_true',
+                        help='Key duplikat dicocokkan berdasarkan urutan kemunculan')
+    parser.add_argument('--threshold', type=float,
+                        help=f'Skor kemiripan minimal untuk mode fuzzy, 0-1 (default: {FUZZY_THRESHOLD})')
+    parser.add_argument('--abs-tol', type=float,
+                        help='Toleransi absolut untuk kolom angka (default: 0)')
+    parser.add_argument('--rel-tol', type=float,
+                        help='Toleransi relatif untuk kolom angka, misal 0.001 = 0.1%% (default: 0)')
+    parser.add_argument('--trim', action='store_true',
+                        help='Abaikan spasi di awal/akhir teks')
+    parser.add_argument('--ignore-case', action='store_true',
+                        help='Abaikan beda huruf besar/kecil pada teks')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Mode out-of-core untuk file yang tidak muat di memori (butuh --key)')
+    parser.add_argument('--memory-mb', type=int,
+                        help=f'Batas memori mode streaming dalam MB (default: {STREAM_MEMORY_MB})')
+    parser.add_argument('--spill-dir', help='Folder spill file mode streaming (default: folder temp sistem)')
     parser.add_argument('--output', '-o', help='Export hasil ke file Excel')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS),
+                        help='Format laporan output (default: xlsx)')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Laporan hanya berisi ringkasan dan statistik per kolom, tanpa sheet detail')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tampilkan durasi dan memori setiap tahap')
+    parser.add_argument('--profile-output', help='Simpan profil ke file JSON')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Format file profil: json atau chrome (trace event)')
     parser.add_argument('--config', '-c', default='config.yaml', help='File konfigurasi YAML')
     
     args = parser.parse_args()
@@ -300,7 +1498,23 @@ def main():
     file_old = args.file_old or config.get('file_old')
     file_new = args.file_new or config.get('file_new')
     key_column = args.key or config.get('key_column')
+    align_duplicates = args.align_duplicates or config.get('align_duplicates', False)
+    fuzzy = args.fuzzy or config.get('fuzzy', False)
+    threshold = args.threshold or config.get('fuzzy_threshold', FUZZY_THRESHOLD)
     output_file = args.output or config.get('output')
+    output_format = args.output_format or config.get('output_format', 'xlsx')
+    options = {
+        'abs_tol': args.abs_tol if args.abs_tol is not None else config.get('abs_tol', 0.0),
+        'rel_tol': args.rel_tol if args.rel_tol is not None else config.get('rel_tol', 0.0),
+        'trim': args.trim or config.get('trim', False),
+        'ignore_case': args.ignore_case or config.get('ignore_case', False),
+        'date_format': config.get('date_format'),
+        'columns': config.get('columns') or {},
+    }
+    streaming = args.streaming or config.get('streaming', False)
+    memory_mb = args.memory_mb or config.get('memory_mb', STREAM_MEMORY_MB)
+    spill_dir = args.spill_dir or config.get('spill_dir')
+    summary_only = args.summary_only or config.get('summary_only', False)
     
     # Resolve path
     if file_old and not Path(file_old).is_absolute():
@@ -316,7 +1530,16 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    compare_excel(file_old, file_new, key_column, output_file)
+    profiler = Profiler(enabled=args.profile or bool(args.profile_output))
+    compare_excel(file_old, file_new, key_column, output_file, output_format,
+                  fuzzy=fuzzy, threshold=threshold, align_duplicates=align_duplicates,
+                  options=options, streaming=streaming, memory_mb=memory_mb,
+                  spill_dir=spill_dir, summary_only=summary_only, profiler=profiler)
+    
+    if args.profile:
+        profiler.print_report()
+    if args.profile_output:
+        profiler.export(args.profile_output, args.profile_format)
 
 
 if __name__ == "__main__":
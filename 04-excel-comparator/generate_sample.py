@@ -3,6 +3,7 @@ Generate sample data untuk testing Excel Comparator
 Membuat 2 file: data_lama.xlsx dan data_revisi.xlsx dengan beberapa perbedaan
 """
 
+import random
 import pandas as pd
 from pathlib import Path
 
@@ -99,5 +100,45 @@ def generate_sample_data():
     print("  - No 11, 12: Baris baru")
 
 
+
+def generate_comparison_pair(num_rows: int, seed: int = 42) -> tuple:
+    """
+    Generate pasangan (data_lama, data_revisi) dalam jumlah besar (untuk benchmark).
+    
+    Rasio perbedaan mengikuti sample: 20% baris dihapus, baris baru
+    sejumlah yang dihapus, dan dari baris yang tetap ada 25% Total
+    berubah dan 50% Status berubah.
+    """
+    rng = random.Random(seed)
+    nama_list = ['Budi Santoso', 'Dewi Lestari', 'Ahmad Dahlan', 'Siti Nurhaliza', 'Rudi Hartono',
+                 'Maya Sari', 'Joko Widodo', 'Mega Wati', 'Andi Pratama', 'Rina Susanti']
+    cabang_list = ['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Makassar', 'Semarang', 'Yogyakarta']
+    status_list = ['Lunas', 'Pending', 'Cicilan']
+    
+    def make_row(no):
+        return {
+            'No': no,
+            'Nama': rng.choice(nama_list),
+            'Cabang': rng.choice(cabang_list),
+            'Total': rng.randint(20, 60) * 100000,
+            'Status': rng.choice(status_list),
+        }
+    
+    lama = [make_row(no) for no in range(1, num_rows + 1)]
+    
+    num_deleted = num_rows // 5
+    revisi = []
+    for row in lama[:num_rows - num_deleted]:
+        row = dict(row)
+        if rng.random() < 0.25:
+            row['Total'] += 500000
+        if rng.random() < 0.5:
+            row['Status'] = rng.choice([s for s in status_list if s != row['Status']])
+        revisi.append(row)
+    revisi += [make_row(no) for no in range(num_rows + 1, num_rows + num_deleted + 1)]
+    
+    return pd.DataFrame(lama), pd.DataFrame(revisi)
+
+
 if __name__ == "__main__":
     generate_sample_data()
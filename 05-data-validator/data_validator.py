@@ -3,23 +3,74 @@ Data Validator - Validasi data Excel berdasarkan rules di config YAML
 Mendukung konfigurasi via YAML dan CLI arguments (hybrid)
 """
 
+from __future__ import annotations
+
+import os
+import io
 import sys
 import re
+import csv
+import glob
+import json
+import hashlib
+import time
 import argparse
-import pandas as pd
-import yaml
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, redirect_stdout
 from pathlib import Path
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font
+from typing import TYPE_CHECKING
+
+# Library berat (pandas, openpyxl, dst.) di-import di dalam fungsi yang memakainya,
+# agar --help dan error argumen/config tidak menunggu import pandas
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+COLOR_ERROR = "FFB6C1"
+COLOR_HEADER = "4472C4"
+
+# Format output laporan yang didukung beserta ekstensi filenya
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# Ekstensi file input yang diambil dari folder pada mode batch
+INPUT_SUFFIXES = ('.xlsx', '.csv')
+
+# Tipe rule yang dikenal (dicek sekali oleh compile_rules)
+RULE_TYPES = ['required', 'email', 'phone', 'date_range', 'number_range',
+              'regex', 'in_list', 'unique', 'expression', 'lookup']
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
+# Index nilai referensi rule lookup di-cache (JSON) ke folder cache milik user,
+# dan dipakai ulang selama mtime/ukuran file referensi tidak berubah
+LOOKUP_CACHE_SUBDIR = Path('python-utilities') / 'data-validator' / 'lookup'
 
-FILL_ERROR = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
-FILL_HEADER = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+# Cache index referensi di memori, untuk proses yang memvalidasi banyak file (watcher/worker)
+_lookup_indexes = {}
+
+# Dengan --max-errors/--fail-fast, rules dijalankan per chunk baris agar bisa berhenti lebih awal
+CHUNK_ROWS = 50_000
+
+# Batas baris per sheet Excel; laporan mode streaming pindah ke sheet baru jika lewat
+EXCEL_MAX_ROWS = 1_048_576
+
+# Mode --sample: jumlah strata posisi baris (jika tanpa --stratify), seed, dan z untuk interval 95%
+SAMPLE_STRATA = 20
+SAMPLE_SEED = 42
+CONFIDENCE_Z = 1.96
 
 
 def load_config(config_path: str) -> dict:
     """Load konfigurasi dari file YAML."""
+    import yaml
     config_file = Path(config_path)
     if config_file.exists():
         with open(config_file, 'r', encoding='utf-8') as f:
@@ -27,53 +78,532 @@ def load_config(config_path: str) -> dict:
     return {}
 
 
+# Profiler, arrow_safe, excel_cell, dan OUTPUT_FORMATS sengaja disalin identik ke setiap
+# utility agar folder ini bisa dipakai sendiri tanpa folder lain. Jika diubah, ubah semua
+# salinannya lalu jalankan `python common/check_copies.py` dari root repo.
+class Profiler:
+    """Catat durasi dan pemakaian memori setiap tahap proses (aktif dengan --profile)."""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []  # List of {name, start, duration, depth, mem_peak_mb, mem_delta_mb}
+        self._origin = time.perf_counter()
+        self._peaks = []  # Peak memori tahap induk yang sedang berjalan
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Ukur satu tahap, contoh: with profiler.stage('read'): ..."""
+        if not self.enabled:
+            yield
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        mem_start, peak_so_far = tracemalloc.get_traced_memory()
+        # Simpan peak tahap induk sebelum di-reset oleh tahap ini
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak_so_far)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            mem_end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            
+            self.stages.append({
+                'name': name,
+                'start': start - self._origin,
+                'duration': duration,
+                'depth': len(self._peaks),
+                'mem_peak_mb': peak / 1024 ** 2,
+                'mem_delta_mb': (mem_end - mem_start) / 1024 ** 2,
+            })
+    
+    def sorted_stages(self) -> list:
+        """Tahap diurutkan berdasarkan waktu mulai."""
+        return sorted(self.stages, key=lambda s: s['start'])
+    
+    def total_duration(self) -> float:
+        """Total durasi tahap level teratas."""
+        return sum(s['duration'] for s in self.stages if s['depth'] == 0)
+    
+    def print_report(self) -> None:
+        """Print tabel profil ke console."""
+        if not self.enabled or not self.stages:
+            return
+        
+        total = self.total_duration()
+        print("\n" + "=" * 50)
+        print("PROFIL")
+        print("=" * 50)
+        print(f"\n  {'Tahap':<34} {'Waktu (s)':>10} {'%':>6} {'Peak (MB)':>10} {'Delta (MB)':>11}")
+        for s in self.sorted_stages():
+            name = '  ' * s['depth'] + s['name']
+            pct = s['duration'] / total * 100 if total else 0
+            print(f"  {name:<34} {s['duration']:>10.3f} {pct:>6.1f} "
+                  f"{s['mem_peak_mb']:>10.1f} {s['mem_delta_mb']:>+11.1f}")
+        print(f"  {'Total':<34} {total:>10.3f}")
+    
+    def export(self, output_path: str, output_format: str = 'json') -> None:
+        """Simpan profil ke JSON, atau format trace event Chrome (chrome://tracing, Perfetto)."""
+        if not self.enabled:
+            return
+        
+        if output_format == 'chrome':
+            data = {'traceEvents': [{
+                'name': s['name'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6),
+                'dur': round(s['duration'] * 1e6),
+                'pid': 1,
+                'tid': 1,
+                'args': {'mem_peak_mb': round(s['mem_peak_mb'], 2),
+                         'mem_delta_mb': round(s['mem_delta_mb'], 2)},
+            } for s in self.sorted_stages()]}
+        else:
+            data = {'total_s': self.total_duration(), 'stages': self.sorted_stages()}
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profil disimpan ke: {output_path}")
+
+
+
+def expression_columns(df: pd.DataFrame, expr: str) -> list:
+    """Kolom yang disebut di ekspresi (nama biasa atau `nama dengan spasi`)."""
+    return [
+        column for column in df.columns
+        if f'`{column}`' in expr or re.search(rf'(?<![\w@`]){re.escape(str(column))}(?![\w`])', expr)
+    ]
+
+
+def value_keys(series: pd.Series) -> pd.Series:
+    """Nilai sebagai teks (lookup dan unique), agar 1001, 1001.0, dan '1001' dianggap sama."""
+    import pandas as pd
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype('Int64')
+    return series.astype('string').str.strip()
+
+
+def lookup_cache_dir() -> Path:
+    """Folder cache lookup milik user (bukan folder data bersama yang bisa ditulis orang lain)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / LOOKUP_CACHE_SUBDIR
+
+
+def lookup_index(file: str, column: str, sheet: str = None) -> pd.Index:
+    """
+    Index (hash table) nilai unik kolom referensi untuk rule lookup.
+    
+    Dibangun sekali lalu di-cache di memori dan sebagai JSON di lookup_cache_dir();
+    cache dipakai ulang selama mtime dan ukuran file referensi sama.
+    """
+    import pandas as pd
+    
+    path = Path(file).resolve()
+    if not path.exists():
+        print(f"Error: File referensi '{file}' tidak ditemukan")
+        sys.exit(1)
+    
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (str(path), sheet, column)
+    cached = _lookup_indexes.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    
+    # Cache berupa JSON (hanya data, tidak pernah menjalankan kode saat dibaca)
+    digest = hashlib.md5(f"{path}|{sheet}|{column}".encode('utf-8')).hexdigest()[:12]
+    cache_file = lookup_cache_dir() / f"{path.name}.{digest}.json"
+    values = None
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry['stamp'] == list(stamp) and entry['source'] == str(path):
+                values = entry['values']
+        except (OSError, ValueError, KeyError, TypeError):
+            values = None
+    
+    if values is None:
+        try:
+            ref = pd.read_excel(path, sheet_name=sheet or 0, usecols=[column])
+        except ValueError as e:
+            print(f"Error: Kolom '{column}' tidak bisa dibaca dari '{file}': {e}")
+            sys.exit(1)
+        keys = value_keys(ref[column])
+        values = keys[keys.notna() & (keys != '')].unique().tolist()
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'source': str(path), 'stamp': list(stamp), 'values': values}, f,
+                          ensure_ascii=False)
+        except OSError:
+            pass  # folder cache tidak bisa ditulis: cukup cache di memori
+    
+    index = pd.Index(values, dtype='string')
+    
+    _lookup_indexes[key] = (stamp, index)
+    return index
+
+
+def resolve_lookup_files(rules: dict, base_dir: Path) -> dict:
+    """Path file referensi rule lookup yang relatif dianggap relatif ke folder config."""
+    resolved = {}
+    for column, column_rules in rules.items():
+        resolved[column] = []
+        for rule in column_rules:
+            file = rule.get('file')
+            if rule.get('type') == 'lookup' and file and not Path(file).is_absolute():
+                rule = {**rule, 'file': str(base_dir / file)}
+            resolved[column].append(rule)
+    return resolved
+
+
+# Template pesan error per (rule, jenis); dirender saat laporan dibuat, bukan saat validasi.
+# Rule dengan 'message' di config memakai pesan itu apa adanya.
+ERROR_MESSAGES = {
+    ('required', 0): '{column} tidak boleh kosong',
+    ('email', 0): 'Format email tidak valid: {value}',
+    ('phone', 0): 'No HP kurang dari {min_digits} digit: {value}',
+    ('date_range', 0): 'Tanggal sebelum {min}: {value}',
+    ('date_range', 1): 'Tanggal setelah {max}: {value}',
+    ('date_range', 2): 'Format tanggal tidak valid: {value}',
+    ('number_range', 0): 'Nilai kurang dari {min}: {value}',
+    ('number_range', 1): 'Nilai lebih dari {max}: {value}',
+    ('number_range', 2): 'Bukan angka valid: {value}',
+    ('regex', 0): 'Tidak sesuai format: {pattern}',
+    ('in_list', 0): 'Nilai "{value}" tidak valid. Harus salah satu dari: {values}',
+    ('unique', 0): 'Duplikat dengan baris {ref}: {value}',
+    ('expression', 0): 'Tidak memenuhi ekspresi: {expr}',
+    ('lookup', 0): 'Nilai "{value}" tidak ada di {file_name} [{ref_column}]',
+}
+
+
+class ErrorStore:
+    """
+    Error validasi dalam bentuk kolom: array NumPy index baris, id kolom, id rule,
+    jenis error, dan referensi (baris duplikat). Nilai cell diambil dari DataFrame
+    dan pesan dirender hanya saat dibutuhkan (print/export).
+    
+    Iterasi, len(), dan indexing tetap menghasilkan dict {row, column, value, rule, message}
+    seperti list error versi lama.
+    """
+    
+    FIELDS = ('index', 'column_id', 'rule_id', 'kind', 'ref')
+    
+    def __init__(self, df: pd.DataFrame = None):
+        self.df = df
+        self.total_rows = len(df) if df is not None else 0  # Jumlah baris yang divalidasi
+        self.columns = []  # id -> nama kolom
+        self.rules = []    # id -> (tipe rule, dict rule)
+        self._ids = {}
+        self._parts = []
+        self._data = None
+    
+    def add(self, column: str, rule_type: str, rule: dict, index, kind=0, ref=None) -> None:
+        """Catat error satu rule untuk label index baris `index` (kind: satu nilai atau per baris)."""
+        import numpy as np
+        index = np.asarray(index, dtype=np.int64)
+        if not len(index):
+            return
+        column_id = self._id('column', column, self.columns, column)
+        rule_id = self._id('rule', (column, id(rule), rule_type), self.rules, (rule_type, rule))
+        kind = np.asarray(kind, dtype=np.int8)
+        ref = np.full(len(index), -1, dtype=np.int64) if ref is None else np.asarray(ref, dtype=np.int64)
+        self._parts.append((
+            index,
+            np.full(len(index), column_id, dtype=np.int32),
+            np.full(len(index), rule_id, dtype=np.int32),
+            np.full(len(index), kind, dtype=np.int8) if kind.ndim == 0 else kind,
+            ref,
+        ))
+        self._data = None
+    
+    def _id(self, kind: str, key, table: list, item) -> int:
+        """Id kolom/rule; item baru ditambahkan ke tabel."""
+        key = (kind, key)
+        if key not in self._ids:
+            self._ids[key] = len(table)
+            table.append(item)
+        return self._ids[key]
+    
+    @property
+    def data(self) -> dict:
+        """Semua array error (digabung saat pertama diakses setelah ada error baru)."""
+        import numpy as np
+        if self._data is None:
+            if self._parts:
+                self._data = {name: np.concatenate(arrays) for name, arrays in zip(self.FIELDS, zip(*self._parts))}
+            else:
+                dtypes = (np.int64, np.int32, np.int32, np.int8, np.int64)
+                self._data = {name: np.empty(0, dtype=dtype) for name, dtype in zip(self.FIELDS, dtypes)}
+            self._parts = [tuple(self._data[name] for name in self.FIELDS)] if self._parts else []
+        return self._data
+    
+    @property
+    def rows(self):
+        """Nomor baris Excel setiap error (+2 karena header dan 0-index)."""
+        return self.data['index'] + 2
+    
+    def __len__(self) -> int:
+        return sum(len(part[0]) for part in self._parts)
+    
+    def truncate(self, count: int) -> None:
+        """Simpan hanya `count` error pertama."""
+        data = {name: array[:count] for name, array in self.data.items()}
+        self._parts = [tuple(data[name] for name in self.FIELDS)] if len(data['index']) else []
+        self._data = None
+    
+    def error_row_count(self) -> int:
+        """Jumlah baris unik yang punya error."""
+        import numpy as np
+        return len(np.unique(self.data['index']))
+    
+    def column_names(self):
+        """Nama kolom setiap error."""
+        import numpy as np
+        return np.array(self.columns, dtype=object)[self.data['column_id']] if self.columns else np.empty(0, dtype=object)
+    
+    def rule_names(self):
+        """Tipe rule setiap error."""
+        import numpy as np
+        names = [rule_type for rule_type, _ in self.rules]
+        return np.array(names, dtype=object)[self.data['rule_id']] if names else np.empty(0, dtype=object)
+    
+    def values(self):
+        """Nilai cell setiap error, diambil per kolom dari DataFrame."""
+        import numpy as np
+        data = self.data
+        values = np.empty(len(data['index']), dtype=object)
+        for column_id, column in enumerate(self.columns):
+            mask = data['column_id'] == column_id
+            if mask.any():
+                values[mask] = self.df[column].loc[data['index'][mask]].to_numpy(dtype=object)
+        return values
+    
+    def error_cells(self) -> set:
+        """Set (baris, kolom) yang error, untuk highlight."""
+        return set(zip(self.rows.tolist(), self.column_names().tolist()))
+    
+    def message(self, position: int, value=None) -> str:
+        """Render pesan satu error."""
+        data = self.data
+        column = self.columns[data['column_id'][position]]
+        rule_type, rule = self.rules[data['rule_id'][position]]
+        if rule.get('message'):
+            return rule['message']
+        if value is None:
+            value = self.df.at[data['index'][position], column]
+        return ERROR_MESSAGES[(rule_type, int(data['kind'][position]))].format(
+            column=column,
+            value=value,
+            ref=data['ref'][position],
+            min=rule.get('min'),
+            max=rule.get('max'),
+            min_digits=rule.get('min_digits', 10),
+            pattern=rule.get('pattern'),
+            values=rule.get('values', []),
+            expr=rule.get('expr'),
+            file_name=Path(rule.get('file') or '').name,
+            ref_column=rule.get('column'),
+        )
+    
+    def record(self, position: int) -> dict:
+        """Satu error sebagai dict {row, column, value, rule, message}."""
+        data = self.data
+        column = self.columns[data['column_id'][position]]
+        value = self.df.at[data['index'][position], column]
+        return {
+            'row': int(data['index'][position]) + 2,
+            'column': column,
+            'value': value,
+            'rule': self.rules[data['rule_id'][position]][0],
+            'message': self.message(position, value),
+        }
+    
+    def records(self) -> list:
+        """Tampilan kompatibel: list of dict seperti Validator.errors versi lama."""
+        return list(self)
+    
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.record(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('index error di luar jangkauan')
+        return self.record(key)
+
+
+def compile_rules(rules: dict) -> dict:
+    """
+    Siapkan rules sekali sebelum file divalidasi: cek tipe dan parameter, compile pattern
+    regex, dan bangun index referensi lookup (agar cache-nya sudah ada untuk semua worker).
+    """
+    compiled = {}
+    for column, column_rules in rules.items():
+        compiled[column] = []
+        for rule in column_rules or []:
+            rule_type = rule.get('type')
+            if rule_type not in RULE_TYPES:
+                print(f"Error: Rule '{rule_type}' di kolom '{column}' tidak dikenal")
+                print(f"Rule yang tersedia: {', '.join(RULE_TYPES)}")
+                sys.exit(1)
+            
+            if rule_type == 'regex' and rule.get('pattern'):
+                try:
+                    rule = {**rule, 'compiled': re.compile(rule['pattern'])}
+                except re.error as e:
+                    print(f"Error: Pattern regex kolom '{column}' tidak valid: {e}")
+                    sys.exit(1)
+            elif rule_type == 'lookup':
+                if not rule.get('file') or not rule.get('column'):
+                    print(f"Error: Rule lookup kolom '{column}' butuh 'file' dan 'column'")
+                    sys.exit(1)
+                lookup_index(rule['file'], rule['column'], rule.get('sheet'))
+            compiled[column].append(rule)
+    return compiled
+
+
+def filled_mask(values: pd.Series) -> pd.Series:
+    """Mask cell yang tidak kosong (cell kosong hanya divalidasi oleh rule required)."""
+    return values.notna() & (values.astype(str).str.strip() != '')
+
+
+def coerce_dates(values: pd.Series, fmt: str = None, dayfirst: bool = False) -> tuple:
+    """
+    Konversi kolom ke tanggal sekaligus dengan pd.to_datetime(errors='coerce').
+    
+    Tanpa `fmt`, setiap cell dibaca sendiri (format='mixed'), jadi hasilnya tidak bergantung
+    pada format cell pertama atau urutan baris. Tanggal ambigu seperti '01/02/2024' dibaca
+    bulan dulu (2 Jan) kecuali `dayfirst` (1 Feb); cell yang hanya valid satu cara
+    ('13/02/2024') tetap terbaca. Return (tanggal, mask tidak valid).
+    """
+    import pandas as pd
+    filled = filled_mask(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, values.isna() & filled
+    
+    if fmt:
+        dates = pd.to_datetime(values, errors='coerce', format=fmt)
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # peringatan dayfirst per cell
+            dates = pd.to_datetime(values, errors='coerce', format='mixed', dayfirst=dayfirst)
+        if dayfirst:
+            # dayfirst juga membalik teks ISO (2024-03-04 jadi 3 April), jadi baca ulang sebagai ISO
+            text = values.where(values.map(type) == str)
+            iso = pd.to_datetime(text, errors='coerce', format='ISO8601')
+            dates = iso.where(iso.notna(), dates)
+    return dates, dates.isna() & filled
+
+
+def coerce_numbers(values: pd.Series) -> tuple:
+    """
+    Konversi kolom ke angka sekaligus dengan pd.to_numeric(errors='coerce'); cell yang gagal
+    dicoba ulang dengan float() (misal ' 1e3 '). Return (angka, mask tidak valid).
+    """
+    import pandas as pd
+    numbers = pd.to_numeric(values, errors='coerce')
+    invalid = numbers.isna() & filled_mask(values)
+    if invalid.any():
+        numbers = numbers.astype(float)
+        for idx, value in values[invalid].items():
+            try:
+                numbers[idx] = float(value)
+                invalid[idx] = False
+            except (ValueError, TypeError):
+                pass
+    return numbers, invalid
+
+
+def active_rules(rules: dict, columns) -> dict:
+    """Rules untuk kolom yang ada di data; kolom yang tidak ditemukan di-skip dengan peringatan."""
+    active = {}
+    for column, column_rules in rules.items():
+        if column not in columns:
+            print(f"  Peringatan: Kolom '{column}' tidak ditemukan, skip validasi")
+            continue
+        active[column] = column_rules
+    return active
+
+
 class Validator:
     """Class untuk validasi data."""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, profiler: Profiler = None, max_errors: int = None):
         self.df = df
-        self.errors = []  # List of {row, column, value, rule, message}
+        self.errors = ErrorStore(df)  # Kompatibel dengan list of {row, column, value, rule, message}
+        self.profiler = profiler or Profiler()
+        self.max_errors = max_errors
+        self.rows_checked = 0
+        self.stopped = False     # True jika berhenti karena batas max_errors
+        self.unique_seen = {}    # kolom -> {nilai: baris pertama}, berlanjut antar chunk
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+    
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        # Cache konversi kolom hanya berlaku untuk DataFrame (atau chunk) yang sedang divalidasi
+        self._df = df
+        self.coerce_cache = {}
+    
+    def coerced(self, column: str, kind: str, fmt: str = None, dayfirst: bool = False):
+        """
+        Kolom yang sudah dikonversi sekali lalu di-cache untuk semua rule di kolom itu.
+        kind: 'filled' (mask cell terisi), 'text' (value_keys), 'date' dan 'number'
+        (tuple nilai hasil konversi dan mask cell tidak valid).
+        """
+        key = (kind, column, fmt, dayfirst)
+        if key not in self.coerce_cache:
+            values = self.df[column]
+            if kind == 'filled':
+                self.coerce_cache[key] = filled_mask(values)
+            elif kind == 'text':
+                self.coerce_cache[key] = value_keys(values)
+            elif kind == 'date':
+                self.coerce_cache[key] = coerce_dates(values, fmt, dayfirst)
+            else:
+                self.coerce_cache[key] = coerce_numbers(values)
+        return self.coerce_cache[key]
+    
+    def filled_cells(self, column: str) -> pd.Series:
+        """Cell yang tidak kosong (cell kosong hanya divalidasi oleh rule required)."""
+        return self.df[column][self.coerced(column, 'filled')]
     
     def validate_required(self, column: str, rule: dict) -> None:
         """Validasi field tidak boleh kosong."""
-        for idx, value in self.df[column].items():
-            if pd.isna(value) or str(value).strip() == '':
-                self.errors.append({
-                    'row': idx + 2,  # +2 karena header dan 0-index
-                    'column': column,
-                    'value': value,
-                    'rule': 'required',
-                    'message': f'{column} tidak boleh kosong'
-                })
+        empty = ~self.coerced(column, 'filled')
+        self.errors.add(column, 'required', rule, self.df.index[empty])
     
     def validate_email(self, column: str, rule: dict) -> None:
         """Validasi format email."""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                if not re.match(email_pattern, str(value)):
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'email',
-                        'message': f'Format email tidak valid: {value}'
-                    })
+        failed = [idx for idx, value in self.filled_cells(column).items()
+                  if not EMAIL_PATTERN.match(str(value))]
+        self.errors.add(column, 'email', rule, failed)
     
     def validate_phone(self, column: str, rule: dict) -> None:
         """Validasi nomor telepon."""
         min_digits = rule.get('min_digits', 10)
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                digits = re.sub(r'\D', '', str(value))
-                if len(digits) < min_digits:
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'phone',
-                        'message': f'No HP kurang dari {min_digits} digit: {value}'
-                    })
+        failed = [idx for idx, value in self.filled_cells(column).items()
+                  if len(re.sub(r'\D', '', str(value))) < min_digits]
+        self.errors.add(column, 'phone', rule, failed)
     
     def validate_date_range(self, column: str, rule: dict) -> None:
         """Validasi tanggal dalam range."""
@@ -85,158 +615,228 @@ class Validator:
         if max_date:
             max_date = datetime.strptime(max_date, '%Y-%m-%d')
         
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                try:
-                    if isinstance(value, datetime):
-                        date_val = value
-                    else:
-                        date_val = pd.to_datetime(value)
-                    
-                    if min_date and date_val < min_date:
-                        self.errors.append({
-                            'row': idx + 2,
-                            'column': column,
-                            'value': value,
-                            'rule': 'date_range',
-                            'message': f'Tanggal sebelum {min_date.strftime("%Y-%m-%d")}: {value}'
-                        })
-                    elif max_date and date_val > max_date:
-                        self.errors.append({
-                            'row': idx + 2,
-                            'column': column,
-                            'value': value,
-                            'rule': 'date_range',
-                            'message': f'Tanggal setelah {max_date.strftime("%Y-%m-%d")}: {value}'
-                        })
-                except:
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'date_range',
-                        'message': f'Format tanggal tidak valid: {value}'
-                    })
+        # Konversi sekali per kolom (di-cache), lalu perbandingan range secara vektor
+        dates, invalid = self.coerced(column, 'date', rule.get('format'), bool(rule.get('dayfirst')))
+        self.add_range_errors(column, 'date_range', rule, dates, invalid, min_date, max_date)
+    
+    def add_range_errors(self, column: str, rule_type: str, rule: dict, values: pd.Series,
+                         invalid: pd.Series, low=None, high=None) -> None:
+        """Catat error range; kind: 0 = kurang dari min, 1 = lebih dari max, 2 = tidak valid."""
+        import numpy as np
+        below = (values < low).to_numpy() if low is not None else np.zeros(len(values), dtype=bool)
+        above = (values > high).to_numpy() if high is not None else np.zeros(len(values), dtype=bool)
+        kinds = np.select([invalid.to_numpy(), below, above], [2, 0, 1], -1)
+        failed = kinds >= 0
+        self.errors.add(column, rule_type, rule, self.df.index[failed], kind=kinds[failed])
     
     def validate_number_range(self, column: str, rule: dict) -> None:
         """Validasi angka dalam range."""
         min_val = rule.get('min')
         max_val = rule.get('max')
         
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                try:
-                    num_val = float(value)
-                    if min_val is not None and num_val < min_val:
-                        self.errors.append({
-                            'row': idx + 2,
-                            'column': column,
-                            'value': value,
-                            'rule': 'number_range',
-                            'message': f'Nilai kurang dari {min_val}: {value}'
-                        })
-                    elif max_val is not None and num_val > max_val:
-                        self.errors.append({
-                            'row': idx + 2,
-                            'column': column,
-                            'value': value,
-                            'rule': 'number_range',
-                            'message': f'Nilai lebih dari {max_val}: {value}'
-                        })
-                except:
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'number_range',
-                        'message': f'Bukan angka valid: {value}'
-                    })
+        numbers, invalid = self.coerced(column, 'number')
+        self.add_range_errors(column, 'number_range', rule, numbers, invalid, min_val, max_val)
     
     def validate_regex(self, column: str, rule: dict) -> None:
         """Validasi dengan regex pattern."""
-        pattern = rule.get('pattern')
-        message = rule.get('message', f'Tidak sesuai format: {pattern}')
+        pattern = rule.get('compiled') or rule.get('pattern')
         
         if not pattern:
             return
         
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                if not re.match(pattern, str(value)):
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'regex',
-                        'message': message
-                    })
+        failed = [idx for idx, value in self.filled_cells(column).items()
+                  if not re.match(pattern, str(value))]
+        self.errors.add(column, 'regex', rule, failed)
     
     def validate_in_list(self, column: str, rule: dict) -> None:
         """Validasi nilai harus dalam list."""
-        valid_values = rule.get('values', [])
-        
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                if str(value) not in [str(v) for v in valid_values]:
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'in_list',
-                        'message': f'Nilai "{value}" tidak valid. Harus salah satu dari: {valid_values}'
-                    })
+        valid_values = set(str(v) for v in rule.get('values', []))
+        failed = [idx for idx, value in self.filled_cells(column).items()
+                  if str(value) not in valid_values]
+        self.errors.add(column, 'in_list', rule, failed)
     
     def validate_unique(self, column: str, rule: dict) -> None:
         """Validasi nilai harus unik (tidak duplikat)."""
-        seen = {}
-        for idx, value in self.df[column].items():
-            if pd.notna(value) and str(value).strip() != '':
-                str_val = str(value)
-                if str_val in seen:
-                    self.errors.append({
-                        'row': idx + 2,
-                        'column': column,
-                        'value': value,
-                        'rule': 'unique',
-                        'message': f'Duplikat dengan baris {seen[str_val]}: {value}'
-                    })
-                else:
-                    seen[str_val] = idx + 2
-    
-    def validate(self, rules: dict) -> list:
+        seen = self.unique_seen.setdefault(column, {})
+        failed, first_rows = [], []
+        keys = self.coerced(column, 'text')
+        for idx, str_val in keys[self.coerced(column, 'filled')].items():
+            if str_val in seen:
+                failed.append(idx)
+                first_rows.append(seen[str_val])
+            else:
+                seen[str_val] = idx + 2
+        self.errors.add(column, 'unique', rule, failed, ref=first_rows)
+    
+    def validate_expression(self, column: str, rule: dict) -> None:
+        """Validasi antar kolom dengan ekspresi per baris (DataFrame.eval), hasil harus True."""
+        import pandas as pd
+        expr = rule.get('expr')
+        
+        if not expr:
+            return
+        
+        # Hanya kolom yang dipakai ekspresi yang disiapkan; baris dengan cell kosong di-skip
+        used = expression_columns(self.df, expr)
+        frame = self.df[used].copy()
+        for name in rule.get('dates', []):
+            if name in frame.columns:
+                frame[name] = self.coerced(name, 'date', dayfirst=bool(rule.get('dayfirst')))[0]
+        
+        filled = pd.Series(True, index=self.df.index)
+        for name in used:
+            filled &= self.coerced(name, 'filled')
+        
+        today = pd.Timestamp.today().normalize()
+        try:
+            result = frame.eval(expr, local_dict={'today': today, 'year': today.year})
+        except Exception as e:
+            print(f"Error: Ekspresi '{expr}' tidak valid: {type(e).__name__}: {e}")
+            sys.exit(1)
+        if not isinstance(result, pd.Series) or len(result) != len(self.df):
+            print(f"Error: Ekspresi '{expr}' harus menghasilkan True/False per baris")
+            sys.exit(1)
+        
+        failed = filled & ~result.fillna(False).astype(bool)
+        self.errors.add(column, 'expression', rule, self.df.index[failed])
+    
+    def validate_lookup(self, column: str, rule: dict) -> None:
+        """Validasi nilai harus ada di kolom workbook referensi."""
+        file = rule.get('file')
+        ref_column = rule.get('column')
+        if not file or not ref_column:
+            print(f"Error: Rule lookup kolom '{column}' butuh 'file' dan 'column'")
+            sys.exit(1)
+        
+        index = lookup_index(file, ref_column, rule.get('sheet'))
+        keys = self.coerced(column, 'text')
+        filled = keys.notna() & (keys != '')
+        
+        # get_indexer memakai hash table index: O(1) per baris, tanpa membangun set ulang
+        found = index.get_indexer(keys[filled]) >= 0
+        self.errors.add(column, 'lookup', rule, keys[filled].index[~found])
+    
+    def validate(self, rules: dict) -> ErrorStore:
         """Jalankan semua validasi berdasarkan rules."""
+        active = active_rules(rules, self.df.columns)
+        
+        if not self.max_errors:
+            self.run_rules(active)
+            self.rows_checked = len(self.df)
+            return self.errors
+        
+        # Berhenti lebih awal: semua rules per chunk, cek batas error setelah setiap rule
+        full = self.df
+        for start in range(0, len(full), CHUNK_ROWS):
+            self.df = full.iloc[start:start + CHUNK_ROWS]
+            self.rows_checked = start + len(self.df)
+            with self.profiler.stage(f"chunk baris {start + 2}-{self.rows_checked + 1}"):
+                self.run_rules(active, stages=False)
+            if self.stopped:
+                break
+        self.df = full
+        self.errors.truncate(self.max_errors)
+        return self.errors
+    
+    def validate_chunk(self, df: pd.DataFrame, rules: dict) -> ErrorStore:
+        """Validasi satu chunk (mode streaming); state unique berlanjut dari chunk sebelumnya."""
+        self.df = df
+        self.errors = ErrorStore(df)
+        self.run_rules(rules, stages=False)
+        self.rows_checked += len(df)
+        return self.errors
+    
+    def run_rules(self, rules: dict, stages: bool = True) -> None:
+        """Jalankan rules pada self.df (seluruh data atau satu chunk)."""
         for column, column_rules in rules.items():
-            if column not in self.df.columns:
-                print(f"  Peringatan: Kolom '{column}' tidak ditemukan, skip validasi")
-                continue
-            
             for rule in column_rules:
                 rule_type = rule.get('type')
                 
-                if rule_type == 'required':
-                    self.validate_required(column, rule)
-                elif rule_type == 'email':
-                    self.validate_email(column, rule)
-                elif rule_type == 'phone':
-                    self.validate_phone(column, rule)
-                elif rule_type == 'date_range':
-                    self.validate_date_range(column, rule)
-                elif rule_type == 'number_range':
-                    self.validate_number_range(column, rule)
-                elif rule_type == 'regex':
-                    self.validate_regex(column, rule)
-                elif rule_type == 'in_list':
-                    self.validate_in_list(column, rule)
-                elif rule_type == 'unique':
-                    self.validate_unique(column, rule)
-        
-        return self.errors
+                with self.profiler.stage(f"{rule_type} [{column}]") if stages else nullcontext():
+                    if rule_type == 'required':
+                        self.validate_required(column, rule)
+                    elif rule_type == 'email':
+                        self.validate_email(column, rule)
+                    elif rule_type == 'phone':
+                        self.validate_phone(column, rule)
+                    elif rule_type == 'date_range':
+                        self.validate_date_range(column, rule)
+                    elif rule_type == 'number_range':
+                        self.validate_number_range(column, rule)
+                    elif rule_type == 'regex':
+                        self.validate_regex(column, rule)
+                    elif rule_type == 'in_list':
+                        self.validate_in_list(column, rule)
+                    elif rule_type == 'unique':
+                        self.validate_unique(column, rule)
+                    elif rule_type == 'expression':
+                        self.validate_expression(column, rule)
+                    elif rule_type == 'lookup':
+                        self.validate_lookup(column, rule)
+                
+                if self.max_errors and len(self.errors) >= self.max_errors:
+                    self.stopped = True
+                    return
 
 
-def print_report(total_rows: int, errors: list):
+def sample_rows(df: pd.DataFrame, size: float, stratify: str = None) -> pd.DataFrame:
+    """
+    Sampel acak berstrata (index asli dipertahankan agar nomor baris tetap benar).
+    
+    size < 1 berarti fraksi, selain itu jumlah baris. Strata = nilai kolom `stratify`,
+    atau SAMPLE_STRATA blok posisi baris agar seluruh bagian file ikut terambil.
+    """
+    import numpy as np
+    import pandas as pd
+    count = round(size * len(df)) if size < 1 else int(size)
+    if count >= len(df):
+        return df
+    
+    if stratify:
+        strata = df[stratify].astype(str)
+    else:
+        strata = pd.Series(np.arange(len(df)) * SAMPLE_STRATA // len(df), index=df.index)
+    
+    # Jatah per strata proporsional, sisa pembulatan ke strata dengan pecahan terbesar
+    quota = strata.value_counts(sort=False) * count / len(df)
+    alloc = np.floor(quota).astype(int)
+    leftover = (quota - alloc).sort_values(ascending=False).index[:count - alloc.sum()]
+    alloc[leftover] += 1
+    
+    # Acak urutan baris, ambil `alloc` baris pertama dari setiap strata
+    order = np.random.default_rng(SAMPLE_SEED).permutation(len(df))
+    shuffled = strata.iloc[order]
+    rank = shuffled.groupby(shuffled, sort=False).cumcount().to_numpy()
+    keep = rank < shuffled.map(alloc).to_numpy()
+    return df.iloc[np.sort(order[keep])]
+
+
+def error_rate_interval(error_rows: int, sample_rows: int) -> tuple:
+    """Proporsi baris error di sampel dan interval Wilson (CONFIDENCE_Z) untuk seluruh file."""
+    if not sample_rows:
+        return 0.0, 0.0, 1.0
+    p = error_rows / sample_rows
+    z2 = CONFIDENCE_Z ** 2
+    center = (p + z2 / (2 * sample_rows)) / (1 + z2 / sample_rows)
+    margin = CONFIDENCE_Z * (p * (1 - p) / sample_rows + z2 / (4 * sample_rows ** 2)) ** 0.5 / (1 + z2 / sample_rows)
+    return p, max(0.0, center - margin), min(1.0, center + margin)
+
+
+def print_sample_estimate(total_rows: int, sample_rows: int, errors: ErrorStore):
+    """Print estimasi baris error seluruh file dari hasil sampel."""
+    rate, low, high = error_rate_interval(errors.error_row_count(), sample_rows)
+    
+    print(f"\n--- ESTIMASI DARI SAMPEL ---")
+    print(f"  Sampel          : {sample_rows:,} dari {total_rows:,} baris")
+    print(f"  Baris error     : {rate:.1%} (95% CI {low:.1%} - {high:.1%})")
+    print(f"  Estimasi total  : ~{round(rate * total_rows):,} baris error "
+          f"({round(low * total_rows):,} - {round(high * total_rows):,})")
+
+
+def print_report(total_rows: int, errors: ErrorStore):
     """Print laporan validasi ke console."""
-    error_rows = set(e['row'] for e in errors)
-    valid_count = total_rows - len(error_rows)
+    error_row_count = errors.error_row_count()
+    valid_count = total_rows - error_row_count
     
     print("\n" + "=" * 50)
     print("LAPORAN VALIDASI")
@@ -245,7 +845,7 @@ def print_report(total_rows: int, errors: list):
     print(f"\nRingkasan:")
     print(f"  Total baris : {total_rows}")
     print(f"  Valid       : {valid_count}")
-    print(f"  Error       : {len(error_rows)} baris ({len(errors)} masalah)")
+    print(f"  Error       : {error_row_count} baris ({len(errors)} masalah)")
     
     if not errors:
         print("\n✓ Semua data VALID!")
@@ -259,16 +859,22 @@ def print_report(total_rows: int, errors: list):
         print(f"  ... dan {len(errors) - 30} error lainnya")
 
 
-def export_to_excel(df: pd.DataFrame, errors: list, output_path: str):
+def export_to_excel(df: pd.DataFrame, errors: ErrorStore, output_path: str):
     """Export hasil validasi ke Excel."""
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font
+    
+    fill_error = PatternFill(start_color=COLOR_ERROR, end_color=COLOR_ERROR, fill_type="solid")
+    fill_header = PatternFill(start_color=COLOR_HEADER, end_color=COLOR_HEADER, fill_type="solid")
     wb = Workbook()
     
     # Sheet 1: Summary
     ws_summary = wb.active
     ws_summary.title = "Summary"
     
-    error_rows = set(e['row'] for e in errors)
-    valid_count = len(df) - len(error_rows)
+    error_row_count = errors.error_row_count()
+    valid_count = len(df) - error_row_count
     
     ws_summary['A1'] = "Laporan Validasi Data"
     ws_summary['A1'].font = Font(bold=True, size=14)
@@ -277,7 +883,7 @@ def export_to_excel(df: pd.DataFrame, errors: list, output_path: str):
     ws_summary['A4'] = "Valid:"
     ws_summary['B4'] = valid_count
     ws_summary['A5'] = "Error:"
-    ws_summary['B5'] = len(error_rows)
+    ws_summary['B5'] = error_row_count
     ws_summary['A6'] = "Total Masalah:"
     ws_summary['B6'] = len(errors)
     
@@ -287,16 +893,19 @@ def export_to_excel(df: pd.DataFrame, errors: list, output_path: str):
         ws_errors.append(["Baris", "Kolom", "Nilai", "Rule", "Pesan"])
         
         for cell in ws_errors[1]:
-            cell.fill = FILL_HEADER
+            cell.fill = fill_header
             cell.font = Font(bold=True, color="FFFFFF")
         
-        for error in errors:
+        # Pesan dirender di sini, per error, langsung ke sheet
+        for row, column, value, rule_type, position in zip(
+                errors.rows.tolist(), errors.column_names(), errors.values(),
+                errors.rule_names(), range(len(errors))):
             ws_errors.append([
-                error['row'],
-                error['column'],
-                str(error['value']) if error['value'] is not None else '',
-                error['rule'],
-                error['message']
+                row,
+                column,
+                str(value) if value is not None else '',
+                rule_type,
+                errors.message(position, value)
             ])
     
     # Sheet 3: Data dengan highlight error
@@ -305,13 +914,11 @@ def export_to_excel(df: pd.DataFrame, errors: list, output_path: str):
     # Header
     ws_data.append(list(df.columns))
     for cell in ws_data[1]:
-        cell.fill = FILL_HEADER
+        cell.fill = fill_header
         cell.font = Font(bold=True, color="FFFFFF")
     
     # Data
-    error_cells = {}  # {(row, col): True}
-    for error in errors:
-        error_cells[(error['row'], error['column'])] = True
+    error_cells = errors.error_cells()  # {(row, col)}
     
     for idx, row in df.iterrows():
         excel_row = idx + 2  # +2 karena header dan 0-index
@@ -321,46 +928,660 @@ def export_to_excel(df: pd.DataFrame, errors: list, output_path: str):
             row_data.append(str(val) if pd.notna(val) else '')
         ws_data.append(row_data)
         
-        # Highlight error cells
+        # Highlight error cells (baris sheet bisa beda dengan baris asli pada mode --sample)
         for col_idx, col in enumerate(df.columns, 1):
             if (excel_row, col) in error_cells:
-                ws_data.cell(row=excel_row, column=col_idx).fill = FILL_ERROR
+                ws_data.cell(row=ws_data.max_row, column=col_idx).fill = fill_error
     
     wb.save(output_path)
     print(f"\nLaporan Excel disimpan ke: {output_path}")
 
 
-def validate_data(input_file: str, rules: dict, output_file: str = None) -> list:
-    """Main function untuk validasi data."""
+def arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah kolom object dengan tipe campuran ke string agar bisa ditulis pyarrow."""
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def build_report_tables(df: pd.DataFrame, errors: ErrorStore) -> dict:
+    """Susun isi laporan (sheet yang sama dengan export Excel) sebagai DataFrame."""
+    import pandas as pd
+    error_row_count = errors.error_row_count()
+    tables = {
+        'summary': pd.DataFrame({
+            'Keterangan': ['Total Baris', 'Valid', 'Error', 'Total Masalah'],
+            'Jumlah': [len(df), len(df) - error_row_count, error_row_count, len(errors)],
+        })
+    }
+    
+    if len(errors):
+        values = errors.values()
+        tables['detail_error'] = pd.DataFrame({
+            'Baris': errors.rows,
+            'Kolom': errors.column_names(),
+            'Nilai': [str(v) if v is not None else '' for v in values],
+            'Rule': errors.rule_names(),
+            'Pesan': [errors.message(i, v) for i, v in enumerate(values)],
+        })
+    
+    tables['data'] = df
+    return tables
+
+
+def export_to_tables(df: pd.DataFrame, errors: ErrorStore, output_path: str, output_format: str = 'csv'):
+    """Export hasil validasi ke CSV/Parquet/Feather, satu file per bagian laporan."""
+    output_path = Path(output_path)
+    ext = OUTPUT_FORMATS[output_format]
+    
+    print()
+    for name, table in build_report_tables(df, errors).items():
+        path = output_path.with_name(f"{output_path.stem}_{name}{ext}")
+        if output_format == 'csv':
+            table.to_csv(path, index=False)
+        elif output_format == 'parquet':
+            arrow_safe(table).to_parquet(path, index=False)
+        else:
+            arrow_safe(table).reset_index(drop=True).to_feather(path)
+        print(f"Laporan {name} disimpan ke: {path}")
+
+
+def excel_cell(value):
+    """Konversi nilai kosong pandas (NaN/NaT/NA) ke None agar bisa ditulis openpyxl."""
+    import pandas as pd
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+def is_csv_input(path) -> bool:
+    """Input dibaca sebagai CSV jika berekstensi .csv, selain itu sebagai Excel."""
+    return Path(path).suffix.lower() == '.csv'
+
+
+def read_input(path: str) -> pd.DataFrame:
+    """Baca seluruh file input (xlsx atau csv) ke DataFrame."""
+    import pandas as pd
+    if is_csv_input(path):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def iter_input_chunks(path: str, chunk_rows: int):
+    """
+    Baca file per chunk tanpa memuat seluruh sheet: xlsx via openpyxl read-only, csv via
+    pandas chunksize. Untuk xlsx, index chunk = nomor baris Excel - 2, jadi nomor baris di
+    laporan tetap benar walaupun baris kosong di-skip. Untuk csv, nomor baris menghitung
+    baris data saja (header = baris 1), sama seperti mode biasa: baris kosong yang di-skip
+    read_csv dan sel berisi baris baru tidak ikut dihitung.
+    """
+    import pandas as pd
+    if is_csv_input(path):
+        start = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+        return
+    
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+        width = len(columns)
+        batch, labels = [], []
+        for label, row in enumerate(rows):
+            if all(value is None for value in row):
+                continue
+            if len(row) != width:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+            batch.append(row)
+            labels.append(label)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=columns, index=labels, dtype=object).infer_objects()
+                batch, labels = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, index=labels, dtype=object).infer_objects()
+    finally:
+        wb.close()
+
+
+class StreamReport:
+    """
+    Laporan mode streaming: error setiap chunk langsung ditulis ke file (xlsx write-only atau
+    csv per bagian). Di memori hanya jumlah dan contoh error untuk console, jadi objek ini
+    bisa dipakai print_report seperti ErrorStore.
+    """
+    
+    PREVIEW = 30
+    SECTIONS = {'detail_error': 'Detail Error', 'data': 'Data'}
+    
+    def __init__(self, output_path: str, output_format: str):
+        self.output_path = Path(output_path) if output_path else None
+        self.output_format = output_format
+        self.headers = {'detail_error': ["Baris", "Kolom", "Nilai", "Rule", "Pesan"]}
+        self.total_rows = 0
+        self.error_rows = 0
+        self.problems = 0
+        self.preview = []
+        self.sections = {}
+        self.files = []
+        self.wb = None
+        if self.output_path:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            if output_format == 'xlsx':
+                from openpyxl import Workbook
+                self.wb = Workbook(write_only=True)
+                self.ws_summary = self.wb.create_sheet("Summary")
+    
+    def __len__(self) -> int:
+        return self.problems
+    
+    def __getitem__(self, key):
+        return self.preview[key]
+    
+    def error_row_count(self) -> int:
+        return self.error_rows
+    
+    def open_section(self, name: str, part: int = 1):
+        """Buat sheet (atau file csv) untuk satu bagian laporan beserta header-nya."""
+        if self.output_format == 'xlsx':
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import PatternFill, Font
+            title = self.SECTIONS[name]
+            ws = self.wb.create_sheet(title if part == 1 else f"{title} ({part})")
+            fill = PatternFill(start_color=COLOR_HEADER, end_color=COLOR_HEADER, fill_type="solid")
+            header = []
+            for value in self.headers[name]:
+                cell = WriteOnlyCell(ws, value=str(value))
+                cell.fill = fill
+                cell.font = Font(bold=True, color="FFFFFF")
+                header.append(cell)
+            ws.append(header)
+            self.sections[name] = {'sheet': ws, 'rows': 1, 'part': part}
+        else:
+            path = self.output_path.with_name(f"{self.output_path.stem}_{name}.csv")
+            handle = open(path, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(handle)
+            writer.writerow(self.headers[name])
+            self.sections[name] = {'file': handle, 'writer': writer}
+            self.files.append(path)
+    
+    def write(self, name: str, row: list, highlight: list = None):
+        """Tulis satu baris ke bagian laporan; highlight = flag per cell (hanya xlsx)."""
+        if name not in self.sections:
+            self.open_section(name)
+        section = self.sections[name]
+        if self.output_format != 'xlsx':
+            section['writer'].writerow(['' if excel_cell(value) is None else value for value in row])
+            return
+        
+        # Rollover ke sheet baru jika melebihi batas baris Excel
+        if section['rows'] >= EXCEL_MAX_ROWS:
+            self.open_section(name, section['part'] + 1)
+            section = self.sections[name]
+        if highlight and any(highlight):
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import PatternFill
+            fill = PatternFill(start_color=COLOR_ERROR, end_color=COLOR_ERROR, fill_type="solid")
+            cells = []
+            for value, flag in zip(row, highlight):
+                cell = WriteOnlyCell(section['sheet'], value=excel_cell(value))
+                if flag:
+                    cell.fill = fill
+                cells.append(cell)
+            row = cells
+        else:
+            row = [excel_cell(value) for value in row]
+        section['sheet'].append(row)
+        section['rows'] += 1
+    
+    def add(self, df: pd.DataFrame, errors: ErrorStore):
+        """Tambahkan hasil validasi satu chunk: jumlah, contoh, detail error, dan baris yang error."""
+        import numpy as np
+        import pandas as pd
+        self.total_rows += len(df)
+        self.error_rows += errors.error_row_count()
+        self.problems += len(errors)
+        self.preview.extend(errors[:self.PREVIEW - len(self.preview)])
+        if not self.output_path or not len(errors):
+            return
+        
+        values = errors.values()
+        for row, column, value, rule_type, position in zip(
+                errors.rows.tolist(), errors.column_names(), values,
+                errors.rule_names(), range(len(errors))):
+            self.write('detail_error', [row, column, str(value) if value is not None else '',
+                                        rule_type, errors.message(position, value)])
+        
+        # Sheet Data hanya berisi baris yang error (dengan nomor baris asli), bukan seluruh file
+        self.headers.setdefault('data', ['Baris'] + list(df.columns))
+        error_cells = errors.error_cells()
+        error_index = np.unique(errors.data['index'])
+        for idx, row in zip(error_index.tolist(), df.loc[error_index].itertuples(index=False)):
+            excel_row = idx + 2
+            self.write('data', [excel_row] + [str(val) if pd.notna(val) else '' for val in row],
+                       [False] + [(excel_row, col) in error_cells for col in df.columns])
+    
+    def save(self):
+        """Tulis ringkasan, lalu simpan/tutup file laporan."""
+        if not self.output_path:
+            return
+        rows = [
+            ('Total Baris', self.total_rows),
+            ('Valid', self.total_rows - self.error_rows),
+            ('Error', self.error_rows),
+            ('Total Masalah', self.problems),
+        ]
+        
+        if self.output_format == 'xlsx':
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font
+            title = WriteOnlyCell(self.ws_summary, value="Laporan Validasi Data")
+            title.font = Font(bold=True, size=14)
+            self.ws_summary.append([title])
+            self.ws_summary.append([])
+            for label, value in rows:
+                self.ws_summary.append([f"{label}:", value])
+            self.wb.save(self.output_path)
+            print(f"\nLaporan Excel disimpan ke: {self.output_path}")
+            return
+        
+        summary_path = self.output_path.with_name(f"{self.output_path.stem}_summary.csv")
+        with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Keterangan', 'Jumlah'])
+            writer.writerows(rows)
+        for section in self.sections.values():
+            section['file'].close()
+        print()
+        for path in [summary_path] + self.files:
+            print(f"Laporan {path.stem[len(self.output_path.stem) + 1:]} disimpan ke: {path}")
+
+
+def validate_streaming(input_file: str, rules: dict, output_file: str = None,
+                       output_format: str = 'xlsx', profiler: Profiler = None,
+                       max_errors: int = None, chunk_rows: int = CHUNK_ROWS) -> StreamReport:
+    """
+    Validasi file yang terlalu besar untuk memori, chunk demi chunk.
+    
+    Setiap chunk divalidasi lalu error-nya langsung ditulis ke laporan, jadi memori dibatasi
+    ukuran chunk (ditambah set nilai untuk rule unique), berapa pun jumlah barisnya.
+    """
+    profiler = profiler or Profiler()
+    print(f"Membaca file (streaming, {chunk_rows} baris per chunk): {input_file}")
+    
+    report = StreamReport(output_file, output_format)
+    validator = Validator(None, profiler)
+    active = None
+    # Baca, validasi, dan tulis laporan berjalan bergantian per chunk, jadi diukur sebagai satu tahap
+    with profiler.stage("read + validate + write"):
+        for chunk in iter_input_chunks(input_file, chunk_rows):
+            if active is None:
+                print(f"Kolom: {', '.join(chunk.columns)}")
+                print("\nMemvalidasi data...")
+                active = active_rules(rules, chunk.columns)
+            
+            if max_errors:
+                validator.max_errors = max_errors - report.problems
+            errors = validator.validate_chunk(chunk, active)
+            if validator.stopped:
+                errors.truncate(validator.max_errors)
+            report.add(chunk, errors)
+            if validator.stopped:
+                break
+    print(f"Total baris: {report.total_rows}")
+    
+    with profiler.stage("print report"):
+        print_report(report.total_rows, report)
+        if validator.stopped:
+            print(f"\nValidasi dihentikan di batas {max_errors} error "
+                  f"({report.total_rows} baris diperiksa)")
+    if output_file:
+        with profiler.stage("export"):
+            report.save()
+    return report
+
+
+def validate_data(input_file: str, rules: dict, output_file: str = None,
+                  output_format: str = 'xlsx', profiler: Profiler = None,
+                  max_errors: int = None, sample: float = None, stratify: str = None,
+                  streaming: bool = False, chunk_rows: int = CHUNK_ROWS) -> ErrorStore:
+    """Main function untuk validasi data (mode streaming mengembalikan StreamReport)."""
+    
+    profiler = profiler or Profiler()
     
     if not Path(input_file).exists():
         print(f"Error: File '{input_file}' tidak ditemukan")
         sys.exit(1)
     
+    if max_errors is not None and max_errors < 1:
+        print("Error: --max-errors minimal 1")
+        sys.exit(1)
+    
+    if sample is not None and sample <= 0:
+        print("Error: --sample harus lebih dari 0 (fraksi < 1 atau jumlah baris)")
+        sys.exit(1)
+    
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    
+    if streaming:
+        if sample is not None:
+            print("Error: Mode --sample tidak bisa digabung dengan mode streaming")
+            sys.exit(1)
+        if output_format not in ('xlsx', 'csv'):
+            print(f"Error: Mode streaming hanya mendukung output xlsx atau csv, bukan '{output_format}'")
+            sys.exit(1)
+        if chunk_rows < 1:
+            print("Error: --chunk-rows minimal 1")
+            sys.exit(1)
+        return validate_streaming(input_file, rules, output_file, output_format, profiler,
+                                  max_errors, chunk_rows)
+    
+    # pandas baru di-import setelah input valid, agar error input tetap cepat
+    import pandas as pd
+    
     print(f"Membaca file: {input_file}")
-    df = pd.read_excel(input_file)
+    with profiler.stage("read"):
+        df = read_input(input_file)
     print(f"Total baris: {len(df)}")
     print(f"Kolom: {', '.join(df.columns)}")
     
+    total_rows = len(df)
+    if sample is not None:
+        if stratify and stratify not in df.columns:
+            print(f"Error: Kolom strata '{stratify}' tidak ditemukan")
+            sys.exit(1)
+        with profiler.stage("sample"):
+            df = sample_rows(df, sample, stratify)
+        print(f"Sampel: {len(df)} baris" + (f" (strata: {stratify})" if stratify else ""))
+    
     print("\nMemvalidasi data...")
-    validator = Validator(df)
-    errors = validator.validate(rules)
+    validator = Validator(df, profiler, max_errors)
+    with profiler.stage("validate"):
+        errors = validator.validate(rules)
     
-    print_report(len(df), errors)
+    # Berhenti lebih awal: laporan hanya mencakup baris yang sudah diperiksa
+    if validator.stopped:
+        df = df.iloc[:validator.rows_checked]
+    errors.total_rows = len(df)
+    
+    with profiler.stage("print report"):
+        print_report(len(df), errors)
+        if validator.stopped:
+            print(f"\nValidasi dihentikan di batas {max_errors} error "
+                  f"({validator.rows_checked} dari {total_rows} baris diperiksa)")
+        if sample is not None and not validator.stopped and len(df) < total_rows:
+            print_sample_estimate(total_rows, len(df), errors)
     
     if output_file:
         Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-        export_to_excel(df, errors, output_file)
+        with profiler.stage("export"):
+            if output_format == 'xlsx':
+                export_to_excel(df, errors, output_file)
+            else:
+                export_to_tables(df, errors, output_file, output_format)
     
     return errors
 
 
+# Rules yang sudah di-compile di proses worker batch (diisi oleh init_batch_worker)
+_batch = {}
+
+
+def is_batch_input(input_file: str) -> bool:
+    """Input batch: folder atau pola glob (misal 'upload/*.xlsx')."""
+    path = Path(input_file)
+    # File yang ada selalu diproses sebagai satu file, walaupun namanya
+    # mengandung karakter glob (misal 'data[1].xlsx')
+    if path.is_file():
+        return False
+    return path.is_dir() or any(ch in input_file for ch in '*?[')
+
+
+def expand_inputs(input_file: str) -> list:
+    """Daftar file dari folder (*.xlsx dan *.csv) atau pola glob, terurut."""
+    if Path(input_file).is_dir():
+        paths = [p for p in Path(input_file).iterdir() if p.suffix.lower() in INPUT_SUFFIXES]
+    else:
+        paths = [Path(p) for p in glob.glob(input_file, recursive=True) if Path(p).is_file()]
+    # File lock Excel (~$nama.xlsx) bukan data
+    return sorted(p for p in paths if not p.name.startswith('~$'))
+
+
+def batch_report_paths(files: list, output_file: str, output_format: str) -> list:
+    """Path laporan per file di folder bernama sama dengan file ringkasan (nama unik)."""
+    if not output_file:
+        return [None] * len(files)
+    report_dir = Path(output_file).with_suffix('')
+    used = {}
+    paths = []
+    for path in files:
+        count = used[path.stem] = used.get(path.stem, 0) + 1
+        name = path.stem if count == 1 else f"{path.stem}_{count}"
+        paths.append(str(report_dir / f"{name}{OUTPUT_FORMATS[output_format]}"))
+    return paths
+
+
+def init_batch_worker(rules: dict) -> None:
+    """Import pandas/openpyxl dan simpan rules yang sudah di-compile, sekali per proses worker."""
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    _batch['rules'] = rules
+
+
+def validate_batch_file(input_file: str, report_file: str, output_format: str, options: dict) -> dict:
+    """Validasi satu file di proses worker; output console ditangkap, hasilnya berupa ringkasan."""
+    start = time.perf_counter()
+    log = io.StringIO()
+    result = {'file': input_file, 'report': report_file}
+    try:
+        with redirect_stdout(log):
+            errors = validate_data(input_file, _batch['rules'], report_file, output_format, **options)
+        result.update(status='ok', rows=errors.total_rows, error_rows=errors.error_row_count(),
+                      problems=len(errors))
+    except (SystemExit, Exception) as e:
+        messages = [line for line in log.getvalue().splitlines() if line.startswith('Error:')]
+        reason = messages[-1][len('Error: '):] if messages else f"{type(e).__name__}: {e}"
+        result.update(status='gagal', message=reason)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def print_batch_report(results: list, elapsed: float):
+    """Print ringkasan batch ke console."""
+    done = [r for r in results if r['status'] == 'ok']
+    failed = [r for r in results if r['status'] != 'ok']
+    
+    print("\n" + "=" * 50)
+    print("LAPORAN VALIDASI BATCH")
+    print("=" * 50)
+    
+    print(f"\nRingkasan:")
+    print(f"  Total file  : {len(results)} ({len(done)} berhasil, {len(failed)} gagal)")
+    print(f"  Total baris : {sum(r['rows'] for r in done)}")
+    print(f"  Error       : {sum(r['error_rows'] for r in done)} baris "
+          f"({sum(r['problems'] for r in done)} masalah)")
+    print(f"  Waktu       : {elapsed:.2f} s ({len(results) / elapsed:.1f} file/detik)")
+    
+    print(f"\n--- PER FILE ---")
+    for r in results[:30]:
+        name = Path(r['file']).name
+        if r['status'] == 'ok':
+            print(f"  {name}: {r['rows']} baris, {r['error_rows']} baris error ({r['problems']} masalah)")
+        else:
+            print(f"  {name}: GAGAL - {r['message']}")
+    if len(results) > 30:
+        print(f"  ... dan {len(results) - 30} file lainnya")
+
+
+def build_batch_tables(results: list, elapsed: float) -> dict:
+    """Susun ringkasan batch (keseluruhan dan per file) sebagai DataFrame."""
+    import pandas as pd
+    done = [r for r in results if r['status'] == 'ok']
+    total_rows = sum(r['rows'] for r in done)
+    error_rows = sum(r['error_rows'] for r in done)
+    return {
+        'ringkasan': pd.DataFrame({
+            'Keterangan': ['Total File', 'Berhasil', 'Gagal', 'Total Baris', 'Valid', 'Error',
+                           'Total Masalah', 'Waktu (s)', 'File/Detik'],
+            'Jumlah': [len(results), len(done), len(results) - len(done), total_rows,
+                       total_rows - error_rows, error_rows, sum(r['problems'] for r in done),
+                       round(elapsed, 2), round(len(results) / elapsed, 2)],
+        }),
+        'per_file': pd.DataFrame({
+            'File': [Path(r['file']).name for r in results],
+            'Status': [r['status'] for r in results],
+            'Total Baris': [r.get('rows') for r in results],
+            'Valid': [r['rows'] - r['error_rows'] if r['status'] == 'ok' else None for r in results],
+            'Error': [r.get('error_rows') for r in results],
+            'Total Masalah': [r.get('problems') for r in results],
+            'Waktu (s)': [round(r['seconds'], 3) for r in results],
+            'Keterangan': [r['report'] or '' if r['status'] == 'ok' else r['message'] for r in results],
+        }),
+    }
+
+
+def export_batch_summary(results: list, elapsed: float, output_path: str, output_format: str = 'xlsx'):
+    """Export ringkasan batch: workbook (sheet Ringkasan dan Per File) atau satu file per bagian."""
+    tables = build_batch_tables(results, elapsed)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if output_format != 'xlsx':
+        ext = OUTPUT_FORMATS[output_format]
+        print()
+        for name, table in tables.items():
+            path = output_path.with_name(f"{output_path.stem}_{name}{ext}")
+            if output_format == 'csv':
+                table.to_csv(path, index=False)
+            elif output_format == 'parquet':
+                table.to_parquet(path, index=False)
+            else:
+                table.to_feather(path)
+            print(f"Ringkasan {name} disimpan ke: {path}")
+        return
+    
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font
+    fill_error = PatternFill(start_color=COLOR_ERROR, end_color=COLOR_ERROR, fill_type="solid")
+    fill_header = PatternFill(start_color=COLOR_HEADER, end_color=COLOR_HEADER, fill_type="solid")
+    wb = Workbook()
+    wb.remove(wb.active)
+    
+    for title, table in [("Ringkasan", tables['ringkasan']), ("Per File", tables['per_file'])]:
+        ws = wb.create_sheet(title)
+        ws.append(list(table.columns))
+        for cell in ws[1]:
+            cell.fill = fill_header
+            cell.font = Font(bold=True, color="FFFFFF")
+        for row in table.itertuples(index=False):
+            ws.append([excel_cell(value) for value in row])
+    
+    # Highlight file yang punya error atau gagal divalidasi
+    ws = wb["Per File"]
+    for row_idx, r in enumerate(results, 2):
+        if r['status'] != 'ok' or r['error_rows']:
+            for cell in ws[row_idx]:
+                cell.fill = fill_error
+    
+    wb.save(output_path)
+    print(f"\nRingkasan batch disimpan ke: {output_path}")
+
+
+def validate_batch(input_pattern: str, rules: dict, output_file: str = None,
+                   output_format: str = 'xlsx', workers: int = None, options: dict = None,
+                   profiler: Profiler = None) -> list:
+    """
+    Validasi banyak file (folder atau glob) dengan rules yang sama, dibagi ke process pool.
+    
+    Setiap worker meng-import pandas dan menerima rules yang sudah di-compile sekali saat
+    dibuat, bukan per file. Hasil: laporan per file dan satu ringkasan gabungan.
+    """
+    profiler = profiler or Profiler()
+    options = options or {}
+    
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    
+    files = expand_inputs(input_pattern)
+    if not files:
+        print(f"Error: Tidak ada file .xlsx/.csv di '{input_pattern}'")
+        sys.exit(1)
+    
+    if workers is not None and workers < 1:
+        print("Error: --workers minimal 1")
+        sys.exit(1)
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    reports = batch_report_paths(files, output_file, output_format)
+    
+    print(f"Batch: {len(files)} file, {workers} worker")
+    results = [None] * len(files)
+    start = time.perf_counter()
+    with profiler.stage("validate batch"):
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                 initargs=(rules,)) as executor:
+            futures = {
+                executor.submit(validate_batch_file, str(path), report, output_format, options): i
+                for i, (path, report) in enumerate(zip(files, reports))
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                r = results[futures[future]] = future.result()
+                status = (f"{r['rows']} baris, {r['problems']} error" if r['status'] == 'ok'
+                          else f"GAGAL - {r['message']}")
+                print(f"  [{done}/{len(files)}] {Path(r['file']).name}: {status} ({r['seconds']:.2f} s)")
+    elapsed = time.perf_counter() - start
+    
+    with profiler.stage("print report"):
+        print_batch_report(results, elapsed)
+    if output_file:
+        with profiler.stage("export"):
+            export_batch_summary(results, elapsed, output_file, output_format)
+            print(f"Laporan per file disimpan di: {Path(output_file).with_suffix('')}")
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Validasi data Excel berdasarkan rules di config'
     )
-    parser.add_argument('input', nargs='?', help='File Excel input')
+    parser.add_argument('input', nargs='?',
+                        help='File input (xlsx/csv), atau folder/pola glob untuk validasi batch')
     parser.add_argument('--output', '-o', help='Export hasil ke file Excel')
+    parser.add_argument('--no-output', action='store_true',
+                        help='Hanya tampilkan hasil di console, tanpa file laporan')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS),
+                        help='Format laporan output (default: xlsx)')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Berhenti di error pertama (sama dengan --max-errors 1)')
+    parser.add_argument('--max-errors', type=int,
+                        help='Berhenti setelah N error ditemukan')
+    parser.add_argument('--sample', type=float,
+                        help='Validasi sampel acak berstrata: fraksi (< 1) atau jumlah baris')
+    parser.add_argument('--stratify', help='Kolom strata untuk --sample (default: posisi baris)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Baca dan validasi per chunk untuk file yang terlalu besar untuk memori')
+    parser.add_argument('--chunk-rows', type=int,
+                        help=f'Jumlah baris per chunk mode streaming (default: {CHUNK_ROWS})')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Jumlah proses worker validasi batch (default: jumlah CPU)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tampilkan durasi dan memori setiap tahap')
+    parser.add_argument('--profile-output', help='Simpan profil ke file JSON')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Format file profil: json atau chrome (trace event)')
     parser.add_argument('--config', '-c', default='config.yaml', help='File konfigurasi YAML')
     
     args = parser.parse_args()
@@ -371,8 +1592,16 @@ def main():
     
     # Override dengan CLI
     input_file = args.input or config.get('input')
-    output_file = args.output or config.get('output')
-    rules = config.get('rules', {})
+    output_file = None if args.no_output else args.output or config.get('output')
+    output_format = args.output_format or config.get('output_format', 'xlsx')
+    rules = resolve_lookup_files(config.get('rules', {}), script_dir)
+    fail_fast = args.fail_fast or config.get('fail_fast', False)
+    max_errors = 1 if fail_fast else args.max_errors if args.max_errors is not None else config.get('max_errors')
+    sample = args.sample if args.sample is not None else config.get('sample')
+    stratify = args.stratify or config.get('stratify')
+    streaming = args.streaming or config.get('streaming', False)
+    chunk_rows = args.chunk_rows or config.get('chunk_rows', CHUNK_ROWS)
+    workers = args.workers or config.get('workers')
     
     # Resolve path
     if input_file and not Path(input_file).is_absolute():
@@ -390,7 +1619,22 @@ def main():
         print("Error: Rules validasi harus didefinisikan di config.yaml")
         sys.exit(1)
     
-    validate_data(input_file, rules, output_file)
+    profiler = Profiler(enabled=args.profile or bool(args.profile_output))
+    with profiler.stage("compile rules"):
+        rules = compile_rules(rules)
+    
+    if is_batch_input(input_file):
+        options = {'max_errors': max_errors, 'sample': sample, 'stratify': stratify,
+                   'streaming': streaming, 'chunk_rows': chunk_rows}
+        validate_batch(input_file, rules, output_file, output_format, workers, options, profiler)
+    else:
+        validate_data(input_file, rules, output_file, output_format, profiler,
+                      max_errors, sample, stratify, streaming, chunk_rows)
+    
+    if args.profile:
+        profiler.print_report()
+    if args.profile_output:
+        profiler.export(args.profile_output, args.profile_format)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ Generate sample data untuk testing Data Validator
 Data sengaja dibuat dengan berbagai error untuk testing
 """
 
+import random
 import pandas as pd
 from pathlib import Path
 
@@ -120,7 +121,13 @@ def generate_sample_data():
     
     df.to_excel(output_path, index=False)
     
+    # Master data untuk contoh rule lookup: NIK baris 11 sengaja tidak terdaftar
+    master = pd.DataFrame({'NIK': [nik for nik in data['NIK'] if nik != '3201234567890011']})
+    master_path = output_path.parent / 'master_penduduk.xlsx'
+    master.to_excel(master_path, index=False)
+    
     print(f"Sample data berhasil dibuat: {output_path}")
+    print(f"Master data (rule lookup): {master_path}")
     print(f"Total baris: {len(df)}")
     
     print("\nError yang sengaja dibuat:")
@@ -136,5 +143,63 @@ def generate_sample_data():
     print("  - Baris 5, 8: Status tidak valid")
 
 
+
+def generate_scaled_data(num_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate data pendaftaran dalam jumlah besar (untuk benchmark).
+    
+    Rasio error per kolom mengikuti sample (12 baris): misal nama kosong
+    2/12, email tidak valid 2/12, NIK salah 3/12, status tidak valid 2/12.
+    """
+    rng = random.Random(seed)
+    nama_list = ['Budi Santoso', 'Dewi Lestari', 'Ahmad Dahlan', 'Siti Nurhaliza', 'Rudi Hartono',
+                 'Maya Sari', 'Joko Widodo', 'Andi Pratama', 'Rina Susanti', 'Citra Dewi']
+    
+    def chance(count):
+        return rng.random() < count / 12
+    
+    rows = []
+    for i in range(num_rows):
+        nama = rng.choice(nama_list)
+        user = nama.split()[0].lower()
+        
+        if chance(1):
+            email = ''
+        elif chance(2):
+            email = rng.choice([f'{user}@email', f'{user}@@email.com'])
+        else:
+            email = f'{user}{i}@email.com'
+        
+        if chance(1):
+            tanggal = f'{rng.randint(1920, 1949)}-01-01'
+        elif chance(2):
+            tanggal = f'{rng.randint(2011, 2023)}-06-10'
+        else:
+            tanggal = f'{rng.randint(1950, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+        
+        if chance(1):
+            umur = rng.randint(5, 16)
+        elif chance(1):
+            umur = rng.randint(66, 90)
+        else:
+            umur = rng.randint(17, 65)
+        
+        nik = f'3201{rng.randint(0, 999999999999):012d}'
+        if chance(3):
+            nik = rng.choice([nik[:12], nik + '7', nik[:6] + 'ABC' + nik[9:]])
+        
+        rows.append({
+            'Nama Lengkap': rng.choice(['', None]) if chance(2) else nama,
+            'Email': email,
+            'No HP': f'0812{rng.randint(0, 9999):04d}' if chance(2) else f'0812{rng.randint(0, 99999999):08d}',
+            'Tanggal Lahir': tanggal,
+            'Umur': umur,
+            'NIK': nik,
+            'Status': rng.choice(['Tidak Valid', 'Batal']) if chance(2)
+                      else rng.choice(['Aktif', 'Nonaktif', 'Pending']),
+        })
+    return pd.DataFrame(rows)
+
+
 if __name__ == "__main__":
     generate_sample_data()
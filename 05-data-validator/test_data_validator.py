@@ -0,0 +1,64 @@
+"""
+Test data_validator. Jalankan dari folder ini:
+
+    python -m pytest -q
+"""
+
+import pandas as pd
+
+import data_validator as dv
+
+
+RULES = {
+    'Email': [{'type': 'required'}, {'type': 'email'}],
+}
+
+
+def test_batch_reads_csv_and_xlsx(tmp_path):
+    """Batch folder berisi .csv dan .xlsx: keduanya terbaca, bukan gagal sebagai Excel."""
+    data = pd.DataFrame({'Nama': ['Andi', 'Budi', 'Citra'], 'Email': ['a@contoh.com', 'salah', None]})
+    data.to_csv(tmp_path / 'a.csv', index=False)
+    data.to_excel(tmp_path / 'b.xlsx', index=False)
+    
+    results = dv.validate_batch(str(tmp_path), dv.compile_rules(RULES), workers=1)
+    
+    assert [r['status'] for r in results] == ['ok', 'ok']
+    assert [(r['rows'], r['error_rows']) for r in results] == [(3, 2), (3, 2)]
+
+
+def test_single_csv_input(tmp_path):
+    """File .csv tunggal dibaca dengan read_csv."""
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'Email': ['a@contoh.com', 'salah']}).to_csv(path, index=False)
+    
+    errors = dv.validate_data(str(path), dv.compile_rules(RULES))
+    
+    assert errors.total_rows == 2
+    assert errors.rows.tolist() == [3]
+
+
+def test_ambiguous_dates_do_not_depend_on_row_order():
+    """'01/02/2024' dibaca sama walaupun cell pertama kolom hanya valid sebagai hari-bulan."""
+    values = pd.Series(['13/02/2024', '01/02/2024', '2024-03-04', 'bukan tanggal'], dtype=object)
+    
+    dates, invalid = dv.coerce_dates(values)
+    assert dates.tolist()[:3] == [pd.Timestamp(2024, 2, 13), pd.Timestamp(2024, 1, 2),
+                                  pd.Timestamp(2024, 3, 4)]
+    assert invalid.tolist() == [False, False, False, True]
+    assert dv.coerce_dates(values[::-1])[0][1] == pd.Timestamp(2024, 1, 2)
+    
+    dates, invalid = dv.coerce_dates(values, dayfirst=True)
+    assert dates.tolist()[:3] == [pd.Timestamp(2024, 2, 13), pd.Timestamp(2024, 2, 1),
+                                  pd.Timestamp(2024, 3, 4)]
+
+
+def test_date_range_dayfirst_rule():
+    """Opsi dayfirst per rule menentukan hasil rule date_range untuk tanggal ambigu."""
+    df = pd.DataFrame({'Tanggal': ['13/02/2024', '01/02/2024']})
+    rule = {'type': 'date_range', 'min': '2024-01-15'}
+    
+    errors = dv.Validator(df).validate({'Tanggal': [rule]})
+    assert errors.rows.tolist() == [3]
+    
+    errors = dv.Validator(df).validate({'Tanggal': [{**rule, 'dayfirst': True}]})
+    assert len(errors) == 0
@@ -0,0 +1,346 @@
+"""
+Benchmark - Mengukur performa semua utility dengan data sintetis skala besar
+Dataset dibuat dari generate_sample.py masing-masing utility
+Mode --startup mengukur waktu start script (python -X importtime)
+"""
+
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import multiprocessing
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# load_module dipakai bersama benchmark, worker, dan watcher (folder common/)
+sys.path.insert(0, str(ROOT_DIR))
+from common.utilities import load_module  # noqa: E402
+
+# Nama tool -> (folder utility, modul utama, fungsi entry point)
+TOOLS = {
+    'merge': ('01-merge-excel', 'merge_excel', 'merge_excel_files'),
+    'clean': ('02-data-cleaner', 'data_cleaner', 'clean_data'),
+    'split': ('03-excel-splitter', 'excel_splitter', 'split_excel'),
+    'compare': ('04-excel-comparator', 'excel_comparator', 'compare_excel'),
+    'validate': ('05-data-validator', 'data_validator', 'validate_data'),
+}
+
+# Kasus pengukuran waktu start: (label, folder, script, argumen)
+# {input} diganti dengan path dataset validate
+STARTUP_CASES = [
+    ('merge --help', '01-merge-excel', 'merge_excel.py', ['--help']),
+    ('clean --help', '02-data-cleaner', 'data_cleaner.py', ['--help']),
+    ('split --help', '03-excel-splitter', 'excel_splitter.py', ['--help']),
+    ('compare --help', '04-excel-comparator', 'excel_comparator.py', ['--help']),
+    ('validate --help', '05-data-validator', 'data_validator.py', ['--help']),
+    ('validate tanpa laporan', '05-data-validator', 'data_validator.py', ['{input}', '--no-output']),
+]
+
+# Kenaikan waktu (relatif) terhadap run sebelumnya yang dianggap regresi
+REGRESSION_THRESHOLD = 0.2
+
+
+def prepare_dataset(tool: str, rows: int, data_dir: Path, seed: int) -> dict:
+    """
+    Buat dataset untuk satu tool (di-cache per tool/jumlah baris/seed).
+    
+    Returns:
+        dict argumen untuk entry point tool
+    """
+    folder = TOOLS[tool][0]
+    work_dir = data_dir / f"{tool}_{rows}_{seed}"
+    out_dir = work_dir / 'output'
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ready = work_dir / '.ready'
+    generator = load_module(folder, 'generate_sample')
+    
+    if tool == 'merge':
+        input_dir = work_dir / 'input'
+        if not ready.exists():
+            generator.random.seed(seed)
+            generator.generate_branch_files(input_dir, rows)
+        args = {'input_folder': str(input_dir), 'output_file': str(out_dir / 'hasil_gabungan.xlsx')}
+    
+    elif tool == 'clean':
+        input_file = work_dir / 'data_kotor.xlsx'
+        if not ready.exists():
+            generator.generate_dirty_data_scaled(rows, seed).to_excel(input_file, index=False)
+        # Pakai aturan cleaning dari config.yaml utility, dengan path absolut
+        tool_config = load_module(folder, 'data_cleaner').load_config(ROOT_DIR / folder / 'config.yaml')
+        tool_config['input'] = str(input_file)
+        tool_config['output'] = str(out_dir / 'data_bersih.xlsx')
+        config_path = work_dir / 'config.yaml'
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(tool_config, f)  # JSON adalah subset YAML
+        args = {'config_path': str(config_path)}
+    
+    elif tool == 'split':
+        input_file = work_dir / 'laporan_nasional.xlsx'
+        if not ready.exists():
+            generator.random.seed(seed)
+            generator.build_sample_data(rows).to_excel(input_file, index=False)
+        args = {'input_file': str(input_file), 'split_by': 'Cabang', 'output_folder': str(out_dir)}
+    
+    elif tool == 'compare':
+        file_old, file_new = work_dir / 'data_lama.xlsx', work_dir / 'data_revisi.xlsx'
+        if not ready.exists():
+            df_old, df_new = generator.generate_comparison_pair(rows, seed)
+            df_old.to_excel(file_old, index=False)
+            df_new.to_excel(file_new, index=False)
+        args = {'file_old': str(file_old), 'file_new': str(file_new), 'key_column': 'No',
+                'output_file': str(out_dir / 'laporan_perbandingan.xlsx')}
+    
+    else:
+        input_file = work_dir / 'data_pendaftaran.xlsx'
+        if not ready.exists():
+            generator.generate_scaled_data(rows, seed).to_excel(input_file, index=False)
+        tool_config = load_module(folder, 'data_validator').load_config(ROOT_DIR / folder / 'config.yaml')
+        args = {'input_file': str(input_file), 'rules': tool_config.get('rules', {}),
+                'output_file': str(out_dir / 'validation_report.xlsx')}
+    
+    ready.touch()
+    return args
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS proses ini dalam MB (None jika tidak tersedia)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1024 ** 2) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_tool(tool: str, args: dict, conn) -> None:
+    """Jalankan entry point tool di proses terpisah dan kirim hasil ukur lewat pipe."""
+    folder, module_name, func_name = TOOLS[tool]
+    func = getattr(load_module(folder, module_name), func_name)
+    
+    error = None
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):
+            func(**args)
+    except SystemExit as e:
+        error = f"SystemExit({e.code})"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+    
+    conn.send({'wall_s': wall, 'peak_rss_mb': peak_rss_mb(), 'error': error})
+    conn.close()
+
+
+def measure(tool: str, args: dict) -> dict:
+    """Ukur satu run tool; setiap run di proses baru agar peak RSS tidak tercampur."""
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=run_tool, args=(tool, args, child_conn))
+    start = time.perf_counter()
+    proc.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        # Proses mati sebelum mengirim hasil (misal gagal import atau di-kill karena OOM)
+        result = None
+    proc.join()
+    if result is None:
+        result = {'wall_s': time.perf_counter() - start, 'peak_rss_mb': None,
+                  'error': f"proses berhenti tanpa hasil (exit code {proc.exitcode})"}
+    return result
+
+
+def measure_startup(folder: str, script: str, args: list) -> dict:
+    """Jalankan script dengan python -X importtime, hitung wall time dan total waktu import."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', script, *args],
+                          cwd=ROOT_DIR / folder, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    
+    # Format baris stderr: "import time: <self us> | <cumulative us> | <modul>"
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        if self_us.strip().isdigit():
+            modules[name.strip()] = int(self_us)
+    
+    return {
+        'wall_s': wall,
+        'import_s': sum(modules.values()) / 1e6,
+        'modules': len(modules),
+        'heavy': [name for name in ['pandas', 'openpyxl', 'yaml', 'dateutil']
+                  if any(m == name or m.startswith(name + '.') for m in modules)],
+        'error': None if proc.returncode == 0 else f"exit code {proc.returncode}",
+    }
+
+
+def run_startup(repeat: int = 3, seed: int = 42, data_dir: str = None) -> list:
+    """Ukur waktu start setiap utility (--help dan validasi tanpa laporan)."""
+    data_dir = Path(data_dir) if data_dir else Path(__file__).parent / 'output' / 'data'
+    input_file = prepare_dataset('validate', 1000, data_dir, seed)['input_file']
+    
+    print(f"\n{'Kasus':<24} {'Waktu (s)':>10} {'Import (s)':>11} {'Modul':>6}  Library berat")
+    print("-" * 80)
+    
+    results = []
+    for label, folder, script, args in STARTUP_CASES:
+        args = [arg.replace('{input}', input_file) for arg in args]
+        runs = [measure_startup(folder, script, args) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r['wall_s'])
+        results.append({'case': label, **best})
+        
+        if best['error']:
+            print(f"{label:<24}  GAGAL: {best['error']}")
+        else:
+            print(f"{label:<24} {best['wall_s']:>10.3f} {best['import_s']:>11.3f} {best['modules']:>6}  "
+                  f"{', '.join(best['heavy']) or '-'}")
+    
+    return results
+
+
+def load_history(history_file: Path) -> list:
+    """Load riwayat benchmark dari file JSON."""
+    if history_file.exists():
+        with open(history_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return []
+
+
+def previous_result(history: list, tool: str, rows: int) -> dict:
+    """Cari hasil terakhir untuk tool dan jumlah baris yang sama."""
+    for run in reversed(history):
+        for result in run['results']:
+            if result['tool'] == tool and result['rows'] == rows and not result.get('error'):
+                return result
+    return None
+
+
+def print_table(results: list, history: list) -> int:
+    """Print tabel hasil benchmark, return jumlah regresi yang terdeteksi."""
+    print(f"\n{'Tool':<10} {'Baris':>10} {'Waktu (s)':>10} {'Peak RSS (MB)':>14} {'Baris/detik':>12}  Vs. sebelumnya")
+    print("-" * 80)
+    
+    regressions = 0
+    for r in results:
+        if r.get('error'):
+            print(f"{r['tool']:<10} {r['rows']:>10}  GAGAL: {r['error']}")
+            continue
+        
+        rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else '-'
+        delta = ''
+        prev = previous_result(history, r['tool'], r['rows'])
+        if prev:
+            change = (r['wall_s'] - prev['wall_s']) / prev['wall_s']
+            delta = f"{change:+.1%}"
+            if change > REGRESSION_THRESHOLD:
+                delta += "  <- REGRESI"
+                regressions += 1
+        print(f"{r['tool']:<10} {r['rows']:>10} {r['wall_s']:>10.2f} {rss:>14} {r['rows_per_sec']:>12.0f}  {delta}")
+    
+    return regressions
+
+
+def package_versions() -> dict:
+    """Versi library utama yang mempengaruhi performa."""
+    versions = {}
+    for name in ['pandas', 'numpy', 'openpyxl', 'yaml', 'dateutil', 'pyarrow']:
+        try:
+            versions[name] = getattr(__import__(name), '__version__', '?')
+        except ImportError:
+            versions[name] = None
+    return versions
+
+
+def run_benchmark(tools: list, row_counts: list, repeat: int = 1, seed: int = 42,
+                  history_file: str = None, data_dir: str = None) -> list:
+    """Main function untuk menjalankan benchmark."""
+    script_dir = Path(__file__).parent
+    data_dir = Path(data_dir) if data_dir else script_dir / 'output' / 'data'
+    history_file = Path(history_file) if history_file else script_dir / 'output' / 'history.json'
+    
+    results = []
+    for rows in row_counts:
+        for tool in tools:
+            print(f"Menyiapkan data {tool} ({rows} baris)...")
+            args = prepare_dataset(tool, rows, data_dir, seed)
+            
+            # Ambil run tercepat dari beberapa pengulangan
+            runs = [measure(tool, args) for _ in range(repeat)]
+            ok_runs = [r for r in runs if not r['error']]
+            best = min(ok_runs, key=lambda r: r['wall_s']) if ok_runs else runs[0]
+            
+            results.append({
+                'tool': tool,
+                'rows': rows,
+                'wall_s': round(best['wall_s'], 4),
+                'peak_rss_mb': round(best['peak_rss_mb'], 1) if best['peak_rss_mb'] is not None else None,
+                'rows_per_sec': round(rows / best['wall_s'], 1) if best['wall_s'] > 0 else None,
+                'error': best['error'],
+            })
+            print(f"  {tool}: {best['wall_s']:.2f} detik")
+    
+    history = load_history(history_file)
+    regressions = print_table(results, history)
+    
+    history.append({
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': package_versions(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    })
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    
+    print(f"\nHasil disimpan ke: {history_file}")
+    if regressions:
+        print(f"Peringatan: {regressions} tool lebih lambat > {REGRESSION_THRESHOLD:.0%} dari run sebelumnya")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark performa semua utility dengan data sintetis'
+    )
+    parser.add_argument('--rows', '-r', type=int, nargs='+', default=[10_000],
+                        help='Jumlah baris dataset, bisa lebih dari satu (default: 10000)')
+    parser.add_argument('--tools', '-t', nargs='+', choices=list(TOOLS), default=list(TOOLS),
+                        help='Tool yang di-benchmark (default: semua)')
+    parser.add_argument('--repeat', type=int,
+                        help='Jumlah pengulangan per tool, diambil yang tercepat (default: 1, atau 3 untuk --startup)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed random untuk data sintetis')
+    parser.add_argument('--history', help='File JSON riwayat benchmark (default: output/history.json)')
+    parser.add_argument('--data-dir', help='Folder cache dataset (default: output/data)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Ukur waktu start script (python -X importtime), bukan waktu proses data')
+    
+    args = parser.parse_args()
+    if args.repeat is not None and args.repeat < 1:
+        print("Error: --repeat minimal 1")
+        sys.exit(1)
+    if args.startup:
+        run_startup(args.repeat or 3, args.seed, args.data_dir)
+        return
+    run_benchmark(args.tools, args.rows, args.repeat or 1, args.seed, args.history, args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
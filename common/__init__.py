@@ -0,0 +1 @@
+"""Helper bersama untuk benchmark, worker, dan watcher (bukan untuk utility 01-05)."""
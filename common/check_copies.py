@@ -0,0 +1,85 @@
+"""
+Check Copies - Pastikan helper yang disalin ke setiap utility masih identik
+
+Setiap folder utility (01-05) sengaja berdiri sendiri: bisa disalin dan dipakai
+tanpa folder lain, jadi helper seperti Profiler tidak di-import dari modul bersama
+melainkan disalin. Script ini membandingkan salinannya (lewat AST, tanpa import
+pandas) agar perbaikan di satu utility tidak lupa diterapkan ke yang lain.
+"""
+
+import ast
+import sys
+import argparse
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Script utama setiap utility
+UTILITY_SCRIPTS = [
+    '01-merge-excel/merge_excel.py',
+    '02-data-cleaner/data_cleaner.py',
+    '03-excel-splitter/excel_splitter.py',
+    '04-excel-comparator/excel_comparator.py',
+    '05-data-validator/data_validator.py',
+]
+
+# Helper yang harus sama persis di setiap utility yang mendefinisikannya
+SHARED_HELPERS = ['Profiler', 'arrow_safe', 'excel_cell', 'OUTPUT_FORMATS', 'EXCEL_MAX_ROWS']
+
+
+def top_level_definitions(path: Path) -> dict:
+    """Mapping nama -> source (hasil ast.unparse, tanpa komentar) definisi level modul."""
+    tree = ast.parse(path.read_text(encoding='utf-8'))
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            definitions[node.name] = ast.unparse(node)
+        elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            definitions[node.targets[0].id] = ast.unparse(node)
+    return definitions
+
+
+def check_copies(helpers: list = None) -> list:
+    """Return list nama helper yang salinannya berbeda antar utility."""
+    helpers = helpers or SHARED_HELPERS
+    definitions = {script: top_level_definitions(ROOT_DIR / script) for script in UTILITY_SCRIPTS}
+    
+    mismatched = []
+    for name in helpers:
+        versions = {}
+        for script, defs in definitions.items():
+            if name in defs:
+                versions.setdefault(defs[name], []).append(script)
+        
+        if not versions:
+            print(f"  {name}: tidak ditemukan di utility mana pun")
+            mismatched.append(name)
+        elif len(versions) == 1:
+            scripts = next(iter(versions.values()))
+            print(f"  {name}: sama di {len(scripts)} utility")
+        else:
+            print(f"  {name}: BERBEDA ({len(versions)} versi)")
+            for number, scripts in enumerate(versions.values(), 1):
+                print(f"    versi {number}: {', '.join(scripts)}")
+            mismatched.append(name)
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Cek helper yang disalin ke setiap utility (Profiler, arrow_safe, dst.) masih identik'
+    )
+    parser.add_argument('helpers', nargs='*', help=f"Nama helper (default: {', '.join(SHARED_HELPERS)})")
+    args = parser.parse_args()
+    
+    print("Cek salinan helper antar utility:")
+    mismatched = check_copies(args.helpers)
+    if mismatched:
+        print(f"\nError: {len(mismatched)} helper tidak identik, samakan semua salinannya")
+        sys.exit(1)
+    print("\nSemua salinan identik.")
+
+
+if __name__ == "__main__":
+    main()
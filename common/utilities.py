@@ -0,0 +1,18 @@
+"""
+Akses ke utility 01-05 dari benchmark, worker, dan watcher
+"""
+
+import importlib.util
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_module(folder: str, name: str):
+    """Import modul dari folder utility (nama folder diawali angka, jadi tidak bisa import biasa)."""
+    path = ROOT_DIR / folder / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"{folder.replace('-', '_')}_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,493 @@
+"""
+Watcher - Memantau folder laporan cabang, validasi dan gabungkan file yang masuk
+File baru atau berubah diproses sendiri, tanpa memproses ulang seluruh folder
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import struct
+import asyncio
+import argparse
+import ctypes
+import ctypes.util
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# load_module dipakai bersama benchmark, worker, dan watcher (folder common/)
+sys.path.insert(0, str(ROOT_DIR))
+from common.utilities import load_module  # noqa: E402
+
+# Format output gabungan yang didukung beserta ekstensi filenya: sama dengan Merge Excel,
+# yang menulis file gabungannya (merge_excel hanya import library standar saat di-load)
+OUTPUT_FORMATS = load_module('01-merge-excel', 'merge_excel').OUTPUT_FORMATS
+
+# Event inotify (lihat <sys/inotify.h>)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# Header event inotify: wd, mask, cookie, panjang nama
+EVENT_HEADER = struct.Struct('iIII')
+
+# Berapa kali file yang gagal dibaca (misal masih disalin) dicoba ulang
+MAX_RETRIES = 3
+
+# State (file yang sudah diproses) dan cache DataFrame per file, disimpan di folder output
+STATE_DIRNAME = '.watch'
+STATE_FILENAME = 'state.json'
+
+# Modul utility di proses worker (diisi oleh init_worker)
+_modules = {}
+
+
+def load_config(config_path: str) -> dict:
+    """Load konfigurasi dari file YAML."""
+    import yaml
+    config_file = Path(config_path)
+    if config_file.exists():
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    return {}
+
+
+def init_worker() -> None:
+    """Import Merge Excel dan Data Validator sekali saat proses worker dibuat."""
+    # Utility meng-import pandas/openpyxl secara lazy, di-load di awal agar file pertama tidak menunggu
+    importlib.import_module('pandas')
+    importlib.import_module('openpyxl')
+    _modules['merge'] = load_module('01-merge-excel', 'merge_excel')
+    _modules['validator'] = load_module('05-data-validator', 'data_validator')
+
+
+def process_file(path: str, rules: dict) -> dict:
+    """Baca dan validasi satu file cabang (dijalankan di proses worker)."""
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        df = _modules['merge'].read_branch_file(Path(path))
+        errors = _modules['validator'].Validator(df).validate(rules).records() if rules else []
+    return {'data': df, 'errors': errors, 'parse_s': time.perf_counter() - start}
+
+
+def is_branch_file(name: str) -> bool:
+    """File Excel yang diproses (file lock Excel "~$..." diabaikan)."""
+    return name.endswith('.xlsx') and not name.startswith('~$')
+
+
+class InotifyWatcher:
+    """Pantau folder dengan inotify (Linux), event dibaca langsung oleh event loop asyncio."""
+    
+    def __init__(self, folder: Path, callback):
+        self.folder = folder
+        self.callback = callback
+        self.fd = None
+    
+    def start(self, loop) -> None:
+        """Daftarkan watch inotify ke event loop."""
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 gagal")
+        if libc.inotify_add_watch(fd, os.fsencode(self.folder), WATCH_MASK) < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch gagal")
+        self.fd = fd
+        self.loop = loop
+        loop.add_reader(fd, self._read_events)
+    
+    def _read_events(self) -> None:
+        """Baca event inotify yang masuk dan teruskan nama filenya."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if is_branch_file(name):
+                self.callback(name)
+    
+    def stop(self) -> None:
+        """Hentikan watch inotify."""
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            os.close(self.fd)
+            self.fd = None
+
+
+class PollingWatcher:
+    """Pantau folder dengan scan berkala (untuk OS tanpa inotify atau network drive)."""
+    
+    def __init__(self, folder: Path, callback, interval: float = 2.0):
+        self.folder = folder
+        self.callback = callback
+        self.interval = interval
+        self.task = None
+    
+    def scan(self) -> dict:
+        """Snapshot nama file -> (mtime, size)."""
+        snapshot = {}
+        for path in self.folder.glob('*.xlsx'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if is_branch_file(path.name):
+                snapshot[path.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def start(self, loop) -> None:
+        """Mulai scan berkala di event loop."""
+        self.task = loop.create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Bandingkan snapshot folder setiap interval."""
+        snapshot = self.scan()
+        while True:
+            await asyncio.sleep(self.interval)
+            current = self.scan()
+            for name in set(snapshot) | set(current):
+                if snapshot.get(name) != current.get(name):
+                    self.callback(name)
+            snapshot = current
+    
+    def stop(self) -> None:
+        """Hentikan scan berkala."""
+        if self.task:
+            self.task.cancel()
+
+
+def create_watcher(folder: Path, callback, polling: bool = False, interval: float = 2.0, loop=None):
+    """Pakai inotify jika tersedia, selain itu fallback ke polling."""
+    if not polling and sys.platform.startswith('linux'):
+        watcher = InotifyWatcher(folder, callback)
+        try:
+            watcher.start(loop)
+            return watcher, 'inotify'
+        except (OSError, AttributeError) as e:
+            print(f"Peringatan: inotify tidak tersedia ({e}), pakai polling")
+    
+    watcher = PollingWatcher(folder, callback, interval)
+    watcher.start(loop)
+    return watcher, f'polling setiap {interval:g} detik'
+
+
+class WatchService:
+    """Debounce event file, proses di pool worker, lalu update file gabungan dan laporan validasi."""
+    
+    def __init__(self, input_folder: str, output_file: str, output_format: str = 'csv',
+                 rules: dict = None, workers: int = 2, debounce: float = 2.0):
+        self.folder = Path(input_folder)
+        self.output_format = output_format
+        self.output_path = Path(output_file).with_suffix(OUTPUT_FORMATS[output_format])
+        self.rules = rules or {}
+        self.workers = workers
+        self.debounce = debounce
+        
+        self.state_dir = self.output_path.parent / STATE_DIRNAME
+        self.cache_dir = self.state_dir / 'cache'
+        self.report_dir = self.output_path.parent / 'validasi'
+        self.state_file = self.state_dir / STATE_FILENAME
+        
+        self.merge = load_module('01-merge-excel', 'merge_excel')
+        self.state = self.load_state()
+        self.frames = {}         # nama file -> DataFrame yang sudah diproses
+        self.timers = {}         # nama file -> timer debounce
+        self.first_seen = {}     # nama file -> waktu event pertama (untuk latency)
+        self.retries = {}
+        self.busy = set()        # file yang sedang diproses
+        self.dirty = set()       # file yang berubah lagi saat diproses
+        self.rewrite_needed = False
+    
+    def load_state(self) -> dict:
+        """State run sebelumnya (file yang sudah diproses)."""
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'files': {}, 'columns': None}
+    
+    def save_state(self) -> None:
+        """Simpan state ke folder output."""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+    
+    def cache_path(self, name: str) -> Path:
+        """Path cache DataFrame hasil proses satu file."""
+        return self.cache_dir / f"{name}.pkl"
+    
+    def schedule(self, name: str) -> None:
+        """Jadwalkan file diproses setelah tidak ada event selama `debounce` detik."""
+        self.first_seen.setdefault(name, time.time())
+        timer = self.timers.pop(name, None)
+        if timer:
+            timer.cancel()
+        self.timers[name] = self.loop.call_later(self.debounce, self.enqueue, name)
+    
+    def enqueue(self, name: str) -> None:
+        """Masukkan file ke antrian proses (dipanggil setelah debounce)."""
+        self.timers.pop(name, None)
+        self.queue.put_nowait(name)
+    
+    def restore(self) -> None:
+        """Load hasil run sebelumnya dan jadwalkan hanya file yang baru, berubah, atau hilang."""
+        import pandas as pd
+        
+        current = {p.name: p.stat() for p in self.folder.glob('*.xlsx') if is_branch_file(p.name)}
+        for name, entry in list(self.state['files'].items()):
+            stat = current.get(name)
+            cache = self.cache_path(name)
+            if stat and cache.exists() and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                self.frames[name] = pd.read_pickle(cache)
+            else:
+                self.schedule(name)
+        
+        for name in current:
+            if name not in self.frames:
+                self.schedule(name)
+        
+        if self.frames and not self.output_path.exists():
+            self.rewrite_needed = True
+        
+        print(f"{len(self.frames)} file sudah diproses sebelumnya, {len(self.timers)} file dijadwalkan")
+    
+    async def consume(self) -> None:
+        """Ambil file dari antrian dan proses; file yang sama tidak diproses bersamaan."""
+        while True:
+            name = await self.queue.get()
+            try:
+                if name in self.busy:
+                    self.dirty.add(name)
+                    continue
+                self.busy.add(name)
+                try:
+                    await self.handle(name)
+                finally:
+                    self.busy.discard(name)
+                if name in self.dirty:
+                    self.dirty.discard(name)
+                    self.schedule(name)
+                elif self.rewrite_needed and self.idle():
+                    await self.publish_merged()
+            except Exception as e:
+                print(f"Error: Gagal memproses {name}: {type(e).__name__}: {e}")
+            finally:
+                self.queue.task_done()
+    
+    def idle(self) -> bool:
+        """True jika tidak ada file yang menunggu atau sedang diproses."""
+        return not self.busy and not self.timers and self.queue.empty()
+    
+    async def handle(self, name: str) -> None:
+        """Proses satu file: baca + validasi di worker, lalu publish hasilnya."""
+        path = self.folder / name
+        if not path.exists():
+            if name in self.state['files'] or name in self.frames:
+                self.frames.pop(name, None)
+                self.state['files'].pop(name, None)
+                self.cache_path(name).unlink(missing_ok=True)
+                self.rewrite_needed = True
+                self.save_state()
+                self.log(f"{name}: dihapus dari folder, dikeluarkan dari file gabungan")
+            self.first_seen.pop(name, None)
+            return
+        
+        stat = path.stat()
+        entry = self.state['files'].get(name)
+        if name in self.frames and entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            self.first_seen.pop(name, None)
+            return  # Event tanpa perubahan isi (misal file hanya dibuka)
+        
+        try:
+            result = await self.loop.run_in_executor(self.executor, process_file, str(path), self.rules)
+        except Exception as e:
+            # File bisa gagal dibaca jika masih disalin, coba lagi setelah debounce
+            self.retries[name] = self.retries.get(name, 0) + 1
+            if self.retries[name] <= MAX_RETRIES:
+                self.log(f"{name}: gagal dibaca ({type(e).__name__}), dicoba lagi")
+                self.schedule(name)
+            else:
+                self.retries.pop(name)
+                self.first_seen.pop(name, None)
+                self.log(f"Error: {name} gagal dibaca setelah {MAX_RETRIES}x percobaan: {e}")
+            return
+        self.retries.pop(name, None)
+        
+        df, errors = result['data'], result['errors']
+        is_new = name not in self.frames
+        self.frames[name] = df
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(df.to_pickle, self.cache_path(name))
+        
+        self.state['files'][name] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'rows': len(df),
+            'errors': len(errors),
+            'processed_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        await self.publish_file(name, is_new)
+        self.publish_report(name, len(df), errors)
+        self.save_state()
+        
+        latency = time.time() - self.first_seen.pop(name, time.time())
+        self.log(f"{name}: {len(df)} baris, {len(errors)} error "
+                 f"(baca+validasi {result['parse_s']:.2f} detik, {latency:.1f} detik sejak file masuk)")
+    
+    async def publish_file(self, name: str, is_new: bool) -> None:
+        """Tambahkan file baru ke output CSV (append); selain itu output ditulis ulang dari cache."""
+        df = self.frames[name]
+        can_append = (is_new and self.output_format == 'csv' and self.output_path.exists()
+                      and not self.rewrite_needed and list(map(str, df.columns)) == self.state['columns'])
+        if can_append:
+            await asyncio.to_thread(df.to_csv, self.output_path, mode='a', header=False, index=False)
+        else:
+            self.rewrite_needed = True
+            # Tulis ulang sekali setelah antrian kosong, bukan per file
+            if self.busy == {name} and not self.timers and self.queue.empty():
+                await self.publish_merged()
+    
+    async def publish_merged(self) -> None:
+        """Tulis ulang file gabungan dari DataFrame yang sudah di-cache (tanpa baca ulang Excel)."""
+        import pandas as pd
+        
+        self.rewrite_needed = False
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.frames:
+            self.output_path.unlink(missing_ok=True)
+            self.state['columns'] = None
+            return
+        
+        merged = pd.concat([self.frames[name] for name in sorted(self.frames)], ignore_index=True)
+        await asyncio.to_thread(self.merge.save_dataframe, merged, self.output_path, self.output_format)
+        self.state['columns'] = list(map(str, merged.columns))
+        self.save_state()
+        self.log(f"File gabungan ditulis ulang: {self.output_path} ({len(merged)} baris)")
+    
+    def publish_report(self, name: str, row_count: int, errors: list) -> None:
+        """Simpan hasil validasi per file ke folder validasi/ (JSON)."""
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report = {
+            'file': name,
+            'rows': row_count,
+            'error_count': len(errors),
+            'error_rows': len(set(e['row'] for e in errors)),
+            'processed_at': self.state['files'][name]['processed_at'],
+            'errors': errors,
+        }
+        with open(self.report_dir / f"{Path(name).stem}.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+    
+    def log(self, message: str) -> None:
+        """Print pesan dengan jam."""
+        print(f"[{datetime.now():%H:%M:%S}] {message}", flush=True)
+    
+    async def run(self, polling: bool = False, interval: float = 2.0, once: bool = False) -> None:
+        """Jalankan watcher sampai dihentikan; dengan once=True berhenti setelah antrian kosong."""
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        
+        # Watcher dinyalakan sebelum scan awal agar file yang masuk di antaranya tidak terlewat
+        watcher = None
+        if not once:
+            watcher, mode = create_watcher(self.folder, self.schedule, polling, interval, self.loop)
+            print(f"Memantau folder {self.folder} ({mode})")
+        self.restore()
+        
+        consumers = [asyncio.create_task(self.consume()) for _ in range(self.workers)]
+        try:
+            if once:
+                while True:
+                    await self.queue.join()
+                    if self.idle():
+                        break
+                    await asyncio.sleep(0.1)
+                if self.rewrite_needed:
+                    await self.publish_merged()
+            else:
+                await asyncio.Event().wait()
+        finally:
+            if watcher:
+                watcher.stop()
+            for task in consumers:
+                task.cancel()
+            self.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pantau folder laporan cabang: validasi dan gabungkan file yang baru masuk'
+    )
+    parser.add_argument('input_folder', nargs='?', help='Folder yang dipantau')
+    parser.add_argument('--output', '-o', help='File gabungan (default dari config)')
+    parser.add_argument('--output-format', '-f', choices=list(OUTPUT_FORMATS),
+                        help='Format file gabungan (default: csv)')
+    parser.add_argument('--workers', '-w', type=int, help='Jumlah proses worker (default: 2)')
+    parser.add_argument('--debounce', type=float,
+                        help='Tunggu file tidak berubah selama N detik sebelum diproses (default: 2)')
+    parser.add_argument('--polling', action='store_true', help='Pakai polling, bukan inotify')
+    parser.add_argument('--interval', type=float, default=2.0,
+                        help='Interval polling dalam detik (default: 2)')
+    parser.add_argument('--once', action='store_true',
+                        help='Proses file baru/berubah sekali lalu berhenti (untuk cron)')
+    parser.add_argument('--config', '-c', default='config.yaml', help='File konfigurasi YAML')
+    
+    args = parser.parse_args()
+    
+    # Load config
+    script_dir = Path(__file__).parent
+    config = load_config(script_dir / args.config)
+    
+    # Override dengan CLI (CLI lebih prioritas)
+    input_folder = args.input_folder or config.get('input_folder')
+    output_file = args.output or config.get('output', 'output/hasil_gabungan.csv')
+    output_format = args.output_format or config.get('output_format', 'csv')
+    workers = args.workers or config.get('workers', 2)
+    debounce = args.debounce if args.debounce is not None else config.get('debounce', 2.0)
+    rules = config.get('rules', {})
+    
+    # Resolve path
+    if input_folder and not Path(input_folder).is_absolute():
+        input_folder = str(script_dir / input_folder)
+    if not Path(output_file).is_absolute():
+        output_file = str(script_dir / output_file)
+    
+    # Validasi
+    if not input_folder:
+        print("Error: Folder input harus diisi (via CLI atau config.yaml)")
+        parser.print_help()
+        sys.exit(1)
+    
+    if not Path(input_folder).is_dir():
+        print(f"Error: Folder '{input_folder}' tidak ditemukan")
+        sys.exit(1)
+    
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Format output '{output_format}' tidak didukung")
+        print(f"Format yang tersedia: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    
+    service = WatchService(input_folder, output_file, output_format, rules, workers, debounce)
+    try:
+        asyncio.run(service.run(args.polling, args.interval, args.once))
+    except KeyboardInterrupt:
+        print("\nWatcher dihentikan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Worker - Server lokal yang menjalankan utility sebagai job
+Modul (pandas, openpyxl, yaml, dateutil) dan config di-load sekali per proses worker
+"""
+
+import io
+import sys
+import json
+import time
+import uuid
+import argparse
+import threading
+import importlib
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# load_module dipakai bersama benchmark, worker, dan watcher (folder common/)
+sys.path.insert(0, str(ROOT_DIR))
+from common.utilities import load_module  # noqa: E402
+
+# Nama job -> (folder utility, modul utama, fungsi entry point)
+TOOLS = {
+    'clean': ('02-data-cleaner', 'data_cleaner', 'clean_data'),
+    'split': ('03-excel-splitter', 'excel_splitter', 'split_excel'),
+    'compare': ('04-excel-comparator', 'excel_comparator', 'compare_excel'),
+    'validate': ('05-data-validator', 'data_validator', 'validate_data'),
+}
+
+# Jumlah job selesai yang disimpan untuk dicek statusnya
+MAX_FINISHED_JOBS = 1000
+
+# Batas output console per job yang disimpan
+MAX_OUTPUT_CHARS = 20_000
+
+# Library berat yang di-import utility secara lazy, di-load di awal agar job pertama tidak menunggu
+WARM_MODULES = ['numpy', 'pandas', 'openpyxl', 'openpyxl.styles', 'yaml', 'dateutil.parser']
+
+# State per proses worker (diisi oleh init_worker)
+_entry_points = {}
+_config_cache = {}  # path -> (mtime, config)
+
+
+def init_worker() -> None:
+    """Import semua utility dan library beratnya sekali saat proses worker dibuat."""
+    for name in WARM_MODULES:
+        importlib.import_module(name)
+    for tool, (folder, module_name, func_name) in TOOLS.items():
+        _entry_points[tool] = getattr(load_module(folder, module_name), func_name)
+
+
+def warm_up() -> bool:
+    """Task kosong untuk memaksa proses worker dibuat (dan di-init) saat server start."""
+    return True
+
+
+def cached_config(config_path: str) -> dict:
+    """Load config YAML, di-cache per proses selama file tidak berubah (dicek dari mtime)."""
+    import yaml
+    path = str(Path(config_path).resolve())
+    mtime = Path(path).stat().st_mtime
+    cached = _config_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    _config_cache[path] = (mtime, config)
+    return config
+
+
+def resolve_args(tool: str, args: dict) -> dict:
+    """Lengkapi argumen job validate dari file config (rules di-cache)."""
+    args = dict(args)
+    if tool == 'validate' and 'config' in args:
+        config_path = Path(args.pop('config')).resolve()
+        config = cached_config(str(config_path))
+        args.setdefault('rules', config.get('rules', {}))
+        for key, config_key in [('input_file', 'input'), ('output_file', 'output')]:
+            if key not in args and config.get(config_key):
+                value = Path(config[config_key])
+                args[key] = str(value if value.is_absolute() else config_path.parent / value)
+    return args
+
+
+def summarize(tool: str, result) -> dict:
+    """Ringkasan hasil job yang aman dikirim sebagai JSON."""
+    if tool == 'compare' and isinstance(result, dict):
+        return result.get('summary', {})
+    if tool == 'validate' and hasattr(result, 'error_row_count'):
+        return {'error_count': len(result), 'error_rows': result.error_row_count()}
+    return {}
+
+
+def run_job(tool: str, args: dict, submitted_at: float) -> dict:
+    """Jalankan satu job di proses worker. Output console ditangkap per job."""
+    started_at = time.time()
+    output = io.StringIO()
+    record = {'queue_latency_s': round(started_at - submitted_at, 4)}
+    
+    try:
+        with redirect_stdout(output):
+            result = _entry_points[tool](**resolve_args(tool, args))
+        record.update(status='done', summary=summarize(tool, result))
+    except SystemExit as e:
+        # Utility memanggil sys.exit() untuk error input (file/kolom tidak ada)
+        record.update(status='error', error=f"SystemExit({e.code})")
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    
+    record['run_s'] = round(time.time() - started_at, 4)
+    record['output'] = output.getvalue()[-MAX_OUTPUT_CHARS:]
+    return record
+
+
+class JobQueue:
+    """Antrian job dengan pool proses worker yang terbatas."""
+    
+    def __init__(self, workers: int = 2, max_queue: int = 100):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        self.jobs = OrderedDict()  # id -> record
+        self.futures = {}
+        self.pending = 0
+        self.latencies = []
+        self.lock = threading.Lock()
+        
+        # Buat semua proses worker sekarang, supaya job pertama tidak bayar biaya import
+        for future in [self.executor.submit(warm_up) for _ in range(workers)]:
+            future.result()
+    
+    def submit(self, tool: str, args: dict) -> dict:
+        """Masukkan job ke antrian. Return record job, atau None jika antrian penuh."""
+        with self.lock:
+            if self.pending >= self.max_queue:
+                return None
+            self.pending += 1
+            job_id = uuid.uuid4().hex[:12]
+            submitted_at = time.time()
+            record = {'id': job_id, 'tool': tool, 'status': 'queued', 'submitted_at': submitted_at}
+            self.jobs[job_id] = record
+        
+        future = self.executor.submit(run_job, tool, args, submitted_at)
+        with self.lock:
+            self.futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return dict(record)
+    
+    def _finish(self, job_id: str, future) -> None:
+        """Simpan hasil job yang sudah selesai."""
+        try:
+            result = future.result()
+        except Exception as e:  # Proses worker mati, dsb
+            result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        
+        with self.lock:
+            self.pending -= 1
+            self.jobs[job_id].update(result)
+            self.futures.pop(job_id, None)
+            if 'queue_latency_s' in result:
+                self.latencies = (self.latencies + [result['queue_latency_s']])[-MAX_FINISHED_JOBS:]
+            
+            # Buang job lama yang sudah selesai
+            finished = [jid for jid, r in self.jobs.items() if r['status'] not in ('queued',)]
+            for jid in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self.jobs[jid]
+    
+    def wait(self, job_id: str, timeout: float = None) -> dict:
+        """Tunggu job selesai, return record job."""
+        with self.lock:
+            future = self.futures.get(job_id)
+        if future:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass  # Error dicatat oleh _finish
+            # Callback bisa jalan di thread lain, tunggu sampai record ter-update
+            while (self.get(job_id) or {}).get('status') == 'queued':
+                time.sleep(0.001)
+        return self.get(job_id)
+    
+    def get(self, job_id: str) -> dict:
+        """Salinan record job, atau None jika tidak ada."""
+        with self.lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record else None
+    
+    def stats(self) -> dict:
+        """Statistik antrian: jumlah job dan latensi antrian (detik)."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            statuses = [r['status'] for r in self.jobs.values()]
+            stats = {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'pending': self.pending,
+                'done': statuses.count('done'),
+                'error': statuses.count('error'),
+            }
+        if latencies:
+            stats['queue_latency_s'] = {
+                'avg': round(sum(latencies) / len(latencies), 4),
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max': latencies[-1],
+            }
+        return stats
+    
+    def shutdown(self) -> None:
+        """Hentikan pool worker, batalkan job yang belum jalan."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    """HTTP API: POST /jobs, GET /jobs/<id>, GET /stats."""
+    
+    queue: JobQueue = None
+    
+    def send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path == '/stats':
+            self.send_json(200, self.queue.stats())
+        elif path.startswith('/jobs/'):
+            record = self.queue.get(path.split('/')[-1])
+            if record:
+                self.send_json(200, record)
+            else:
+                self.send_json(404, {'error': 'Job tidak ditemukan'})
+        else:
+            self.send_json(404, {'error': 'Endpoint tidak ditemukan'})
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/jobs':
+            self.send_json(404, {'error': 'Endpoint tidak ditemukan'})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': 'Body harus JSON'})
+            return
+        
+        tool = payload.get('tool')
+        if tool not in TOOLS:
+            self.send_json(400, {'error': f"Tool harus salah satu dari: {', '.join(TOOLS)}"})
+            return
+        
+        record = self.queue.submit(tool, payload.get('args', {}))
+        if record is None:
+            self.send_json(503, {'error': 'Antrian penuh, coba lagi nanti'})
+            return
+        
+        if parse_qs(url.query).get('wait', ['0'])[0] in ('1', 'true'):
+            record = self.queue.wait(record['id'])
+        self.send_json(202 if record['status'] == 'queued' else 200, record)
+    
+    def log_message(self, format, *args):
+        # Log singkat ke stderr
+        sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, workers: int = 2, max_queue: int = 100) -> None:
+    """Jalankan server worker sampai dihentikan (Ctrl+C)."""
+    print(f"Menyiapkan {workers} proses worker...")
+    start = time.perf_counter()
+    JobHandler.queue = JobQueue(workers, max_queue)
+    print(f"Worker siap dalam {time.perf_counter() - start:.2f} detik")
+    
+    server = ThreadingHTTPServer((host, port), JobHandler)
+    print(f"Server berjalan di http://{host}:{port} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nMenghentikan server...")
+    finally:
+        server.server_close()
+        JobHandler.queue.shutdown()
+
+
+def submit(url: str, tool: str, args: dict, wait: bool = True) -> dict:
+    """Kirim job ke server worker (dipakai dari scheduler / CLI)."""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/jobs{'?wait=1' if wait else ''}",
+        data=json.dumps({'tool': tool, 'args': args}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def parse_job_args(pairs: list) -> dict:
+    """Ubah list 'key=value' menjadi dict; value di-parse sebagai JSON jika bisa."""
+    args = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition('=')
+        try:
+            args[key] = json.loads(value)
+        except ValueError:
+            args[key] = value
+    return args
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Server lokal untuk menjalankan utility sebagai job'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    serve_parser = subparsers.add_parser('serve', help='Jalankan server worker')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Host (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    serve_parser.add_argument('--workers', '-w', type=int, default=2, help='Jumlah proses worker (default: 2)')
+    serve_parser.add_argument('--max-queue', type=int, default=100, help='Maksimal job dalam antrian (default: 100)')
+    
+    submit_parser = subparsers.add_parser('submit', help='Kirim job ke server worker')
+    submit_parser.add_argument('tool', choices=list(TOOLS), help='Jenis job')
+    submit_parser.add_argument('args', nargs='*', help='Argumen job format key=value')
+    submit_parser.add_argument('--url', default='http://127.0.0.1:8765', help='URL server worker')
+    submit_parser.add_argument('--no-wait', action='store_true', help='Jangan tunggu job selesai')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers, args.max_queue)
+    else:
+        record = submit(args.url, args.tool, parse_job_args(args.args), wait=not args.no_wait)
+        if record.get('output'):
+            print(record['output'], end='')
+        print(json.dumps({k: v for k, v in record.items() if k != 'output'}, indent=2, default=str))
+        if record.get('status') == 'error':
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()